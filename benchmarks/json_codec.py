@@ -0,0 +1,89 @@
+"""Compare JSON backends on payloads shaped like the bot's real traffic.
+
+Usage: python -m benchmarks.json_codec --number 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import timeit
+
+os.environ.setdefault("BOT_TOKEN", "123456:FAKE-TOKEN")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services import codec
+
+
+def _vehicle(i: int) -> dict:
+    return {
+        "vehicleId": 10_000 + i,
+        "vehicleNb": 3000 + i,
+        "model": ["Toyota Prius C", "Kia Niro EV", "Toyota Rav4 AWD", "Hyundai Kona"][i % 4],
+        "vehiclePropulsionTypeId": 1 + i % 3,
+        "energyLevelPercentage": (i * 7) % 100,
+        "currentVehicleLocation": {"latitude": 45.5 + i * 1e-4, "longitude": -73.6 - i * 1e-4},
+        "vehiclePromotions": [{"vehiclePromotionTypeId": 2}] if i % 5 == 0 else [],
+        "isElectric": i % 4 == 1,
+    }
+
+
+PAYLOADS = {
+    "webhook event": {
+        "id": "evt_01HZX3",
+        "type": "search.completed",
+        "timestamp": "2026-02-13T16:04:18Z",
+        "data": {"account": "amin", "vehicle": _vehicle(1), "search_id": 9182, "attempts": 37},
+    },
+    "vehicles (400)": {"vehicles": [_vehicle(i) for i in range(400)]},
+    "audit page (50)": {
+        "total": 12873,
+        "logs": [
+            {
+                "id": 100_000 + i,
+                "user_account": "amin",
+                "action": "search.start",
+                "timestamp": "2026-02-13T16:04:18.123456Z",
+                "response_status": 200,
+                "duration_ms": 143.2,
+                "request_body": {"point": {"latitude": 45.5, "longitude": -73.6}, "radius": 2},
+            }
+            for i in range(50)
+        ],
+    },
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=1000)
+    args = parser.parse_args()
+
+    backends = []
+    for name in codec.BACKENDS:
+        try:
+            backends.append(codec.get_backend(name))
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+
+    print(f"active backend: {codec.backend.name}\n")
+    for label, payload in PAYLOADS.items():
+        encoded = codec.get_backend("json").dumps(payload)
+        print(f"{label} ({len(encoded) / 1024:.1f} KiB)")
+        baseline = None
+        # stdlib is last in BACKENDS; time it first so the others compare against it
+        for backend in reversed(backends):
+            parse = timeit.timeit(lambda b=backend, e=encoded: b.loads(e), number=args.number)
+            dump = timeit.timeit(lambda b=backend, p=payload: b.dumps(p), number=args.number)
+            per_op = parse + dump
+            baseline = baseline or per_op
+            print(
+                f"  {backend.name:8s} parse {parse / args.number * 1e6:8.1f}µs  "
+                f"serialize {dump / args.number * 1e6:8.1f}µs  "
+                f"({baseline / per_op:4.1f}x vs json)"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
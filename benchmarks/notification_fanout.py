@@ -0,0 +1,77 @@
+"""Benchmark notification fan-out against the fake Bot API server.
+
+Usage: python -m benchmarks.notification_fanout --users 200 --events 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("BOT_TOKEN", "123456:FAKE-TOKEN")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from bot.db.models import Base, User
+from tests.fake_telegram import FakeTelegramServer
+
+EVENTS = [
+    {"type": "search.started", "data": {"account": "amin"}},
+    {"type": "search.error", "data": {"account": "amin", "error": "timeout"}},
+    {"type": "optimization.swap", "data": {"vehicle": {"model": "Rav4"}, "score": 87}},
+    {"type": "search.completed", "data": {"account": "amin", "vehicle": {"model": "Rav4"}}},
+]
+
+
+async def run(users: int, events: int, latency: float) -> None:
+    from bot.notifications.digest import digest
+    from bot.notifications.dispatcher import dispatch_notification
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all(
+            User(telegram_id=i, access_token="t", accessible_accounts='["amin"]')
+            for i in range(1, users + 1)
+        )
+        await session.commit()
+
+    server = FakeTelegramServer(latency=latency)
+    await server.start()
+    bot = server.make_bot()
+    try:
+        with patch("bot.notifications.dispatcher.async_session", factory):
+            start = time.perf_counter()
+            for i in range(events):
+                await dispatch_notification(bot, EVENTS[i % len(EVENTS)])
+            await digest.flush_all()
+            elapsed = time.perf_counter() - start
+    finally:
+        await bot.session.close()
+        await server.close()
+        await engine.dispose()
+
+    sent = server.count("sendMessage")
+    print(f"users={users} events={events} latency={latency * 1000:.1f}ms")
+    print(f"sendMessage calls: {sent} ({sent / max(events, 1):.1f} per event)")
+    print(f"digest: {digest.events} user events merged into {digest.sends} sends")
+    print(f"elapsed: {elapsed:.3f}s  throughput: {sent / elapsed:.0f} msg/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="per-call latency (s)")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.events, args.latency))
+
+
+if __name__ == "__main__":
+    main()
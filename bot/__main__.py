@@ -1,5 +1,6 @@
 import asyncio
 import logging
+from functools import partial
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
@@ -10,6 +11,9 @@ from aiohttp import web
 
 from bot.config import settings
 from bot.db.session import init_db
+from bot.services import background, health
+from bot.services.reachability import reachability
+from bot.services.telegram_session import create_session
 from bot.web.server import create_app
 
 logging.basicConfig(
@@ -67,22 +71,73 @@ def setup_routers(dp: Dispatcher) -> None:
 
 def setup_middlewares(dp: Dispatcher) -> None:
     from bot.middlewares.auth import AuthMiddleware
+    from bot.middlewares.callback_ack import CallbackAckMiddleware
+    from bot.middlewares.concurrency import update_limiter
     from bot.middlewares.throttle import ThrottleMiddleware
 
+    dp.update.outer_middleware(update_limiter)
     dp.message.middleware(ThrottleMiddleware())
     dp.callback_query.middleware(ThrottleMiddleware())
+    dp.callback_query.middleware(CallbackAckMiddleware())
     dp.message.middleware(AuthMiddleware())
     dp.callback_query.middleware(AuthMiddleware())
 
 
+def setup_background_jobs(bot: Bot) -> None:
+    from bot.services.audit_mirror import audit_mirror
+    from bot.services.auth_service import purge_expired_states
+    from bot.services.db_maintenance import run_maintenance
+    from bot.services.fleet import fleet
+    from bot.services.health_alerts import health_alerts
+    from bot.services.metrics_sampler import metrics_sampler
+
+    background.register(
+        "oauth-state-compaction",
+        purge_expired_states,
+        settings.oauth_state_cleanup_interval,
+    )
+    background.register(
+        "db-maintenance",
+        run_maintenance,
+        settings.db_maintenance_interval,
+        initial_delay=60,
+    )
+    background.register(
+        "audit-sync",
+        audit_mirror.sync_active,
+        settings.audit_sync_interval,
+        initial_delay=settings.audit_sync_interval,
+    )
+    background.register(
+        "fleet-index",
+        fleet.refresh_if_used,
+        settings.fleet_refresh_interval,
+        initial_delay=settings.fleet_refresh_interval,
+    )
+    background.register(
+        "metrics-sampler",
+        metrics_sampler.sample,
+        settings.metrics_sample_interval,
+        initial_delay=30,
+    )
+    background.register(
+        "health-alerts",
+        partial(health_alerts.poll, bot),
+        settings.alert_poll_interval,
+        initial_delay=30,
+    )
+
+
 async def main() -> None:
     logger.info("Starting Mashinato Bot...")
 
     await init_db()
+    await reachability.load()
     logger.info("Database initialized")
 
     bot = Bot(
         token=settings.bot_token,
+        session=create_session(),
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
 
@@ -101,6 +156,10 @@ async def main() -> None:
         ]
     )
 
+    health.start()
+    setup_background_jobs(bot)
+    background.start_all()
+
     # Start aiohttp web server (OAuth callback + webhook receiver + health)
     webapp = create_app(bot=bot)
     runner = web.AppRunner(webapp)
@@ -116,6 +175,17 @@ async def main() -> None:
     try:
         await dp.start_polling(bot)
     finally:
+        from bot.notifications.digest import digest
+
+        await digest.flush_all()
+        from bot.services.status_watcher import watcher
+
+        await watcher.stop()
+        from bot.middlewares.concurrency import update_limiter
+
+        await update_limiter.stop()
+        await background.stop_all()
+        await health.stop()
         await runner.cleanup()
         logger.info("Bot stopped")
 
@@ -37,6 +37,13 @@ class VehicleCB(CallbackData, prefix="veh"):
     vehicle_id: int = 0
 
 
+class FleetCB(CallbackData, prefix="flt"):
+    action: str
+    facets: str = ""  # comma-separated facet names, "-" prefix excludes
+    model: int = -1  # position in FleetIndex.models, -1 for any
+    page: int = 0
+
+
 class WebhookCB(CallbackData, prefix="whk"):
     action: str
     webhook_id: int = 0
@@ -45,6 +52,7 @@ class WebhookCB(CallbackData, prefix="whk"):
 class AuditCB(CallbackData, prefix="aud"):
     action: str
     log_id: int = 0
+    value: str = ""
 
 
 class PolicyCB(CallbackData, prefix="pol"):
@@ -8,9 +8,28 @@ class Settings(BaseSettings):
 
     # Telegram Bot
     bot_token: str
+    telegram_api_url: str = ""  # self-hosted Bot API server; empty uses api.telegram.org
+    telegram_api_is_local: bool = False  # local-mode server (files served from disk)
+    telegram_connection_limit: int = 100  # pooled connections to the Bot API
+    telegram_keepalive: float = 15.0  # seconds idle connections are kept; 0 disables
+    telegram_timeout: float = 60.0  # default request timeout in seconds
+    telegram_method_timeouts: dict[str, float] = {}  # per method, e.g. {"sendDocument": 300}
 
     # Car API
     api_base_url: str = "https://kuber-carapi.aminamin.xyz"
+    overview_concurrency: int = 8  # parallel requests for the all-accounts overview
+    overview_cache_ttl: float = 10.0  # seconds
+    watch_fast_interval: float = 10.0  # status watcher poll interval right after a change
+    watch_max_interval: float = 120.0  # ceiling while the status stays the same
+    fleet_refresh_interval: float = 60.0  # seconds between fleet index rebuilds
+    zone_refresh_interval: float = 86400.0  # service zones rarely change
+    page_cache_ttl: float = 60.0  # seconds a paged list view and its pages are reused
+    multi_search_max_age: float = 21600.0  # seconds before an unsettled multi-search is forgotten
+    api_global_rate: float = 20.0  # requests per second to the backend across all accounts
+    api_global_burst: int = 40
+    api_account_rate: float = 5.0  # requests per second per account
+    api_account_burst: int = 10
+    api_retry_after_max: float = 30.0  # longest 429 Retry-After honoured before failing
 
     # OAuth2 / Authentik
     oauth_client_id: str = "mashinato-bot"
@@ -19,6 +38,15 @@ class Settings(BaseSettings):
     oauth_token_url: str = "https://kuber-auth.aminamin.xyz/application/o/token/"
     oauth_userinfo_url: str = "https://kuber-auth.aminamin.xyz/application/o/userinfo/"
     oauth_redirect_uri: str = "https://kuber-mashinato-bot.aminamin.xyz/oauth/callback"
+    oauth_state_ttl: int = 900  # seconds a login link stays valid
+    oauth_state_reuse_window: int = 300  # repeated /login within this reuses the link
+    oauth_state_cleanup_interval: int = 600
+
+    # Audit log mirror
+    audit_sync_interval: float = 120.0  # seconds between incremental syncs while browsing
+    audit_sync_max_rows: int = 2000  # entries pulled per sync, bounds the first backfill
+    audit_export_concurrency: int = 4  # audit pages requested at once during an export
+    audit_export_max_rows: int = 50000  # keeps exports well under Telegram's 50MB limit
 
     # Webhook server
     webhook_secret: str = ""
@@ -27,13 +55,41 @@ class Settings(BaseSettings):
 
     # Database
     database_path: str = "data/bot.db"
+    db_maintenance_interval: int = 21600  # seconds between maintenance runs
+    db_maintenance_budget: float = 5.0  # seconds of work allowed per run
+    user_retention_days: int = 90  # logged-out users are deleted after this
+
+    # Notifications
+    notification_digest_window: float = 20.0  # seconds; 0 sends every event immediately
+    notification_digest_windows: dict[str, float] = {}  # per event type, "rental.*" allowed
 
     # Admin
     admin_group: str = "mashinato-admin"
+    metrics_sample_interval: float = 60.0  # seconds between dashboard samples for trends
+    alert_poll_interval: float = 60.0  # seconds between backend health polls for alerts
+    alert_confirm_polls: int = 2  # consecutive polls before an alert fires or resolves
+    alert_min_agents: int = 1  # alert when fewer dispatcher agents are active
+    alert_max_blocked_ips: int = 50  # alert when this many IPv6 addresses are blocked
+    alert_blocked_ips_spike: int = 10  # alert when blocks rise this much within 10 polls
 
     # Logging
     log_level: str = "INFO"
 
+    # Performance
+    json_backend: str = "auto"  # auto | orjson | msgspec | json
+
+    # Diagnostics
+    admin_api_token: str = ""  # Bearer token for /debug/* routes; empty disables them
+    profiler_max_seconds: int = 60
+    loop_lag_interval: float = 0.5
+    loop_lag_ready_ms: float = 500.0  # sustained lag above this marks the pod unready
+    slow_callback_ms: float = 250.0
+    callback_ack_delay: float = 0.4  # seconds before a slow callback is answered for the handler
+    update_max_inflight: int = 32  # handlers running at once across all chats
+    update_max_waiting: int = 200  # queued updates before new ones are shed
+    update_max_chat_queue: int = 3  # queued plus running updates allowed per chat
+    health_check_interval: float = 15.0
+
     @property
     def database_url(self) -> str:
         path = Path(self.database_path)
@@ -0,0 +1,129 @@
+"""Versioned schema migrations applied at startup.
+
+The models describe the current schema. A fresh database is created from
+them with ``create_all`` and stamped with every known version. An existing
+database gets the pending migrations one at a time, each in its own
+transaction, so a failure leaves the earlier versions recorded.
+
+New migrations are appended to ``MIGRATIONS`` and the models updated to
+match, so fresh and migrated databases end up identical.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bot.db.models import AUDIT_FTS_DDL, Base, SchemaMigration
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    statements: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class AppliedMigration:
+    version: int
+    name: str
+    duration_ms: float
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        1,
+        "hot_path_indexes",
+        (
+            # dispatch_notification: users WHERE access_token IS NOT NULL
+            "CREATE INDEX IF NOT EXISTS ix_users_active ON users (telegram_id) "
+            "WHERE access_token IS NOT NULL",
+            "CREATE INDEX IF NOT EXISTS ix_users_last_active_at ON users (last_active_at)",
+            "CREATE INDEX IF NOT EXISTS ix_oauth_states_created_at ON oauth_states (created_at)",
+            "CREATE INDEX IF NOT EXISTS ix_oauth_states_telegram_id ON oauth_states (telegram_id)",
+            # Disabled preferences of one event type, fetched once per event
+            "CREATE INDEX IF NOT EXISTS ix_notification_preferences_event_type "
+            "ON notification_preferences (event_type, enabled)",
+        ),
+    ),
+    Migration(
+        2,
+        "audit_log_mirror",
+        (
+            # create_all adds the audit_logs table itself; these are idempotent
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_audit_logs_owner_log "
+            "ON audit_logs (owner_id, log_id)",
+            "CREATE INDEX IF NOT EXISTS ix_audit_logs_owner_timestamp "
+            "ON audit_logs (owner_id, timestamp)",
+            *AUDIT_FTS_DDL,
+        ),
+    ),
+    Migration(
+        3,
+        "unreachable_users",
+        ("ALTER TABLE users ADD COLUMN unreachable_since TEXT",),
+    ),
+    Migration(
+        4,
+        "audit_sync_cursors",
+        (
+            # create_all adds the table on startup already; kept for the record
+            "CREATE TABLE IF NOT EXISTS audit_sync_cursors ("
+            "owner_id INTEGER NOT NULL PRIMARY KEY, gap_start TEXT, gap_end TEXT NOT NULL)",
+        ),
+    ),
+)
+
+
+async def migrate(engine: AsyncEngine) -> list[AppliedMigration]:
+    """Bring the database up to the latest version; returns what was applied."""
+    async with engine.begin() as conn:
+        fresh = not await conn.run_sync(lambda c: inspect(c).has_table("users"))
+        await conn.run_sync(Base.metadata.create_all)
+        result = await conn.execute(select(SchemaMigration.version))
+        applied_versions = set(result.scalars())
+
+        if fresh:
+            # create_all already built the latest schema
+            await conn.execute(
+                SchemaMigration.__table__.insert(),
+                [{"version": m.version, "name": m.name, "duration_ms": 0.0} for m in MIGRATIONS],
+            )
+            logger.info("Created database at schema version %d", MIGRATIONS[-1].version)
+            return []
+
+    applied: list[AppliedMigration] = []
+    for migration in MIGRATIONS:
+        if migration.version in applied_versions:
+            continue
+        started = time.perf_counter()
+        async with engine.begin() as conn:
+            for statement in migration.statements:
+                await conn.execute(text(statement))
+            duration_ms = (time.perf_counter() - started) * 1000
+            await conn.execute(
+                SchemaMigration.__table__.insert(),
+                {
+                    "version": migration.version,
+                    "name": migration.name,
+                    "duration_ms": round(duration_ms, 2),
+                },
+            )
+        logger.info(
+            "Applied migration %03d %s in %.1fms", migration.version, migration.name, duration_ms
+        )
+        applied.append(AppliedMigration(migration.version, migration.name, duration_ms))
+    return applied
+
+
+async def current_version(engine: AsyncEngine) -> int:
+    async with engine.connect() as conn:
+        result = await conn.execute(text("SELECT max(version) FROM schema_migrations"))
+        return result.scalar() or 0
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Float, ForeignKey, Integer, Text
+from sqlalchemy import DDL, Column, Float, ForeignKey, Index, Integer, Text, event, text
 from sqlalchemy.orm import DeclarativeBase
 
 
@@ -22,17 +22,22 @@ class User(Base):
     selected_account = Column(Text, nullable=True)
     is_admin = Column(Integer, default=0)
     created_at = Column(Text, server_default="CURRENT_TIMESTAMP")
-    last_active_at = Column(Text, nullable=True)
+    last_active_at = Column(Text, nullable=True, index=True)
+    unreachable_since = Column(Text, nullable=True)  # set when Telegram refuses delivery
+
+    __table_args__ = (
+        Index("ix_users_active", "telegram_id", sqlite_where=text("access_token IS NOT NULL")),
+    )
 
 
 class OAuthState(Base):
     __tablename__ = "oauth_states"
 
     state = Column(Text, primary_key=True)
-    telegram_id = Column(Integer, nullable=False)
+    telegram_id = Column(Integer, nullable=False, index=True)
     chat_id = Column(Integer, nullable=False)
     code_verifier = Column(Text, nullable=False)
-    created_at = Column(Text, server_default="CURRENT_TIMESTAMP")
+    created_at = Column(Text, server_default="CURRENT_TIMESTAMP", index=True)
 
 
 class NotificationPreference(Base):
@@ -45,3 +50,62 @@ class NotificationPreference(Base):
     )
     event_type = Column(Text, primary_key=True)
     enabled = Column(Integer, default=1)
+
+    __table_args__ = (Index("ix_notification_preferences_event_type", "event_type", "enabled"),)
+
+
+class AuditLogEntry(Base):
+    """Local mirror of the audit logs visible to one bot user."""
+
+    __tablename__ = "audit_logs"
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, nullable=False)  # telegram_id whose token fetched the entry
+    log_id = Column(Integer, nullable=False)
+    user_account = Column(Text, nullable=True)
+    action = Column(Text, nullable=True)
+    response_status = Column(Integer, nullable=True)
+    timestamp = Column(Text, nullable=True)
+    duration_ms = Column(Float, nullable=True)
+    data = Column(Text, nullable=False)  # the full entry as JSON
+
+    __table_args__ = (
+        Index("ix_audit_logs_owner_log", "owner_id", "log_id", unique=True),
+        Index("ix_audit_logs_owner_timestamp", "owner_id", "timestamp"),
+    )
+
+
+class AuditSyncCursor(Base):
+    """Window of audit entries a bounded sync has not fetched yet."""
+
+    __tablename__ = "audit_sync_cursors"
+
+    owner_id = Column(Integer, primary_key=True)
+    gap_start = Column(Text, nullable=True)  # None reaches back to the first entry
+    gap_end = Column(Text, nullable=False)  # newest timestamp still missing, inclusive
+
+
+# External-content FTS5 index over the mirror, kept in step by triggers.
+# Entries are immutable, so inserts and deletes are all that need tracking.
+AUDIT_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS audit_logs_fts USING fts5("
+    "action, user_account, data, content='audit_logs', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS audit_logs_ai AFTER INSERT ON audit_logs BEGIN "
+    "INSERT INTO audit_logs_fts(rowid, action, user_account, data) "
+    "VALUES (new.id, new.action, new.user_account, new.data); END",
+    "CREATE TRIGGER IF NOT EXISTS audit_logs_ad AFTER DELETE ON audit_logs BEGIN "
+    "INSERT INTO audit_logs_fts(audit_logs_fts, rowid, action, user_account, data) "
+    "VALUES ('delete', old.id, old.action, old.user_account, old.data); END",
+)
+
+for _statement in AUDIT_FTS_DDL:
+    event.listen(AuditLogEntry.__table__, "after_create", DDL(_statement))
+
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True)
+    name = Column(Text, nullable=False)
+    applied_at = Column(Text, server_default="CURRENT_TIMESTAMP")
+    duration_ms = Column(Float, nullable=True)
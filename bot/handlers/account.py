@@ -1,10 +1,13 @@
 """Account management handlers."""
 
+import contextlib
 import json
 import logging
+import time
 
 from aiogram import F, Router
-from aiogram.types import CallbackQuery
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from sqlalchemy import select as sa_select
 
 from bot.callbacks.factory import AccountCB
@@ -13,6 +16,7 @@ from bot.db.session import async_session
 from bot.keyboards.account import account_list_keyboard
 from bot.keyboards.builders import back_to_menu_button
 from bot.keyboards.main_menu import main_menu_keyboard
+from bot.services.account_overview import AccountSnapshot, iter_overview
 from bot.services.api_client import APIError, CarAPI
 from bot.texts import fa
 
@@ -39,10 +43,18 @@ async def show_accounts(callback: CallbackQuery, user: User, **kwargs) -> None:
         await callback.answer()
         return
 
-    await callback.message.edit_text(
-        fa.SELECT_ACCOUNT,
-        reply_markup=account_list_keyboard(accounts),
-    )
+    keyboard = account_list_keyboard(accounts)
+    if len(accounts) > 1:
+        keyboard.inline_keyboard.insert(
+            -1,
+            [
+                InlineKeyboardButton(
+                    text=fa.ACCOUNTS_OVERVIEW,
+                    callback_data=AccountCB(action="overview").pack(),
+                )
+            ],
+        )
+    await callback.message.edit_text(fa.SELECT_ACCOUNT, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -128,3 +140,86 @@ async def next_free_time(
         reply_markup=InlineKeyboardMarkup(inline_keyboard=[[back_to_menu_button()]]),
     )
     await callback.answer()
+
+
+OVERVIEW_EDIT_INTERVAL = 1.0  # seconds between progressive edits
+
+
+def _overview_line(snapshot: AccountSnapshot) -> str:
+    results = snapshot.results
+    lines = [f"👤 <b>{snapshot.account}</b>"]
+
+    if "rental" in results:
+        rental = results["rental"]
+        if rental and not rental.get("message"):
+            vehicle = rental.get("vehicle", {})
+            model = vehicle.get("model") or vehicle.get("make") or "?"
+            state = rental.get("state", rental.get("status", "?"))
+            lines.append(f"  🚗 {model} ({state})")
+        else:
+            lines.append(f"  🚗 {fa.OVERVIEW_NO_RENTAL}")
+    for name, icon in (("search", "🔍"), ("optimization", "📊")):
+        if name in results:
+            lines.append(f"  {icon} {results[name].get('status') or fa.OVERVIEW_IDLE}")
+    if "next_free" in results:
+        next_free = results["next_free"]
+        lines.append(f"  ⏰ {next_free.get('next_free_time', next_free.get('message', '-'))}")
+    for name, error in snapshot.errors.items():
+        lines.append(f"  ⚠️ {name}: {error[:60]}")
+    return "\n".join(lines)
+
+
+def render_overview(accounts: list[str], snapshots: dict[str, AccountSnapshot]) -> str:
+    text = fa.OVERVIEW_TITLE.format(done=len(snapshots), total=len(accounts))
+    for account in accounts:
+        snapshot = snapshots.get(account)
+        body = (
+            _overview_line(snapshot)
+            if snapshot
+            else f"👤 <b>{account}</b>\n  {fa.OVERVIEW_LOADING}"
+        )
+        text += f"\n\n{body}"
+    return text
+
+
+@router.callback_query(AccountCB.filter(F.action == "overview"))
+async def accounts_overview(callback: CallbackQuery, user: User, **kwargs) -> None:
+    accounts = get_accounts(user)
+    if not accounts:
+        await callback.answer(fa.NO_ACCOUNTS, show_alert=True)
+        return
+    await callback.answer()
+
+    keyboard = InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=fa.OVERVIEW_REFRESH,
+                    callback_data=AccountCB(action="overview").pack(),
+                )
+            ],
+            [back_to_menu_button()],
+        ]
+    )
+
+    async def render(snapshots: dict[str, AccountSnapshot]) -> None:
+        # Refreshing with unchanged data is not an error worth surfacing
+        with contextlib.suppress(TelegramBadRequest):
+            await callback.message.edit_text(
+                render_overview(accounts, snapshots), reply_markup=keyboard
+            )
+
+    snapshots: dict[str, AccountSnapshot] = {}
+    await render(snapshots)
+    last_edit = time.monotonic()
+
+    api = CarAPI(user.access_token)
+    async for snapshot in iter_overview(api, accounts):
+        snapshots[snapshot.account] = snapshot
+        if (
+            len(snapshots) < len(accounts)
+            and time.monotonic() - last_edit >= OVERVIEW_EDIT_INTERVAL
+        ):
+            await render(snapshots)
+            last_edit = time.monotonic()
+    await render(snapshots)
@@ -9,11 +9,14 @@ from bot.callbacks.factory import AdminCB
 from bot.db.models import User
 from bot.keyboards.builders import back_to_menu_button
 from bot.services.api_client import APIError, CarAPI
+from bot.services.metrics_sampler import metrics_sampler
 from bot.texts import fa
 
 logger = logging.getLogger(__name__)
 router = Router()
 
+TREND_METRICS = ["droplets", "cost_per_hour"]
+
 
 @router.callback_query(AdminCB.filter(F.action == "droplets"))
 async def show_droplets(callback: CallbackQuery, user: User, **kwargs) -> None:
@@ -46,6 +49,9 @@ async def show_droplets(callback: CallbackQuery, user: User, **kwargs) -> None:
     except APIError as e:
         text = fa.ERROR_API.format(error=e.detail)
 
+    if trends := metrics_sampler.render(TREND_METRICS):
+        text += f"\n{trends}"
+
     kb = InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -9,11 +9,14 @@ from bot.callbacks.factory import AdminCB
 from bot.db.models import User
 from bot.keyboards.builders import back_to_menu_button
 from bot.services.api_client import APIError, CarAPI
+from bot.services.metrics_sampler import metrics_sampler
 from bot.texts import fa
 
 logger = logging.getLogger(__name__)
 router = Router()
 
+TREND_METRICS = ["blocked_ips", "avg_latency_ms", "active_agents"]
+
 
 @router.callback_query(AdminCB.filter(F.action == "ipv6"))
 async def show_ipv6(callback: CallbackQuery, user: User, **kwargs) -> None:
@@ -41,6 +44,9 @@ async def show_ipv6(callback: CallbackQuery, user: User, **kwargs) -> None:
     except APIError as e:
         text = fa.ERROR_API.format(error=e.detail)
 
+    if trends := metrics_sampler.render(TREND_METRICS):
+        text += f"\n{trends}"
+
     kb = InlineKeyboardMarkup(
         inline_keyboard=[
             [
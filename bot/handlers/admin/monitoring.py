@@ -1,6 +1,5 @@
 """Admin monitoring dashboard handler."""
 
-import json
 import logging
 
 from aiogram import F, Router
@@ -9,12 +8,23 @@ from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMar
 from bot.callbacks.factory import AdminCB
 from bot.db.models import User
 from bot.keyboards.builders import back_to_menu_button
+from bot.services import codec
 from bot.services.api_client import APIError, CarAPI
+from bot.services.metrics_sampler import metrics_sampler
 from bot.texts import fa
 
 logger = logging.getLogger(__name__)
 router = Router()
 
+TREND_METRICS = [
+    "active_agents",
+    "blocked_ips",
+    "avg_latency_ms",
+    "droplets",
+    "cost_per_hour",
+    "active_searches",
+]
+
 
 @router.callback_query(AdminCB.filter(F.action == "monitoring"))
 async def show_monitoring(callback: CallbackQuery, user: User, **kwargs) -> None:
@@ -57,6 +67,9 @@ async def show_monitoring(callback: CallbackQuery, user: User, **kwargs) -> None
     except APIError as e:
         text = fa.ERROR_API.format(error=e.detail)
 
+    if trends := metrics_sampler.render(TREND_METRICS):
+        text += f"\n{trends}"
+
     kb = InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -98,7 +111,7 @@ async def show_cache(callback: CallbackQuery, user: User, **kwargs) -> None:
     try:
         result = await api.get_cache_tracking()
         text = "📦 وضعیت کش:\n\n"
-        text += json.dumps(result, ensure_ascii=False, indent=2)[:2000]
+        text += codec.dumps_pretty(result)[:2000]
     except APIError as e:
         text = fa.ERROR_API.format(error=e.detail)
 
@@ -1,19 +1,31 @@
 """Admin system handlers: health, version, admin panel."""
 
+import html
 import logging
+from datetime import datetime
 
 from aiogram import F, Router
-from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
+from aiogram.types import (
+    BufferedInputFile,
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+)
 
 from bot.callbacks.factory import AdminCB
 from bot.db.models import User
 from bot.keyboards.builders import back_to_menu_button
+from bot.middlewares.concurrency import update_limiter
+from bot.services import db_maintenance, profiler
 from bot.services.api_client import APIError, CarAPI
+from bot.services.reachability import reachability
 from bot.texts import fa
 
 logger = logging.getLogger(__name__)
 router = Router()
 
+CAPTION_LIMIT = 1024
+
 
 async def show_admin_panel(callback: CallbackQuery, user: User, **kwargs) -> None:
     if not user.is_admin:
@@ -52,10 +64,23 @@ async def show_admin_panel(callback: CallbackQuery, user: User, **kwargs) -> Non
                     callback_data=AdminCB(action="version").pack(),
                 ),
             ],
+            [
+                InlineKeyboardButton(
+                    text=fa.ADMIN_PROFILER,
+                    callback_data=AdminCB(action="profile").pack(),
+                ),
+                InlineKeyboardButton(
+                    text=fa.ADMIN_DATABASE,
+                    callback_data=AdminCB(action="db").pack(),
+                ),
+            ],
             [back_to_menu_button()],
         ]
     )
-    await callback.message.edit_text(fa.ADMIN_TITLE, reply_markup=kb)
+    text = fa.ADMIN_TITLE
+    if reachability.count:
+        text += "\n\n" + fa.ADMIN_UNREACHABLE_USERS.format(count=reachability.count)
+    await callback.message.edit_text(text, reply_markup=kb)
     await callback.answer()
 
 
@@ -136,6 +161,191 @@ async def admin_version(callback: CallbackQuery, user: User, **kwargs) -> None:
     await callback.answer()
 
 
+PROFILE_PRESETS = [
+    ("نمونه‌برداری 10s", "sample:10"),
+    ("نمونه‌برداری 30s", "sample:30"),
+    ("cProfile 10s", "cprofile:10"),
+]
+
+
+@router.callback_query(AdminCB.filter(F.action == "profile"))
+async def admin_profile_menu(callback: CallbackQuery, user: User, **kwargs) -> None:
+    if not user.is_admin:
+        await callback.answer(fa.ADMIN_NOT_AUTHORIZED, show_alert=True)
+        return
+
+    rows = [
+        [
+            InlineKeyboardButton(
+                text=label,
+                callback_data=AdminCB(action="profile_run", value=value).pack(),
+            )
+        ]
+        for label, value in PROFILE_PRESETS
+    ]
+    rows.append(
+        [
+            InlineKeyboardButton(
+                text=fa.BACK,
+                callback_data=AdminCB(action="panel").pack(),
+            )
+        ]
+    )
+    await callback.message.edit_text(
+        fa.PROFILER_TITLE, reply_markup=InlineKeyboardMarkup(inline_keyboard=rows)
+    )
+    await callback.answer()
+
+
+@router.callback_query(AdminCB.filter(F.action == "profile_run"))
+async def admin_profile_run(
+    callback: CallbackQuery, callback_data: AdminCB, user: User, **kwargs
+) -> None:
+    if not user.is_admin:
+        await callback.answer(fa.ADMIN_NOT_AUTHORIZED, show_alert=True)
+        return
+    if profiler.is_running():
+        await callback.answer(fa.PROFILER_BUSY, show_alert=True)
+        return
+
+    mode, _, seconds = callback_data.value.partition(":")
+    # The capture outlives Telegram's callback timeout, so acknowledge first
+    await callback.answer()
+    await callback.message.edit_text(fa.PROFILER_RUNNING.format(mode=mode, seconds=seconds))
+    update_limiter.detach(_profile(callback, mode, float(seconds)), name="profiler-capture")
+
+
+async def _profile(callback: CallbackQuery, mode: str, seconds: float) -> None:
+    kb = InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=fa.BACK,
+                    callback_data=AdminCB(action="profile").pack(),
+                )
+            ],
+            [back_to_menu_button()],
+        ]
+    )
+    try:
+        result = await profiler.capture(seconds, mode)
+    except profiler.ProfilerBusyError:
+        await callback.message.edit_text(fa.PROFILER_BUSY, reply_markup=kb)
+        return
+
+    # Telegram refuses empty files, e.g. a capture that took no samples
+    filename, content = result.profile_file()
+    if content:
+        await callback.message.answer_document(
+            BufferedInputFile(content, filename=filename),
+            caption=_summary_caption(result.summary(limit=8)),
+        )
+    filename, content = result.allocations_file()
+    if content:
+        await callback.message.answer_document(BufferedInputFile(content, filename=filename))
+    await callback.message.edit_text(
+        fa.PROFILER_DONE.format(mode=mode, seconds=result.seconds, samples=result.samples),
+        reply_markup=kb,
+    )
+
+
+def _summary_caption(summary: str) -> str | None:
+    """Whole escaped lines that fit a caption, so no entity is cut in half."""
+    lines: list[str] = []
+    size = len("<pre></pre>")
+    for line in summary.splitlines():
+        escaped = html.escape(line)
+        size += len(escaped) + 1
+        if size > CAPTION_LIMIT:
+            break
+        lines.append(escaped)
+    return "<pre>{}</pre>".format("\n".join(lines)) if lines else None
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def _db_report_text(stats: db_maintenance.DatabaseStats) -> str:
+    text = (
+        f"{fa.DB_TITLE}\n\n"
+        f"💾 حجم فایل: {_format_size(stats.file_bytes)}\n"
+        f"📄 صفحات: {stats.page_count} × {stats.page_size}B\n"
+        f"🕳 صفحات آزاد: {stats.freelist_count} ({stats.fragmentation_pct:.1f}%)\n"
+        f"♻️ auto_vacuum: {stats.auto_vacuum}\n\n"
+    )
+    text += "\n".join(f"• {name}: {count}" for name, count in stats.rows.items())
+
+    report = db_maintenance.last_report
+    if report is None:
+        return f"{text}\n\n{fa.DB_NO_REPORT}"
+    ran_at = datetime.fromtimestamp(report.started_at).strftime("%Y-%m-%d %H:%M")
+    pruned = ", ".join(f"{name}: {count}" for name, count in report.pruned.items()) or "-"
+    text += (
+        f"\n\n🧹 آخرین نگهداری: {ran_at} ({report.duration:.2f}s از {report.budget:.0f}s)\n"
+        f"🗑 حذف‌شده: {pruned}\n"
+        f"📉 صفحات آزادشده: {report.vacuumed_pages}"
+        f" ({_format_size(report.reclaimed_bytes)})\n"
+        f"📊 آمار: {'✅' if report.analyzed else '—'}"
+    )
+    if report.skipped:
+        text += f"\n⏭ ناتمام یا رد شده: {', '.join(report.skipped)}"
+    return text
+
+
+def _db_keyboard() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=fa.DB_RUN_MAINTENANCE,
+                    callback_data=AdminCB(action="db_run").pack(),
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text=fa.BACK,
+                    callback_data=AdminCB(action="panel").pack(),
+                )
+            ],
+            [back_to_menu_button()],
+        ]
+    )
+
+
+@router.callback_query(AdminCB.filter(F.action == "db"))
+async def admin_database(callback: CallbackQuery, user: User, **kwargs) -> None:
+    if not user.is_admin:
+        await callback.answer(fa.ADMIN_NOT_AUTHORIZED, show_alert=True)
+        return
+
+    stats = await db_maintenance.collect_stats()
+    await callback.message.edit_text(_db_report_text(stats), reply_markup=_db_keyboard())
+    await callback.answer()
+
+
+@router.callback_query(AdminCB.filter(F.action == "db_run"))
+async def admin_database_maintenance(callback: CallbackQuery, user: User, **kwargs) -> None:
+    if not user.is_admin:
+        await callback.answer(fa.ADMIN_NOT_AUTHORIZED, show_alert=True)
+        return
+    if db_maintenance.is_running():
+        await callback.answer(fa.DB_MAINTENANCE_BUSY, show_alert=True)
+        return
+
+    await callback.answer(fa.DB_MAINTENANCE_RUNNING)
+    try:
+        report = await db_maintenance.run_maintenance()
+    except db_maintenance.MaintenanceBusyError:
+        await callback.message.answer(fa.DB_MAINTENANCE_BUSY)
+        return
+    await callback.message.edit_text(_db_report_text(report.after), reply_markup=_db_keyboard())
+
+
 @router.callback_query(AdminCB.filter(F.action == "panel"))
 async def back_to_admin(callback: CallbackQuery, user: User, **kwargs) -> None:
     await show_admin_panel(callback, user)
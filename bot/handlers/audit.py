@@ -1,16 +1,33 @@
-"""Audit log browser with filters and pagination."""
+"""Audit log browser with filters, search and pagination over the local mirror."""
 
 import contextlib
-import json
 import logging
+import os
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
 
 from aiogram import F, Router
-from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+from aiogram.types import (
+    CallbackQuery,
+    FSInputFile,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
 
 from bot.callbacks.factory import AuditCB, PageCB, SettingsCB
 from bot.db.models import User
-from bot.keyboards.builders import back_to_menu_button, pagination_keyboard
+from bot.keyboards.builders import back_button, back_to_menu_button, pagination_keyboard
+from bot.middlewares.concurrency import update_limiter
+from bot.services import codec
 from bot.services.api_client import APIError, CarAPI
+from bot.services.audit_export import FORMATS, ExportBusyError, ExportProgress, export_audit_logs
+from bot.services.audit_mirror import AuditFilters, audit_mirror
+from bot.states.audit import AuditForm
 from bot.texts import fa
 
 logger = logging.getLogger(__name__)
@@ -19,33 +36,77 @@ router = Router()
 LOGS_PER_PAGE = 10
 
 
-@router.callback_query(SettingsCB.filter(F.action == "audit"))
-async def show_audit_logs(callback: CallbackQuery, user: User, page: int = 0, **kwargs) -> None:
-    api = CarAPI(user.access_token)
-    try:
-        result = await api.list_audit_logs(
-            limit=LOGS_PER_PAGE,
-            offset=page * LOGS_PER_PAGE,
-        )
-        logs = result.get("logs", [])
-        total = result.get("total", len(logs))
-    except APIError as e:
-        await callback.message.edit_text(
-            fa.ERROR_API.format(error=e.detail),
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[[back_to_menu_button()]]),
-        )
-        await callback.answer()
-        return
+STATUS_CLASSES = (2, 4, 5)
+EXPORT_EDIT_INTERVAL = 2.0  # seconds between progress edits
+EXPORT_RANGES = [
+    ("۲۴ ساعت", 1),
+    ("۷ روز", 7),
+    ("۳۰ روز", 30),
+]
+
+
+async def _filters(state: FSMContext) -> AuditFilters:
+    return AuditFilters(**(await state.get_data()).get("audit_filters", {}))
 
-    if not logs and page == 0:
-        await callback.message.edit_text(
-            fa.AUDIT_EMPTY,
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=[[back_to_menu_button()]]),
-        )
-        await callback.answer()
-        return
 
-    text = f"{fa.AUDIT_TITLE}\n\n"
+async def _set_filter(state: FSMContext, key: str, value) -> None:
+    filters = (await state.get_data()).get("audit_filters", {})
+    # Tapping the active choice again clears it
+    if value is None or filters.get(key) == value:
+        filters.pop(key, None)
+    else:
+        filters[key] = value
+    await state.update_data(audit_filters=filters)
+
+
+def _filters_summary(filters: AuditFilters) -> str:
+    parts = [
+        filters.account,
+        filters.action,
+        f"{filters.status_class}xx" if filters.status_class else None,
+        f"«{filters.text}»" if filters.text else None,
+    ]
+    return ", ".join(p for p in parts if p)
+
+
+async def _render_logs(
+    user: User, state: FSMContext, page: int, restart: bool = True
+) -> tuple[str, InlineKeyboardMarkup]:
+    """List page served from the local mirror, which the first visit populates.
+
+    Opening the list anchors it at the newest mirrored entry; paging keeps
+    the anchor, so background syncs do not shift rows between pages.
+    """
+    if not audit_mirror.synced(user.telegram_id):
+        await audit_mirror.sync(user.telegram_id)
+    audit_mirror.touch(user.telegram_id)
+
+    anchor = (await state.get_data()).get("audit_anchor")
+    if restart or anchor is None:
+        anchor = await audit_mirror.newest_id(user.telegram_id)
+        await state.update_data(audit_anchor=anchor)
+
+    filters = await _filters(state)
+    logs, total = await audit_mirror.query(
+        user.telegram_id,
+        filters,
+        limit=LOGS_PER_PAGE,
+        offset=page * LOGS_PER_PAGE,
+        up_to=anchor,
+    )
+
+    filter_row = [
+        InlineKeyboardButton(text=fa.AUDIT_FILTER, callback_data=AuditCB(action="filters").pack())
+    ]
+    if not logs and page == 0 and not filters.active:
+        return fa.AUDIT_EMPTY, InlineKeyboardMarkup(inline_keyboard=[[back_to_menu_button()]])
+
+    text = f"{fa.AUDIT_TITLE}\n"
+    if filters.active:
+        text += f"{fa.AUDIT_ACTIVE_FILTERS.format(filters=_filters_summary(filters))}\n"
+    text += "\n"
+    if not logs:
+        text += fa.AUDIT_EMPTY
     item_buttons: list[list[InlineKeyboardButton]] = []
     for log in logs:
         log_id = log.get("id", 0)
@@ -60,27 +121,254 @@ async def show_audit_logs(callback: CallbackQuery, user: User, page: int = 0, **
                 )
             ]
         )
+    item_buttons.append(filter_row)
 
     total_pages = max(1, (total + LOGS_PER_PAGE - 1) // LOGS_PER_PAGE)
+    return text, pagination_keyboard("audit", page, total_pages, item_buttons)
+
+
+@router.callback_query(SettingsCB.filter(F.action == "audit"))
+@router.callback_query(AuditCB.filter(F.action == "list"))
+async def show_audit_logs(
+    callback: CallbackQuery,
+    user: User,
+    state: FSMContext,
+    page: int = 0,
+    restart: bool = True,
+    **kwargs,
+) -> None:
+    try:
+        text, markup = await _render_logs(user, state, page, restart)
+    except APIError as e:
+        text = fa.ERROR_API.format(error=e.detail)
+        markup = InlineKeyboardMarkup(inline_keyboard=[[back_to_menu_button()]])
+    await callback.message.edit_text(text, reply_markup=markup)
+    await callback.answer()
+
+
+@router.callback_query(PageCB.filter(F.section == "audit"))
+async def audit_page(
+    callback: CallbackQuery, callback_data: PageCB, user: User, state: FSMContext, **kwargs
+) -> None:
+    await show_audit_logs(callback, user, state, page=callback_data.page, restart=False)
+
+
+def _choice(label: str, selected: bool, callback_data: AuditCB) -> InlineKeyboardButton:
+    return InlineKeyboardButton(
+        text=f"✅ {label}" if selected else label, callback_data=callback_data.pack()
+    )
+
+
+@router.callback_query(AuditCB.filter(F.action == "filters"))
+async def show_audit_filters(
+    callback: CallbackQuery, user: User, state: FSMContext, **kwargs
+) -> None:
+    from bot.handlers.account import get_accounts
+
+    filters = await _filters(state)
+    actions = await audit_mirror.top_actions(user.telegram_id)
+    # Buttons refer to actions by position; names may not fit in callback data
+    await state.update_data(audit_actions=actions)
+
+    rows = [
+        [
+            _choice(f"{c}xx", filters.status_class == c, AuditCB(action="status", value=str(c)))
+            for c in STATUS_CLASSES
+        ]
+    ]
+    rows += [
+        [_choice(f"👤 {a}", filters.account == a, AuditCB(action="account", value=a))]
+        for a in get_accounts(user)
+    ]
+    rows += [
+        [_choice(f"⚙️ {a}", filters.action == a, AuditCB(action="act", value=str(i)))]
+        for i, a in enumerate(actions)
+    ]
+    rows.append(
+        [InlineKeyboardButton(text=fa.AUDIT_SEARCH, callback_data=AuditCB(action="search").pack())]
+    )
+    if user.is_admin:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=fa.AUDIT_EXPORT, callback_data=AuditCB(action="export").pack()
+                )
+            ]
+        )
+    if filters.active:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=fa.AUDIT_FILTER_CLEAR, callback_data=AuditCB(action="clear").pack()
+                )
+            ]
+        )
+    rows.append([back_button(AuditCB(action="list").pack())])
+
+    text = fa.AUDIT_FILTERS_TITLE
+    if filters.active:
+        text += f"\n\n{fa.AUDIT_ACTIVE_FILTERS.format(filters=_filters_summary(filters))}"
+    await callback.message.edit_text(text, reply_markup=InlineKeyboardMarkup(inline_keyboard=rows))
+    await callback.answer()
+
+
+@router.callback_query(AuditCB.filter(F.action.in_({"status", "account", "act", "clear"})))
+async def apply_audit_filter(
+    callback: CallbackQuery, callback_data: AuditCB, user: User, state: FSMContext, **kwargs
+) -> None:
+    if callback_data.action == "status":
+        await _set_filter(state, "status_class", int(callback_data.value))
+    elif callback_data.action == "account":
+        await _set_filter(state, "account", callback_data.value)
+    elif callback_data.action == "act":
+        actions = (await state.get_data()).get("audit_actions", [])
+        index = int(callback_data.value)
+        if index < len(actions):
+            await _set_filter(state, "action", actions[index])
+    else:
+        await state.update_data(audit_filters={})
+    await show_audit_logs(callback, user, state)
+
+
+@router.callback_query(AuditCB.filter(F.action == "search"))
+async def ask_audit_search(callback: CallbackQuery, state: FSMContext, **kwargs) -> None:
+    await state.set_state(AuditForm.search_text)
+    await callback.message.edit_text(fa.AUDIT_SEARCH_PROMPT)
+    await callback.answer()
+
+
+@router.message(AuditForm.search_text)
+async def receive_audit_search(message: Message, user: User, state: FSMContext, **kwargs) -> None:
+    await state.set_state(None)
+    query = (message.text or "").strip()
+    filters = (await state.get_data()).get("audit_filters", {})
+    if query:
+        filters["text"] = query
+    else:
+        filters.pop("text", None)
+    await state.update_data(audit_filters=filters)
+    try:
+        text, markup = await _render_logs(user, state, 0)
+    except APIError as e:
+        text = fa.ERROR_API.format(error=e.detail)
+        markup = InlineKeyboardMarkup(inline_keyboard=[[back_to_menu_button()]])
+    await message.answer(text, reply_markup=markup)
+
+
+@router.callback_query(AuditCB.filter(F.action == "export"))
+async def show_audit_export(callback: CallbackQuery, user: User, **kwargs) -> None:
+    if not user.is_admin:
+        await callback.answer(fa.ADMIN_NOT_AUTHORIZED, show_alert=True)
+        return
+
+    rows = [
+        [
+            InlineKeyboardButton(
+                text=f"{label} · {fmt.upper()}",
+                callback_data=AuditCB(action="export_run", value=f"{days}:{fmt}").pack(),
+            )
+            for fmt in FORMATS
+        ]
+        for label, days in EXPORT_RANGES
+    ]
+    rows.append([back_button(AuditCB(action="filters").pack())])
     await callback.message.edit_text(
-        text,
-        reply_markup=pagination_keyboard("audit", page, total_pages, item_buttons),
+        fa.AUDIT_EXPORT_TITLE, reply_markup=InlineKeyboardMarkup(inline_keyboard=rows)
     )
     await callback.answer()
 
 
-@router.callback_query(PageCB.filter(F.section == "audit"))
-async def audit_page(callback: CallbackQuery, callback_data: PageCB, user: User, **kwargs) -> None:
-    await show_audit_logs(callback, user, page=callback_data.page)
+@router.callback_query(AuditCB.filter(F.action == "export_run"))
+async def run_audit_export(
+    callback: CallbackQuery, callback_data: AuditCB, user: User, state: FSMContext, **kwargs
+) -> None:
+    if not user.is_admin:
+        await callback.answer(fa.ADMIN_NOT_AUTHORIZED, show_alert=True)
+        return
+
+    days, _, fmt = callback_data.value.partition(":")
+    started_at = datetime.now(UTC)
+    filters = await _filters(state)
+    api_filters = {
+        "user_account": filters.account,
+        "action": filters.action,
+        "start_time": (started_at - timedelta(days=int(days))).isoformat(timespec="seconds"),
+        # Pinned so entries logged during the export don't shift its offset pages
+        "end_time": started_at.isoformat(timespec="seconds"),
+    }
+    # Large exports outlive Telegram's callback timeout
+    await callback.answer()
+    await callback.message.edit_text(fa.AUDIT_EXPORT_PROGRESS.format(rows=0, total="?"))
+    # and run for minutes, which must not hold the chat's other taps
+    update_limiter.detach(
+        _export(
+            callback, CarAPI(user.access_token), user.telegram_id, fmt, api_filters, started_at
+        ),
+        name=f"audit-export-{user.telegram_id}",
+    )
+
+
+async def _export(
+    callback: CallbackQuery,
+    api: CarAPI,
+    owner: int,
+    fmt: str,
+    api_filters: dict,
+    started_at: datetime,
+) -> None:
+    last_edit = time.monotonic()
+
+    async def report(progress: ExportProgress) -> None:
+        nonlocal last_edit
+        if time.monotonic() - last_edit < EXPORT_EDIT_INTERVAL:
+            return
+        last_edit = time.monotonic()
+        with contextlib.suppress(TelegramBadRequest):
+            await callback.message.edit_text(
+                fa.AUDIT_EXPORT_PROGRESS.format(rows=progress.rows, total=progress.total or "?")
+            )
+
+    markup = InlineKeyboardMarkup(
+        inline_keyboard=[[back_button(AuditCB(action="list").pack())], [back_to_menu_button()]]
+    )
+    fd, name = tempfile.mkstemp(suffix=f".{fmt}.gz")
+    os.close(fd)
+    path = Path(name)
+    try:
+        result = await export_audit_logs(
+            api,
+            path,
+            owner=owner,
+            fmt=fmt,
+            filters=api_filters,
+            on_progress=report,
+        )
+        if not result.rows:
+            await callback.message.edit_text(fa.AUDIT_EMPTY, reply_markup=markup)
+            return
+        await callback.message.answer_document(
+            FSInputFile(path, filename=f"audit-{started_at:%Y%m%d-%H%M}.{fmt}.gz")
+        )
+        await callback.message.edit_text(
+            fa.AUDIT_EXPORT_DONE.format(rows=result.rows, seconds=result.duration),
+            reply_markup=markup,
+        )
+    except ExportBusyError:
+        await callback.message.edit_text(fa.AUDIT_EXPORT_BUSY, reply_markup=markup)
+    except APIError as e:
+        await callback.message.edit_text(fa.ERROR_API.format(error=e.detail), reply_markup=markup)
+    finally:
+        path.unlink(missing_ok=True)
 
 
 @router.callback_query(AuditCB.filter(F.action == "detail"))
 async def audit_detail(
     callback: CallbackQuery, callback_data: AuditCB, user: User, **kwargs
 ) -> None:
-    api = CarAPI(user.access_token)
     try:
-        log = await api.get_audit_log(callback_data.log_id)
+        log = await audit_mirror.get(user.telegram_id, callback_data.log_id)
+        if log is None:
+            log = await CarAPI(user.access_token).get_audit_log(callback_data.log_id)
         text = fa.AUDIT_DETAIL.format(
             id=log.get("id", "?"),
             user=log.get("user_account", "?"),
@@ -93,12 +381,9 @@ async def audit_detail(
         if log.get("request_body"):
             body = log["request_body"]
             if isinstance(body, str):
-                with contextlib.suppress(json.JSONDecodeError):
-                    body = json.loads(body)
-            if isinstance(body, dict):
-                body_str = json.dumps(body, ensure_ascii=False, indent=2)
-            else:
-                body_str = str(body)
+                with contextlib.suppress(codec.DecodeError):
+                    body = codec.loads(body)
+            body_str = codec.dumps_pretty(body) if isinstance(body, dict) else str(body)
             if len(body_str) > 500:
                 body_str = body_str[:500] + "..."
             text += f"\n\n📤 درخواست:\n<pre>{body_str}</pre>"
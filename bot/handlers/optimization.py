@@ -10,6 +10,7 @@ from bot.callbacks.factory import OptimizationCB
 from bot.db.models import User
 from bot.keyboards.builders import back_to_menu_button
 from bot.services.api_client import APIError, CarAPI
+from bot.services.status_watcher import watcher
 from bot.states.optimization import OptimizationForm
 from bot.texts import fa
 
@@ -25,6 +26,26 @@ WEIGHT_PRESETS = {
 IMPROVEMENT_PRESETS = [5, 10, 15, 20]
 
 
+def _status_keyboard(watching: bool) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=fa.SEARCH_STOP,
+                    callback_data=OptimizationCB(action="stop").pack(),
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text=fa.WATCH_OFF if watching else fa.WATCH_ON,
+                    callback_data=OptimizationCB(action="watch").pack(),
+                )
+            ],
+            [back_to_menu_button()],
+        ]
+    )
+
+
 async def show_optimization_menu(callback: CallbackQuery, user: User, **kwargs) -> None:
     account = user.selected_account
     if not account:
@@ -33,7 +54,8 @@ async def show_optimization_menu(callback: CallbackQuery, user: User, **kwargs)
 
     api = CarAPI(user.access_token)
     try:
-        status = await api.get_optimization_status(account)
+        status = watcher.latest(user.telegram_id, account, "optimization")
+        status = status or await api.get_optimization_status(account)
         s = status.get("status", "")
         if s in ("running", "completed"):
             text = f"{fa.OPT_STATUS_TITLE}\n"
@@ -47,18 +69,8 @@ async def show_optimization_menu(callback: CallbackQuery, user: User, **kwargs)
                 bs = bc.get("total_score", "?")
                 text += f"\n⭐ بهترین: {bm} (امتیاز: {bs})"
 
-            kb = InlineKeyboardMarkup(
-                inline_keyboard=[
-                    [
-                        InlineKeyboardButton(
-                            text=fa.SEARCH_STOP,
-                            callback_data=OptimizationCB(action="stop").pack(),
-                        )
-                    ],
-                    [back_to_menu_button()],
-                ]
-            )
-            await callback.message.edit_text(text, reply_markup=kb)
+            watching = watcher.is_subscribed(user.telegram_id, account, "optimization")
+            await callback.message.edit_text(text, reply_markup=_status_keyboard(watching))
             await callback.answer()
             return
     except APIError:
@@ -369,3 +381,23 @@ async def stop_optimization(callback: CallbackQuery, user: User, **kwargs) -> No
             reply_markup=InlineKeyboardMarkup(inline_keyboard=[[back_to_menu_button()]]),
         )
     await callback.answer()
+
+
+@router.callback_query(OptimizationCB.filter(F.action == "watch"))
+async def toggle_optimization_watch(callback: CallbackQuery, user: User, **kwargs) -> None:
+    account = user.selected_account
+    if not account:
+        await callback.answer(fa.NO_ACCOUNTS, show_alert=True)
+        return
+
+    if watcher.is_subscribed(user.telegram_id, account, "optimization"):
+        watcher.unsubscribe(user.telegram_id, account, "optimization")
+        await callback.answer(fa.WATCH_STOPPED)
+    else:
+        watcher.subscribe(callback.bot, user.telegram_id, account, "optimization")
+        await callback.answer(fa.WATCH_STARTED)
+    await callback.message.edit_reply_markup(
+        reply_markup=_status_keyboard(
+            watcher.is_subscribed(user.telegram_id, account, "optimization")
+        )
+    )
@@ -9,14 +9,27 @@ from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
 from bot.callbacks.factory import SearchCB
 from bot.db.models import User
 from bot.keyboards.builders import back_to_menu_button
-from bot.keyboards.search import filters_keyboard, radius_keyboard, search_status_keyboard
+from bot.keyboards.search import (
+    filters_keyboard,
+    multi_account_keyboard,
+    radius_keyboard,
+    search_status_keyboard,
+)
 from bot.services.api_client import APIError, CarAPI
+from bot.services.fleet import fleet
+from bot.services.multi_search import multi_searches
+from bot.services.status_watcher import watcher
+from bot.services.zones import ZoneMatch, zones
 from bot.states.search import SearchForm
 from bot.texts import fa
 
 logger = logging.getLogger(__name__)
 router = Router()
 
+NEARBY_RADIUS_KM = 5.0
+NEARBY_LIMIT = 5
+MAX_CUSTOM_RADIUS_M = 50_000
+
 
 async def show_search_menu(callback: CallbackQuery, user: User, **kwargs) -> None:
     """Show search status or start new search."""
@@ -27,7 +40,9 @@ async def show_search_menu(callback: CallbackQuery, user: User, **kwargs) -> Non
 
     api = CarAPI(user.access_token)
     try:
-        status = await api.get_search_status(account)
+        status = watcher.latest(user.telegram_id, account, "search") or await api.get_search_status(
+            account
+        )
         s = status.get("status", "")
         if s in ("running", "completed"):
             text = f"{fa.SEARCH_STATUS_TITLE}\n"
@@ -43,7 +58,8 @@ async def show_search_menu(callback: CallbackQuery, user: User, **kwargs) -> Non
                 )
             if s == "completed" and status.get("result"):
                 text += f"\n\n{fa.SEARCH_STATUS_FOUND}"
-            await callback.message.edit_text(text, reply_markup=search_status_keyboard())
+            watching = watcher.is_subscribed(user.telegram_id, account, "search")
+            await callback.message.edit_text(text, reply_markup=search_status_keyboard(watching))
             await callback.answer()
             return
     except APIError:
@@ -72,9 +88,12 @@ async def start_search_wizard(
     callback: CallbackQuery, state: FSMContext, user: User, **kwargs
 ) -> None:
     """Start the search wizard - request location."""
+    from bot.handlers.account import get_accounts
+
     await state.set_state(SearchForm.send_location)
     await state.update_data(
         account=user.selected_account,
+        multi=len(get_accounts(user)) > 1,
         filters={
             "no_prius": True,
             "no_ev": False,
@@ -86,7 +105,7 @@ async def start_search_wizard(
 
 
 @router.message(SearchForm.send_location)
-async def receive_location(message: Message, state: FSMContext, **kwargs) -> None:
+async def receive_location(message: Message, state: FSMContext, user: User, **kwargs) -> None:
     """Receive location from user (shared location or text coordinates)."""
     lat, lng = None, None
 
@@ -108,9 +127,61 @@ async def receive_location(message: Message, state: FSMContext, **kwargs) -> Non
         await message.answer(fa.SEARCH_SEND_LOCATION)
         return
 
+    match = (await zones.ensure(user.telegram_id)).locate(lat, lng)
+    # No radius reaches farther; closer points are checked against the chosen radius
+    if match and match.distance_km > MAX_CUSTOM_RADIUS_M / 1000:
+        await message.answer(_zone_text(fa.ZONE_OUT_OF_RANGE, match))
+        return
+
     await state.update_data(latitude=lat, longitude=lng)
     await state.set_state(SearchForm.select_radius)
-    await message.answer(fa.SEARCH_SELECT_RADIUS, reply_markup=radius_keyboard())
+    parts = [
+        _zone_text(fa.ZONE_INSIDE if match.inside else fa.ZONE_OUTSIDE, match) if match else None,
+        _nearby_text(message.from_user.id, lat, lng),
+        fa.SEARCH_SELECT_RADIUS,
+    ]
+    await message.answer("\n\n".join(p for p in parts if p), reply_markup=radius_keyboard())
+
+
+def _format_distance(km: float) -> str:
+    return f"{km * 1000:.0f}m" if km < 1 else f"{km:.1f}km"
+
+
+def _nearby_text(telegram_id: int, lat: float, lng: float) -> str | None:
+    """Nearest cars from the fleet index; None until the first index is built."""
+    index = fleet.touch(telegram_id)
+    if not fleet.ready:
+        return None
+    cars = index.nearest(lat, lng, NEARBY_RADIUS_KM, limit=NEARBY_LIMIT)
+    if not cars:
+        return fa.NEARBY_NONE.format(radius=NEARBY_RADIUS_KM)
+    lines = [fa.NEARBY_TITLE]
+    for car in cars:
+        v = car.vehicle
+        number = v.get("vehicleNb", v.get("vehicle_nb", "?"))
+        lines.append(f"• {v.get('model', '?')} #{number} — {_format_distance(car.distance_km)}")
+    return "\n".join(lines)
+
+
+def _zone_text(template: str, match: ZoneMatch) -> str:
+    return template.format(zone=match.zone.name, distance=_format_distance(match.distance_km))
+
+
+def _zone_rejection(data: dict) -> str | None:
+    """Why the search cannot reach any service zone, checked before calling the backend."""
+    match = zones.index.locate(data["latitude"], data["longitude"])
+    if match and match.distance_km > data["radius"]:
+        return _zone_text(fa.ZONE_RADIUS_TOO_SMALL, match)
+    return None
+
+
+def _filters_text(telegram_id: int, data: dict) -> str:
+    index = fleet.touch(telegram_id)
+    if not fleet.ready:
+        return fa.SEARCH_FILTERS_TITLE
+    mask = index.search_filter_mask(data.get("filters", {}))
+    count = index.count_within(data["latitude"], data["longitude"], data["radius"], mask)
+    return f"{fa.NEARBY_COUNT.format(count=count)}\n\n{fa.SEARCH_FILTERS_TITLE}"
 
 
 @router.callback_query(SearchCB.filter(F.action == "radius"), SearchForm.select_radius)
@@ -119,7 +190,7 @@ async def select_radius(
 ) -> None:
     if callback_data.value == "custom":
         await state.set_state(SearchForm.custom_radius)
-        await callback.message.edit_text(fa.SEARCH_RADIUS_PROMPT)
+        await callback.message.edit_text(fa.SEARCH_RADIUS_PROMPT.format(max=MAX_CUSTOM_RADIUS_M))
         await callback.answer()
         return
 
@@ -129,8 +200,8 @@ async def select_radius(
 
     data = await state.get_data()
     await callback.message.edit_text(
-        fa.SEARCH_FILTERS_TITLE,
-        reply_markup=filters_keyboard(data.get("filters", {})),
+        _filters_text(callback.from_user.id, data),
+        reply_markup=filters_keyboard(data.get("filters", {}), data.get("multi", False)),
     )
     await callback.answer()
 
@@ -139,10 +210,10 @@ async def select_radius(
 async def custom_radius(message: Message, state: FSMContext, **kwargs) -> None:
     try:
         radius_m = int(message.text.strip())
-        if radius_m <= 0:
+        if not 0 < radius_m <= MAX_CUSTOM_RADIUS_M:
             raise ValueError
     except (ValueError, AttributeError):
-        await message.answer(fa.SEARCH_RADIUS_PROMPT)
+        await message.answer(fa.SEARCH_RADIUS_PROMPT.format(max=MAX_CUSTOM_RADIUS_M))
         return
 
     await state.update_data(radius=radius_m / 1000)
@@ -150,8 +221,8 @@ async def custom_radius(message: Message, state: FSMContext, **kwargs) -> None:
 
     data = await state.get_data()
     await message.answer(
-        fa.SEARCH_FILTERS_TITLE,
-        reply_markup=filters_keyboard(data.get("filters", {})),
+        _filters_text(message.from_user.id, data),
+        reply_markup=filters_keyboard(data.get("filters", {}), data.get("multi", False)),
     )
 
 
@@ -165,24 +236,34 @@ async def toggle_filter(
     filters[key] = not filters.get(key, False)
     await state.update_data(filters=filters)
 
-    await callback.message.edit_reply_markup(reply_markup=filters_keyboard(filters))
+    data["filters"] = filters
+    await callback.message.edit_text(
+        _filters_text(callback.from_user.id, data),
+        reply_markup=filters_keyboard(filters, data.get("multi", False)),
+    )
     await callback.answer()
 
 
-@router.callback_query(SearchCB.filter(F.action == "confirm"), SearchForm.select_filters)
-async def confirm_search(callback: CallbackQuery, state: FSMContext, user: User, **kwargs) -> None:
-    data = await state.get_data()
-    account = data.get("account", user.selected_account)
-
-    params = {
+def _search_params(data: dict) -> dict:
+    return {
         "point": {"latitude": data["latitude"], "longitude": data["longitude"]},
         "radius": data["radius"],
         "filters": data.get("filters", {}),
     }
 
+
+@router.callback_query(SearchCB.filter(F.action == "confirm"), SearchForm.select_filters)
+async def confirm_search(callback: CallbackQuery, state: FSMContext, user: User, **kwargs) -> None:
+    data = await state.get_data()
+    if rejection := _zone_rejection(data):
+        await callback.answer(rejection, show_alert=True)
+        return
+    account = data.get("account", user.selected_account)
+
     api = CarAPI(user.access_token)
     try:
-        await api.start_search(account, params)
+        await api.start_search(account, _search_params(data))
+        await multi_searches.release(callback.bot, account)
         await callback.message.edit_text(
             fa.SEARCH_STARTED,
             reply_markup=search_status_keyboard(),
@@ -197,6 +278,79 @@ async def confirm_search(callback: CallbackQuery, state: FSMContext, user: User,
     await callback.answer()
 
 
+@router.callback_query(SearchCB.filter(F.action == "multi"), SearchForm.select_filters)
+async def choose_multi_accounts(
+    callback: CallbackQuery, state: FSMContext, user: User, **kwargs
+) -> None:
+    from bot.handlers.account import get_accounts
+
+    data = await state.get_data()
+    targets = [data["account"]] if data.get("account") else []
+    await state.update_data(targets=targets)
+    await state.set_state(SearchForm.select_account)
+    await callback.message.edit_text(
+        fa.MULTI_SEARCH_SELECT,
+        reply_markup=multi_account_keyboard(get_accounts(user), targets),
+    )
+    await callback.answer()
+
+
+@router.callback_query(SearchCB.filter(F.action == "multi_toggle"), SearchForm.select_account)
+async def toggle_multi_account(
+    callback: CallbackQuery, callback_data: SearchCB, state: FSMContext, user: User, **kwargs
+) -> None:
+    from bot.handlers.account import get_accounts
+
+    accounts = get_accounts(user)
+    targets = (await state.get_data()).get("targets", [])
+    if callback_data.value in targets:
+        targets.remove(callback_data.value)
+    elif callback_data.value in accounts:
+        targets.append(callback_data.value)
+    await state.update_data(targets=targets)
+
+    await callback.message.edit_reply_markup(reply_markup=multi_account_keyboard(accounts, targets))
+    await callback.answer()
+
+
+@router.callback_query(SearchCB.filter(F.action == "multi_confirm"), SearchForm.select_account)
+async def confirm_multi_search(
+    callback: CallbackQuery, state: FSMContext, user: User, **kwargs
+) -> None:
+    data = await state.get_data()
+    targets = data.get("targets", [])
+    if not targets:
+        await callback.answer(fa.MULTI_SEARCH_NO_TARGETS, show_alert=True)
+        return
+    if rejection := _zone_rejection(data):
+        await callback.answer(rejection, show_alert=True)
+        return
+
+    await state.clear()
+    await callback.answer()
+    await multi_searches.start(
+        callback.bot,
+        CarAPI(user.access_token),
+        telegram_id=user.telegram_id,
+        chat_id=callback.message.chat.id,
+        message_id=callback.message.message_id,
+        accounts=targets,
+        params=_search_params(data),
+    )
+
+
+@router.callback_query(SearchCB.filter(F.action == "multi_stop"))
+async def stop_multi_search(
+    callback: CallbackQuery, callback_data: SearchCB, user: User, **kwargs
+) -> None:
+    search = multi_searches.get(callback_data.value)
+    if search is None or search.telegram_id != user.telegram_id:
+        await callback.answer(fa.SEARCH_NO_ACTIVE, show_alert=True)
+        return
+    await callback.answer()
+    await multi_searches.stop_all(callback.bot, search)
+
+
 @router.callback_query(SearchCB.filter(F.action == "stop"))
 async def stop_search(callback: CallbackQuery, user: User, **kwargs) -> None:
     account = user.selected_account
@@ -219,6 +373,26 @@ async def stop_search(callback: CallbackQuery, user: User, **kwargs) -> None:
     await callback.answer()
 
 
+@router.callback_query(SearchCB.filter(F.action == "watch"))
+async def toggle_search_watch(callback: CallbackQuery, user: User, **kwargs) -> None:
+    account = user.selected_account
+    if not account:
+        await callback.answer(fa.NO_ACCOUNTS, show_alert=True)
+        return
+
+    if watcher.is_subscribed(user.telegram_id, account, "search"):
+        watcher.unsubscribe(user.telegram_id, account, "search")
+        await callback.answer(fa.WATCH_STOPPED)
+    else:
+        watcher.subscribe(callback.bot, user.telegram_id, account, "search")
+        await callback.answer(fa.WATCH_STARTED)
+    await callback.message.edit_reply_markup(
+        reply_markup=search_status_keyboard(
+            watcher.is_subscribed(user.telegram_id, account, "search")
+        )
+    )
+
+
 @router.callback_query(SearchCB.filter(F.action == "status"))
 async def search_status(callback: CallbackQuery, user: User, **kwargs) -> None:
     await show_search_menu(callback, user)
@@ -5,10 +5,12 @@ import logging
 from aiogram import F, Router
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 
-from bot.callbacks.factory import PageCB, VehicleCB
+from bot.callbacks.factory import FleetCB, PageCB, VehicleCB
 from bot.db.models import User
 from bot.keyboards.builders import back_to_menu_button, pagination_keyboard
+from bot.keyboards.vehicles import fleet_browser_keyboard, parse_facets
 from bot.services.api_client import APIError, CarAPI
+from bot.services.fleet import fleet
 from bot.texts import fa
 
 logger = logging.getLogger(__name__)
@@ -38,6 +40,11 @@ async def show_vehicles_list(callback: CallbackQuery, user: User, page: int = 0,
         await callback.answer()
         return
 
+    # The list doubles as a fleet index refresh for the faceted browser
+    if fleet.stale:
+        await fleet.load(vehicles)
+    fleet.touch(user.telegram_id)
+
     total = len(vehicles)
     total_pages = max(1, (total + VEHICLES_PER_PAGE - 1) // VEHICLES_PER_PAGE)
     page = min(page, total_pages - 1)
@@ -60,6 +67,10 @@ async def show_vehicles_list(callback: CallbackQuery, user: User, page: int = 0,
             ]
         )
 
+    item_buttons.append(
+        [InlineKeyboardButton(text=fa.VEHICLES_BROWSE, callback_data=FleetCB(action="view").pack())]
+    )
+
     await callback.message.edit_text(
         text,
         reply_markup=pagination_keyboard("vehicles", page, total_pages, item_buttons),
@@ -74,6 +85,39 @@ async def vehicles_page(
     await show_vehicles_list(callback, user, page=callback_data.page)
 
 
+@router.callback_query(FleetCB.filter(F.action == "view"))
+async def fleet_browser(
+    callback: CallbackQuery, callback_data: FleetCB, user: User, **kwargs
+) -> None:
+    """Faceted browsing over the in-memory fleet index, without backend calls."""
+    index = fleet.touch(user.telegram_id)
+    if not fleet.ready:
+        await callback.answer(fa.FLEET_LOADING, show_alert=True)
+        return
+
+    facets = parse_facets(callback_data.facets)
+    models = index.models
+    model = callback_data.model if 0 <= callback_data.model < len(models) else -1
+    selected = [*facets, f"model:{models[model]}"] if model >= 0 else facets
+    mask = index.mask(selected)
+
+    total = mask.bit_count()
+    total_pages = max(1, (total + VEHICLES_PER_PAGE - 1) // VEHICLES_PER_PAGE)
+    page = min(callback_data.page, total_pages - 1)
+    vehicles = index.rows(mask, page * VEHICLES_PER_PAGE, VEHICLES_PER_PAGE)
+
+    text = fa.FLEET_TITLE.format(count=total, total=len(index))
+    if not total:
+        text += f"\n\n{fa.FLEET_NO_MATCH}"
+    await callback.message.edit_text(
+        text,
+        reply_markup=fleet_browser_keyboard(
+            index, facets, model, mask, page, total_pages, vehicles
+        ),
+    )
+    await callback.answer()
+
+
 @router.callback_query(VehicleCB.filter(F.action == "detail"))
 async def vehicle_detail(
     callback: CallbackQuery, callback_data: VehicleCB, user: User, **kwargs
@@ -1,5 +1,6 @@
 """Webhook CRUD, test, and delivery handlers."""
 
+import html
 import logging
 
 from aiogram import F, Router
@@ -7,9 +8,13 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from bot.callbacks.factory import PageCB, SettingsCB, WebhookCB
+from bot.config import settings
 from bot.db.models import User
 from bot.keyboards.builders import back_to_menu_button, pagination_keyboard
+from bot.middlewares.concurrency import update_limiter
+from bot.services import webhook_health
 from bot.services.api_client import APIError, CarAPI
+from bot.services.paginator import Paginator
 from bot.states.webhook import WebhookForm
 from bot.texts import fa
 
@@ -17,15 +22,27 @@ logger = logging.getLogger(__name__)
 router = Router()
 
 WEBHOOKS_PER_PAGE = 5
+MESSAGE_LIMIT = 4096
+ERROR_CHARS = 120  # of a failing webhook's error detail in the report
+
+
+async def _fetch_webhooks(api: CarAPI, skip: int, limit: int) -> tuple[list[dict], int]:
+    result = await api.list_webhooks(skip=skip, limit=limit)
+    webhooks = result.get("webhooks", [])
+    return webhooks, result.get("total", len(webhooks))
+
+
+webhook_pages = Paginator(_fetch_webhooks, WEBHOOKS_PER_PAGE, ttl=settings.page_cache_ttl)
 
 
 @router.callback_query(SettingsCB.filter(F.action == "webhooks"))
-async def show_webhooks(callback: CallbackQuery, user: User, page: int = 0, **kwargs) -> None:
+async def show_webhooks(
+    callback: CallbackQuery, user: User, page: int = 0, restart: bool = True, **kwargs
+) -> None:
     api = CarAPI(user.access_token)
     try:
-        result = await api.list_webhooks(skip=page * WEBHOOKS_PER_PAGE, limit=WEBHOOKS_PER_PAGE)
-        webhooks = result.get("webhooks", [])
-        total = result.get("total", len(webhooks))
+        result = await webhook_pages.page(user.telegram_id, api, page, restart=restart)
+        webhooks, total, page = result.items, result.total, result.number
     except APIError as e:
         await callback.message.edit_text(
             fa.ERROR_API.format(error=e.detail),
@@ -71,7 +88,11 @@ async def show_webhooks(callback: CallbackQuery, user: User, page: int = 0, **kw
             InlineKeyboardButton(
                 text=fa.WEBHOOK_CREATE,
                 callback_data=WebhookCB(action="create").pack(),
-            )
+            ),
+            InlineKeyboardButton(
+                text=fa.WEBHOOK_REPORT,
+                callback_data=WebhookCB(action="report").pack(),
+            ),
         ]
     )
 
@@ -87,7 +108,105 @@ async def show_webhooks(callback: CallbackQuery, user: User, page: int = 0, **kw
 async def webhooks_page(
     callback: CallbackQuery, callback_data: PageCB, user: User, **kwargs
 ) -> None:
-    await show_webhooks(callback, user, page=callback_data.page)
+    await show_webhooks(callback, user, page=callback_data.page, restart=False)
+
+
+def _health_line(rank: int, health: webhook_health.WebhookHealth) -> str:
+    # Names and errors are free text inside an HTML message
+    name = html.escape(str(health.name))
+    if health.error:
+        line = f"{rank}. ⛔ {name}: {html.escape(health.error[:ERROR_CHARS])}"
+    elif health.success_rate is None:
+        line = f"{rank}. ⚪ {name}: {fa.WEBHOOK_REPORT_NO_DELIVERIES}"
+    else:
+        icon = "✅" if health.healthy else "⚠️"
+        line = (
+            f"{rank}. {icon} {name}: {health.success_rate:.0%} "
+            f"({health.successes}/{health.deliveries})"
+        )
+        if health.p50_ms is not None:
+            line += f" | p50 {health.p50_ms:.0f}ms p95 {health.p95_ms:.0f}ms"
+        if health.top_failure:
+            status, count = health.top_failure
+            line += f" | ❌ {html.escape(str(status)[:ERROR_CHARS])}×{count}"
+    if health.probe:
+        duration = health.probe.duration_ms
+        took = f" {duration:.0f}ms" if isinstance(duration, int | float) else ""
+        icon = "✅" if health.probe.success else "❌"
+        line += f"\n    🧪 {icon} {html.escape(str(health.probe.status))}{took}"
+    if not health.active:
+        line += f" ({fa.DISABLED})"
+    return line
+
+
+def render_report(report: list[webhook_health.WebhookHealth]) -> str:
+    idle = sum(1 for h in report if h.success_rate is None and not h.error)
+    healthy = sum(1 for h in report if h.healthy)
+    lines = [
+        fa.WEBHOOK_REPORT_TITLE.format(sample=webhook_health.DELIVERY_SAMPLE),
+        fa.WEBHOOK_REPORT_SUMMARY.format(
+            healthy=healthy, degraded=len(report) - healthy - idle, idle=idle
+        ),
+        "",
+    ]
+    # Worst first, so trimming to the message limit only drops the healthiest webhooks
+    size = sum(len(line) + 1 for line in lines)
+    tail = len(f"… +{len(report)}")
+    for rank, health in enumerate(report, 1):
+        line = _health_line(rank, health)
+        if size + len(line) + 1 + tail > MESSAGE_LIMIT:
+            lines.append(f"… +{len(report) - rank + 1}")
+            break
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+@router.callback_query(WebhookCB.filter(F.action.in_({"report", "probe"})))
+async def webhook_report(
+    callback: CallbackQuery, callback_data: WebhookCB, user: User, **kwargs
+) -> None:
+    probe = callback_data.action == "probe"
+    await callback.answer(fa.WEBHOOK_REPORT_LOADING)
+    # Collecting (and probing) every webhook is slow; keep the chat's other taps free
+    update_limiter.detach(
+        _report(callback, CarAPI(user.access_token), probe),
+        name=f"webhook-report-{user.telegram_id}",
+    )
+
+
+async def _report(callback: CallbackQuery, api: CarAPI, probe: bool) -> None:
+    back = [InlineKeyboardButton(text=fa.BACK, callback_data=SettingsCB(action="webhooks").pack())]
+    try:
+        report = await webhook_health.collect(api, probe=probe)
+    except APIError as e:
+        await callback.message.edit_text(
+            fa.ERROR_API.format(error=e.detail),
+            reply_markup=InlineKeyboardMarkup(inline_keyboard=[back, [back_to_menu_button()]]),
+        )
+        return
+
+    if not report:
+        await callback.message.edit_text(
+            fa.WEBHOOK_EMPTY,
+            reply_markup=InlineKeyboardMarkup(inline_keyboard=[back, [back_to_menu_button()]]),
+        )
+        return
+
+    rows = [back, [back_to_menu_button()]]
+    if not probe:
+        rows.insert(
+            0,
+            [
+                InlineKeyboardButton(
+                    text=fa.WEBHOOK_REPORT_PROBE,
+                    callback_data=WebhookCB(action="probe").pack(),
+                )
+            ],
+        )
+    await callback.message.edit_text(
+        render_report(report), reply_markup=InlineKeyboardMarkup(inline_keyboard=rows)
+    )
 
 
 @router.callback_query(WebhookCB.filter(F.action == "detail"))
@@ -147,6 +266,7 @@ async def toggle_webhook(
     api = CarAPI(user.access_token)
     try:
         await api.toggle_webhook(callback_data.webhook_id)
+        webhook_pages.invalidate(user.telegram_id)
         await callback.answer(fa.WEBHOOK_UPDATED, show_alert=True)
         # Refresh detail
         await webhook_detail(callback, callback_data, user)
@@ -177,6 +297,7 @@ async def delete_webhook(
     api = CarAPI(user.access_token)
     try:
         await api.delete_webhook(callback_data.webhook_id)
+        webhook_pages.invalidate(user.telegram_id)
         await callback.message.edit_text(
             fa.WEBHOOK_DELETED,
             reply_markup=InlineKeyboardMarkup(inline_keyboard=[[back_to_menu_button()]]),
@@ -253,6 +374,7 @@ async def webhook_enter_url(message: Message, state: FSMContext, user: User, **k
         await api.create_webhook(
             {"name": data["name"], "url": url, "events": [], "is_active": True}
         )
+        webhook_pages.invalidate(user.telegram_id)
         await message.answer(
             fa.WEBHOOK_CREATED,
             reply_markup=InlineKeyboardMarkup(inline_keyboard=[[back_to_menu_button()]]),
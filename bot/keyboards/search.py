@@ -42,7 +42,7 @@ def radius_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
-def filters_keyboard(filters: dict[str, bool]) -> InlineKeyboardMarkup:
+def filters_keyboard(filters: dict[str, bool], multi: bool = False) -> InlineKeyboardMarkup:
     """Build toggle-able filter buttons."""
     filter_labels = {
         "no_prius": fa.SEARCH_FILTER_NO_PRIUS,
@@ -69,11 +69,43 @@ def filters_keyboard(filters: dict[str, bool]) -> InlineKeyboardMarkup:
             )
         ]
     )
+    if multi:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=fa.SEARCH_MULTI,
+                    callback_data=SearchCB(action="multi").pack(),
+                )
+            ]
+        )
+    rows.append([back_to_menu_button()])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def multi_account_keyboard(accounts: list[str], selected: list[str]) -> InlineKeyboardMarkup:
+    """Toggle buttons for the accounts a multi-search should run on."""
+    rows = [
+        [
+            InlineKeyboardButton(
+                text=f"{fa.ENABLED if account in selected else fa.DISABLED} {account}",
+                callback_data=SearchCB(action="multi_toggle", value=account).pack(),
+            )
+        ]
+        for account in accounts
+    ]
+    rows.append(
+        [
+            InlineKeyboardButton(
+                text=fa.MULTI_SEARCH_START.format(count=len(selected)),
+                callback_data=SearchCB(action="multi_confirm").pack(),
+            )
+        ]
+    )
     rows.append([back_to_menu_button()])
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
-def search_status_keyboard() -> InlineKeyboardMarkup:
+def search_status_keyboard(watching: bool = False) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -82,6 +114,12 @@ def search_status_keyboard() -> InlineKeyboardMarkup:
                     callback_data=SearchCB(action="stop").pack(),
                 ),
             ],
+            [
+                InlineKeyboardButton(
+                    text=fa.WATCH_OFF if watching else fa.WATCH_ON,
+                    callback_data=SearchCB(action="watch").pack(),
+                ),
+            ],
             [back_to_menu_button()],
         ]
     )
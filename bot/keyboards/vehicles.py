@@ -0,0 +1,124 @@
+"""Faceted fleet browser keyboards."""
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.callbacks.factory import FleetCB, VehicleCB
+from bot.keyboards.builders import back_to_menu_button
+from bot.services.fleet import FACETS, FleetIndex
+from bot.texts import fa
+
+FACET_BUTTONS = [
+    ("gas", fa.FLEET_FACET_GAS),
+    ("ev", fa.FLEET_FACET_EV),
+    ("hybrid", fa.FLEET_FACET_HYBRID),
+    ("snow", fa.FLEET_FACET_SNOW),
+    ("charged", fa.FLEET_FACET_CHARGED),
+    ("-prius", fa.FLEET_FACET_NO_PRIUS),
+]
+
+
+def parse_facets(raw: str) -> list[str]:
+    """Known facets from a ``FleetCB.facets`` string, in button order."""
+    requested = set(raw.split(","))
+    return [
+        facet for facet, _ in FACET_BUTTONS if facet in requested and facet.lstrip("-") in FACETS
+    ]
+
+
+def _toggled(facets: list[str], facet: str) -> str:
+    chosen = [f for f in facets if f != facet] if facet in facets else [*facets, facet]
+    return ",".join(chosen)
+
+
+def fleet_browser_keyboard(
+    index: FleetIndex,
+    facets: list[str],
+    model: int,
+    mask: int,
+    page: int,
+    total_pages: int,
+    vehicles: list[dict],
+) -> InlineKeyboardMarkup:
+    current = ",".join(facets)
+    rows: list[list[InlineKeyboardButton]] = []
+
+    # Each facet shows how many cars remain if it is toggled on
+    row: list[InlineKeyboardButton] = []
+    for facet, label in FACET_BUTTONS:
+        active = facet in facets
+        count = mask.bit_count() if active else (index.mask([facet]) & mask).bit_count()
+        row.append(
+            InlineKeyboardButton(
+                text=f"{'✅ ' if active else ''}{label} ({count})",
+                callback_data=FleetCB(
+                    action="view", facets=_toggled(facets, facet), model=model
+                ).pack(),
+            )
+        )
+        if len(row) == 2:
+            rows.append(row)
+            row = []
+    if row:
+        rows.append(row)
+
+    models = index.models
+    if models:
+        next_model = model + 1 if model + 1 < len(models) else -1
+        label = fa.FLEET_MODEL.format(model=models[model]) if model >= 0 else fa.FLEET_MODEL_ANY
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=label,
+                    callback_data=FleetCB(action="view", facets=current, model=next_model).pack(),
+                )
+            ]
+        )
+
+    for v in vehicles:
+        model_name = v.get("model", "?")
+        number = v.get("vehicleNb", v.get("vehicle_nb", "?"))
+        battery = v.get("energyLevelPercentage")
+        suffix = f" 🔋{battery}%" if battery is not None else ""
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=f"{model_name} #{number}{suffix}",
+                    callback_data=VehicleCB(
+                        action="detail", vehicle_id=v.get("vehicleId", v.get("vehicle_id", 0))
+                    ).pack(),
+                )
+            ]
+        )
+
+    nav_row: list[InlineKeyboardButton] = []
+    if page > 0:
+        nav_row.append(
+            InlineKeyboardButton(
+                text=fa.PAGE_PREV,
+                callback_data=FleetCB(
+                    action="view", facets=current, model=model, page=page - 1
+                ).pack(),
+            )
+        )
+    nav_row.append(
+        InlineKeyboardButton(
+            text=fa.PAGE_INFO.format(current=page + 1, total=total_pages), callback_data="noop"
+        )
+    )
+    if page < total_pages - 1:
+        nav_row.append(
+            InlineKeyboardButton(
+                text=fa.PAGE_NEXT,
+                callback_data=FleetCB(
+                    action="view", facets=current, model=model, page=page + 1
+                ).pack(),
+            )
+        )
+    rows.append(nav_row)
+
+    if facets or model >= 0:
+        rows.append(
+            [InlineKeyboardButton(text=fa.FLEET_RESET, callback_data=FleetCB(action="view").pack())]
+        )
+    rows.append([back_to_menu_button()])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
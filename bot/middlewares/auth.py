@@ -10,6 +10,7 @@ from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message, TelegramObject
 
 from bot.services.auth_service import get_user, refresh_tokens
+from bot.services.reachability import reachability
 from bot.texts import fa
 
 # Commands that don't require authentication
@@ -34,6 +35,10 @@ class AuthMiddleware(BaseMiddleware):
         elif isinstance(event, CallbackQuery):
             telegram_id = event.from_user.id if event.from_user else None
 
+        # Anything from the user means they can be messaged again
+        if telegram_id in reachability:
+            await reachability.mark_reachable(telegram_id)
+
         if skip_auth or telegram_id is None:
             return await handler(event, data)
 
@@ -0,0 +1,120 @@
+"""Early callback acknowledgement for slow handlers.
+
+Handlers answer their callback query only after the backend call and the
+message edit, so on a slow backend the Telegram spinner keeps turning and
+users tap again. This middleware gives each handler ``callback_ack_delay``
+seconds to answer on its own. If it has not answered by then, the query
+is answered with a loading toast and a typing action is shown, while the
+handler keeps running and edits the message when done.
+
+A later ``callback.answer()`` from the handler would be rejected by
+Telegram, so a request middleware on the bot session drops it. Alerts
+with ``show_alert`` are sent as a chat message instead, so errors are not
+lost. Repeated taps on the same button are dropped before they get here,
+by ``UpdateLimiter``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.enums import ChatAction
+from aiogram.methods import AnswerCallbackQuery, TelegramMethod
+from aiogram.types import CallbackQuery, TelegramObject
+
+from bot.config import settings
+from bot.texts import fa
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Pending:
+    chat_id: int | None
+    answered: bool = False
+    early: bool = False  # answered by us, so the handler's own answer must not reach Telegram
+
+
+class _AnswerFilter(BaseRequestMiddleware):
+    def __init__(self, pending: dict[str, _Pending]):
+        self._pending = pending
+        self.redirected = 0
+        self.dropped = 0
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+    ) -> Any:
+        if not isinstance(method, AnswerCallbackQuery):
+            return await make_request(bot, method)
+        pending = self._pending.get(method.callback_query_id)
+        if pending is None or not pending.answered:
+            if pending is not None:
+                pending.answered = True
+            return await make_request(bot, method)
+        if not pending.early:
+            return await make_request(bot, method)
+
+        if method.show_alert and method.text and pending.chat_id is not None:
+            self.redirected += 1
+            await bot.send_message(pending.chat_id, method.text)
+        else:
+            self.dropped += 1
+        return True
+
+
+class CallbackAckMiddleware(BaseMiddleware):
+    def __init__(self, delay: float = settings.callback_ack_delay):
+        self.delay = delay
+        self.early_acks = 0
+        self._pending: dict[str, _Pending] = {}
+        self._filter = _AnswerFilter(self._pending)
+        self._sessions: set[int] = set()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, CallbackQuery):
+            return await handler(event, data)
+
+        bot: Bot | None = data.get("bot")
+        if bot is not None and id(bot.session) not in self._sessions:
+            # Installed lazily so it follows whichever session the bot uses
+            bot.session.middleware(self._filter)
+            self._sessions.add(id(bot.session))
+
+        chat_id = event.message.chat.id if event.message else None
+        pending = self._pending[event.id] = _Pending(chat_id)
+        timer = asyncio.create_task(self._ack_later(event, pending, bot))
+        try:
+            return await handler(event, data)
+        finally:
+            timer.cancel()
+            self._pending.pop(event.id, None)
+
+    async def _ack_later(self, event: CallbackQuery, pending: _Pending, bot: Bot | None) -> None:
+        await asyncio.sleep(self.delay)
+        if pending.answered:
+            return
+        pending.early = True
+        self.early_acks += 1
+        with contextlib.suppress(Exception):
+            await event.answer(fa.LOADING)
+        if bot is not None and pending.chat_id is not None:
+            with contextlib.suppress(Exception):
+                await bot.send_chat_action(pending.chat_id, ChatAction.TYPING)
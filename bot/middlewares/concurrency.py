@@ -0,0 +1,163 @@
+"""Bounded update concurrency with per-chat ordering and load shedding.
+
+Updates of one chat run one at a time and in arrival order, so rapid taps
+cannot race on FSM state. At most ``update_max_inflight`` handlers run
+at once across all chats. When more than ``update_max_waiting`` updates
+are queued, or one chat already has ``update_max_chat_queue`` updates
+pending, new updates are answered with a "busy" notice and dropped
+instead of queueing without bound. A second tap on a button whose first
+tap is still queued or running is dropped the same way.
+Handlers of jobs that take minutes (exports, profiler captures) hand the
+rest of the job to ``detach`` once they have acknowledged the tap, so the
+chat's slot is free for Back/Stop and other taps meanwhile.
+Queue depth is reported through ``stats()`` in the readiness endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from bot.config import settings
+from bot.texts import fa
+
+logger = logging.getLogger(__name__)
+
+TapKey = tuple[int | None, str | None]  # (message id, callback data)
+
+
+@dataclass
+class _ChatQueue:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    depth: int = 0  # queued plus running
+    taps: Counter[TapKey] = field(default_factory=Counter)
+
+
+def _tap(update: Update) -> TapKey | None:
+    callback = update.callback_query
+    if callback is None:
+        return None
+    return (callback.message.message_id if callback.message else None, callback.data)
+
+
+class UpdateLimiter(BaseMiddleware):
+    def __init__(self, max_inflight: int, max_waiting: int, max_chat_queue: int):
+        self.max_inflight = max_inflight
+        self.max_waiting = max_waiting
+        self.max_chat_queue = max_chat_queue
+        self.waiting = 0
+        self.running = 0
+        self.peak_waiting = 0
+        self.processed = 0
+        self.shed = 0
+        self.duplicates = 0
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._chats: dict[int, _ChatQueue] = {}
+        self._detached: set[asyncio.Task] = set()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "waiting": self.waiting,
+            "running": self.running,
+            "peak_waiting": self.peak_waiting,
+            "chats": len(self._chats),
+            "processed": self.processed,
+            "shed": self.shed,
+            "duplicates": self.duplicates,
+            "detached": len(self._detached),
+        }
+
+    def detach(self, job: Coroutine[Any, Any, Any], name: str) -> asyncio.Task:
+        """Run the rest of a long handler outside its chat's queue."""
+        task = asyncio.create_task(job, name=name)
+        self._detached.add(task)
+        task.add_done_callback(self._detached_done)
+        return task
+
+    def _detached_done(self, task: asyncio.Task) -> None:
+        self._detached.discard(task)
+        if not task.cancelled() and (error := task.exception()) is not None:
+            logger.error("Detached job %s failed", task.get_name(), exc_info=error)
+
+    async def stop(self) -> None:
+        for task in self._detached:
+            task.cancel()
+        await asyncio.gather(*self._detached, return_exceptions=True)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+
+        chat = data.get("event_chat")
+        user = data.get("event_from_user")
+        key = chat.id if chat else user.id if user else None
+        queue = self._chats.get(key) if key is not None else None
+        tap = _tap(event)
+
+        if queue is not None and tap is not None and queue.taps[tap]:
+            self.duplicates += 1
+            await self._reject(event, fa.CALLBACK_IN_PROGRESS, alert=False)
+            return None
+        if self.waiting >= self.max_waiting or (queue and queue.depth >= self.max_chat_queue):
+            self.shed += 1
+            logger.warning("Shedding update for chat %s (%d waiting)", key, self.waiting)
+            await self._reject(event, fa.BUSY, alert=True)
+            return None
+
+        if key is not None:
+            queue = self._chats.setdefault(key, _ChatQueue())
+            queue.depth += 1
+            if tap is not None:
+                queue.taps[tap] += 1
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        started = False
+        try:
+            async with queue.lock if queue else contextlib.nullcontext(), self._slots:
+                self.waiting -= 1
+                self.running += 1
+                started = True
+                try:
+                    return await handler(event, data)
+                finally:
+                    self.running -= 1
+                    self.processed += 1
+        finally:
+            if not started:
+                self.waiting -= 1
+            if queue is not None:
+                queue.depth -= 1
+                if tap is not None:
+                    queue.taps[tap] -= 1
+                    if not queue.taps[tap]:
+                        del queue.taps[tap]
+                if not queue.depth:
+                    del self._chats[key]
+
+    @staticmethod
+    async def _reject(update: Update, text: str, alert: bool) -> None:
+        with contextlib.suppress(Exception):
+            if update.callback_query is not None:
+                await update.callback_query.answer(text, show_alert=alert)
+            elif update.message is not None:
+                await update.message.answer(text)
+
+
+update_limiter = UpdateLimiter(
+    max_inflight=settings.update_max_inflight,
+    max_waiting=settings.update_max_waiting,
+    max_chat_queue=settings.update_max_chat_queue,
+)
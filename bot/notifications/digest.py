@@ -0,0 +1,146 @@
+"""Coalesce bursts of notifications into one Telegram message per user.
+
+Events are buffered per (chat, account) for a window that depends on the
+event type. An event whose window is zero is urgent: it is sent right away
+together with anything already buffered for the same key, so a closing
+event such as ``search.completed`` also flushes the burst before it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+from aiogram import Bot
+
+from bot.config import settings
+from bot.services.reachability import reachability
+from bot.texts import fa
+
+logger = logging.getLogger(__name__)
+
+# Applied under settings.notification_digest_windows; "prefix.*" matches a family
+DEFAULT_WINDOWS: dict[str, float] = {
+    "rental.*": 0.0,
+    "search.completed": 0.0,
+}
+MAX_BUFFERED = 20
+MESSAGE_LIMIT = 4096
+
+DigestKey = tuple[int, str | None]
+
+
+@dataclass
+class _Pending:
+    bot: Bot
+    messages: list[str]
+    deadline: float
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+
+class NotificationDigest:
+    def __init__(self, default_window: float, windows: dict[str, float] | None = None):
+        self.default_window = default_window
+        self.windows = {**DEFAULT_WINDOWS, **(windows or {})}
+        self.events = 0
+        self.sends = 0
+        self._pending: dict[DigestKey, _Pending] = {}
+
+    def window_for(self, event_type: str) -> float:
+        if event_type in self.windows:
+            return self.windows[event_type]
+        family = event_type.split(".", 1)[0]
+        return self.windows.get(f"{family}.*", self.default_window)
+
+    async def submit(
+        self, bot: Bot, chat_id: int, account: str | None, event_type: str, message: str
+    ) -> None:
+        self.events += 1
+        key = (chat_id, account)
+        window = self.window_for(event_type)
+        pending = self._pending.get(key)
+
+        if window <= 0:
+            messages = [message]
+            if pending:
+                self._discard(key)
+                messages = pending.messages + messages
+            await self._send(bot, chat_id, messages)
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + window
+        if pending is None:
+            pending = _Pending(bot, [message], deadline)
+            self._pending[key] = pending
+            self._schedule(key, pending, window)
+            return
+
+        pending.messages.append(message)
+        if len(pending.messages) >= MAX_BUFFERED:
+            self._discard(key)
+            await self._send(bot, chat_id, pending.messages)
+        elif deadline < pending.deadline:
+            pending.deadline = deadline
+            self._schedule(key, pending, window)
+
+    async def flush_all(self) -> None:
+        """Send everything still buffered, e.g. on shutdown."""
+        for key in list(self._pending):
+            pending = self._discard(key)
+            if pending:
+                await self._send(pending.bot, key[0], pending.messages)
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(p.messages) for p in self._pending.values())
+
+    def _schedule(self, key: DigestKey, pending: _Pending, delay: float) -> None:
+        if pending.task:
+            pending.task.cancel()
+        pending.task = asyncio.create_task(self._flush_later(key, delay))
+
+    def _discard(self, key: DigestKey) -> _Pending | None:
+        pending = self._pending.pop(key, None)
+        if pending and pending.task and pending.task is not asyncio.current_task():
+            pending.task.cancel()
+        return pending
+
+    async def _flush_later(self, key: DigestKey, delay: float) -> None:
+        await asyncio.sleep(delay)
+        pending = self._discard(key)
+        if pending:
+            await self._send(pending.bot, key[0], pending.messages)
+
+    async def _send(self, bot: Bot, chat_id: int, messages: list[str]) -> None:
+        for text in render_digest(messages):
+            self.sends += 1
+            try:
+                await reachability.send_message(bot, chat_id, text)
+            except Exception:
+                logger.warning("Failed to send notification to user %s", chat_id, exc_info=True)
+
+
+def render_digest(messages: list[str]) -> list[str]:
+    """Combine buffered messages, splitting to respect Telegram's size limit."""
+    if len(messages) == 1:
+        return messages
+
+    header = fa.NOTIF_DIGEST_TITLE.format(count=len(messages))
+    chunks: list[str] = []
+    current = header
+    for message in messages:
+        message = message[: MESSAGE_LIMIT - len(header) - 2]
+        if len(current) + 2 + len(message) > MESSAGE_LIMIT:
+            chunks.append(current)
+            current = header
+        current += "\n\n" + message
+    chunks.append(current)
+    return chunks
+
+
+digest = NotificationDigest(
+    default_window=settings.notification_digest_window,
+    windows=settings.notification_digest_windows,
+)
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import Any
 
@@ -11,6 +10,10 @@ from sqlalchemy import select
 
 from bot.db.models import NotificationPreference, User
 from bot.db.session import async_session
+from bot.notifications.digest import digest
+from bot.services import codec
+from bot.services.multi_search import multi_searches
+from bot.services.reachability import reachability
 from bot.texts import fa
 
 logger = logging.getLogger(__name__)
@@ -70,7 +73,7 @@ def format_event(event_type: str, data: dict) -> str | None:
         if event_type == "optimization.swap":
             return fa.NOTIF_OPTIMIZATION_SWAP.format(vehicle=_vehicle_str(vehicle), score=score)
 
-    return f"🔔 {event_type}\n{json.dumps(payload, ensure_ascii=False, indent=2)[:500]}"
+    return f"🔔 {event_type}\n{codec.dumps_pretty(payload)[:500]}"
 
 
 async def dispatch_notification(bot: Bot, data: dict) -> None:
@@ -83,6 +86,12 @@ async def dispatch_notification(bot: Bot, data: dict) -> None:
     event_data = data.get("data", data)
     account = event_data.get("account", data.get("account", data.get("account_name")))
 
+    if event_type.startswith("search."):
+        try:
+            await multi_searches.handle_event(bot, event_type, account, event_data)
+        except Exception:
+            logger.exception("Failed to update multi-search for %s", account)
+
     message = format_event(event_type, data)
     if not message:
         logger.debug("No message for event %s", event_type)
@@ -96,30 +105,28 @@ async def dispatch_notification(bot: Bot, data: dict) -> None:
         result = await session.execute(query)
         users = result.scalars().all()
 
+        muted_query = select(NotificationPreference.telegram_id).where(
+            NotificationPreference.event_type == event_type,
+            NotificationPreference.enabled == 0,
+        )
+        muted = set((await session.execute(muted_query)).scalars())
+
         for user in users:
+            if user.telegram_id in reachability:
+                reachability.skipped += 1
+                continue
+
             # Check account access
             if account and user.accessible_accounts:
                 try:
-                    accounts = json.loads(user.accessible_accounts)
+                    accounts = codec.loads(user.accessible_accounts)
                     if account not in accounts:
                         continue
-                except (json.JSONDecodeError, TypeError):
+                except (codec.DecodeError, TypeError):
                     continue
 
             # Check notification preference
-            pref_query = select(NotificationPreference).where(
-                NotificationPreference.telegram_id == user.telegram_id,
-                NotificationPreference.event_type == event_type,
-            )
-            pref_result = await session.execute(pref_query)
-            pref = pref_result.scalar_one_or_none()
-
-            if pref and not pref.enabled:
+            if user.telegram_id in muted:
                 continue
 
-            try:
-                await bot.send_message(user.telegram_id, message)
-            except Exception:
-                logger.warning(
-                    "Failed to send notification to user %s", user.telegram_id, exc_info=True
-                )
+            await digest.submit(bot, user.telegram_id, account, event_type, message)
@@ -0,0 +1,91 @@
+"""Concurrent status snapshot of every account a user can access.
+
+All four status calls for all accounts go out at once, bounded by a
+semaphore, and each account is yielded as soon as its own calls finish.
+Successful results are cached briefly per caller and account, so
+reopening the overview reuses the answers. The caller is part of the key
+because the backend decides per token which accounts it may read.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from bot.config import settings
+from bot.services.api_client import APIError, CarAPI
+from bot.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("rental", "search", "optimization", "next_free")
+
+_cache = TTLCache(ttl=settings.overview_cache_ttl, max_size=4096)
+
+
+@dataclass
+class AccountSnapshot:
+    account: str
+    results: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def _call(api: CarAPI, name: str, account: str):
+    return {
+        "rental": api.get_current_rental,
+        "search": api.get_search_status,
+        "optimization": api.get_optimization_status,
+        "next_free": api.get_next_free_time,
+    }[name](account)
+
+
+async def _fetch(
+    api: CarAPI, account: str, name: str, semaphore: asyncio.Semaphore
+) -> tuple[str, Any, str | None]:
+    key = (api.token_id, account, name)
+    cached = _cache.get(key)
+    if cached is not None:
+        return name, cached, None
+
+    async with semaphore:
+        try:
+            result = await _call(api, name, account)
+        except APIError as e:
+            if e.status_code != 404:
+                return name, None, e.detail
+            result = {}  # nothing active
+        except Exception as e:
+            logger.warning("Overview %s for %s failed: %s", name, account, e)
+            return name, None, type(e).__name__
+    result = result or {}
+    _cache.set(key, result)
+    return name, result, None
+
+
+async def _snapshot(api: CarAPI, account: str, semaphore: asyncio.Semaphore) -> AccountSnapshot:
+    snapshot = AccountSnapshot(account)
+    for name, result, error in await asyncio.gather(
+        *(_fetch(api, account, name, semaphore) for name in FIELDS)
+    ):
+        if error is None:
+            snapshot.results[name] = result
+        else:
+            snapshot.errors[name] = error
+    return snapshot
+
+
+async def iter_overview(
+    api: CarAPI, accounts: list[str], concurrency: int | None = None
+) -> AsyncIterator[AccountSnapshot]:
+    """Yield a snapshot per account, in completion order."""
+    semaphore = asyncio.Semaphore(concurrency or settings.overview_concurrency)
+    tasks = [asyncio.create_task(_snapshot(api, account, semaphore)) for account in accounts]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
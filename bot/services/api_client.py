@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import contextlib
+import hashlib
 import logging
 import uuid
 from typing import Any
@@ -10,6 +11,8 @@ from typing import Any
 import httpx
 
 from bot.config import settings
+from bot.services import codec
+from bot.services.api_scheduler import account_of, api_scheduler, lane_for
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +24,13 @@ class APIError(Exception):
         super().__init__(f"API error {status_code}: {detail}")
 
 
+def _retry_after(resp: httpx.Response) -> float:
+    try:
+        return max(float(resp.headers.get("Retry-After", 1)), 0.0)
+    except (TypeError, ValueError):
+        return 1.0  # HTTP-date form; not used by the backend
+
+
 class CarAPI:
     """Async client for car-api-py REST API."""
 
@@ -28,6 +38,11 @@ class CarAPI:
         self._token = access_token
         self._base = settings.api_base_url.rstrip("/")
 
+    @property
+    def token_id(self) -> str:
+        """Digest of the access token, for keying caches per caller."""
+        return hashlib.sha256(self._token.encode()).hexdigest()[:16]
+
     def _headers(self) -> dict[str, str]:
         return {
             "Authorization": f"Bearer {self._token}",
@@ -44,24 +59,34 @@ class CarAPI:
         params: dict | None = None,
     ) -> Any:
         url = f"{self._base}{path}"
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.request(
-                method,
-                url,
-                headers=self._headers(),
-                json=json,
-                params=params,
-            )
+        content = codec.dumps(json) if json is not None else None
+        lane, account = lane_for(method), account_of(path)
+        for attempt in range(2):
+            await api_scheduler.acquire(lane, account)
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                resp = await client.request(
+                    method,
+                    url,
+                    headers=self._headers(),
+                    content=content,
+                    params=params,
+                )
+            if resp.status_code != 429:
+                break
+            retry_after = _retry_after(resp)
+            api_scheduler.throttle(account, retry_after)
+            if attempt or retry_after > settings.api_retry_after_max:
+                break
         if resp.status_code == 204:
             return None
         if resp.status_code >= 400:
             detail = resp.text
             with contextlib.suppress(Exception):
-                detail = resp.json().get("detail", detail)
+                detail = codec.loads(resp.content).get("detail", detail)
             raise APIError(resp.status_code, str(detail))
         if not resp.content:
             return None
-        return resp.json()
+        return codec.loads(resp.content)
 
     async def _get(self, path: str, **kwargs) -> Any:
         return await self._request("GET", path, **kwargs)
@@ -0,0 +1,238 @@
+"""Client-side scheduling of car-api requests by priority lane.
+
+Every request takes a token from a global bucket and, for
+``/accounts/{account}/...`` paths, from that account's bucket. Requests
+that cannot go right away wait in lane order: interactive writes first,
+then interactive reads, then background work (periodic jobs, pollers,
+syncs). A request waiting only on its own account's bucket does not hold
+up requests for other accounts. When the backend answers 429, the bucket
+concerned is paused for ``Retry-After`` seconds.
+
+Code marks its requests as background with ``with background_lane():``,
+and tasks started inside the block inherit the lane.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import re
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+ACCOUNT_PATH = re.compile(r"^/api/v1/accounts/([^/]+)/")
+MAX_ACCOUNTS = 1024  # refilled account buckets are dropped beyond this
+
+
+class Lane(IntEnum):
+    WRITE = 0
+    READ = 1
+    BACKGROUND = 2
+
+
+_background: ContextVar[bool] = ContextVar("api_background", default=False)
+
+
+@contextlib.contextmanager
+def background_lane() -> Iterator[None]:
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+def lane_for(method: str) -> Lane:
+    if _background.get():
+        return Lane.BACKGROUND
+    return Lane.READ if method.upper() == "GET" else Lane.WRITE
+
+
+def account_of(path: str) -> str | None:
+    match = ACCOUNT_PATH.match(path)
+    return match.group(1) if match else None
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available; 0 if one is now."""
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def pause(self, seconds: float, now: float) -> None:
+        self.paused_until = max(self.paused_until, now + seconds)
+
+
+@dataclass
+class LaneStats:
+    waiting: int = 0
+    granted: int = 0
+    delayed: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "waiting": self.waiting,
+            "granted": self.granted,
+            "delayed": self.delayed,
+            "avg_wait_ms": round(self.total_wait_ms / self.delayed, 1) if self.delayed else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 1),
+        }
+
+
+@dataclass
+class _Waiter:
+    lane: Lane
+    account: str | None
+    future: asyncio.Future
+    queued_at: float
+
+
+class ApiScheduler:
+    def __init__(
+        self, global_rate: float, global_burst: int, account_rate: float, account_burst: int
+    ):
+        self.account_rate = account_rate
+        self.account_burst = account_burst
+        self.throttled = 0  # 429 answers seen
+        self._global = TokenBucket(global_rate, global_burst)
+        self._accounts: dict[str, TokenBucket] = {}
+        self._prune_at = MAX_ACCOUNTS
+        self._queue: list[tuple[int, int, _Waiter]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self.lanes = {lane: LaneStats() for lane in Lane}
+
+    def _bucket(self, account: str) -> TokenBucket:
+        bucket = self._accounts.get(account)
+        if bucket is None:
+            if len(self._accounts) >= self._prune_at:
+                self._prune(time.monotonic())
+                # Busy buckets stay, so wait for the table to double before scanning again
+                self._prune_at = max(MAX_ACCOUNTS, 2 * len(self._accounts))
+            bucket = self._accounts[account] = TokenBucket(self.account_rate, self.account_burst)
+        return bucket
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have refilled; they carry no state worth keeping."""
+        idle = [
+            name
+            for name, bucket in self._accounts.items()
+            if bucket.wait_time(now) == 0 and bucket.tokens >= bucket.burst
+        ]
+        for name in idle:
+            del self._accounts[name]
+
+    def _ready(self, account: str | None, now: float) -> float:
+        wait = self._global.wait_time(now)
+        if account is not None:
+            wait = max(wait, self._bucket(account).wait_time(now))
+        return wait
+
+    def _grant(self, account: str | None) -> None:
+        self._global.take()
+        if account is not None:
+            self._bucket(account).take()
+
+    async def acquire(self, lane: Lane, account: str | None = None) -> None:
+        """Wait for this request's turn under the rate limits."""
+        stats = self.lanes[lane]
+        now = time.monotonic()
+        if not self._queue and self._ready(account, now) == 0:
+            self._grant(account)
+            stats.granted += 1
+            return
+
+        waiter = _Waiter(lane, account, asyncio.get_running_loop().create_future(), now)
+        heapq.heappush(self._queue, (lane, next(self._seq), waiter))
+        stats.waiting += 1
+        self._pump()
+        try:
+            await waiter.future
+        finally:
+            stats.waiting -= 1
+            if waiter.future.cancelled():
+                self._pump()  # its slot may let others go
+
+    def _pump(self) -> None:
+        """Grant waiting requests in lane order while tokens last."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        blocked: list[tuple[int, int, _Waiter]] = []
+        next_check: float | None = None
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            waiter = entry[2]
+            if waiter.future.done():
+                continue
+            wait = self._ready(waiter.account, now)
+            if wait == 0:
+                self._grant(waiter.account)
+                waited = (now - waiter.queued_at) * 1000
+                stats = self.lanes[waiter.lane]
+                stats.granted += 1
+                stats.delayed += 1
+                stats.total_wait_ms += waited
+                stats.max_wait_ms = max(stats.max_wait_ms, waited)
+                waiter.future.set_result(None)
+                continue
+            blocked.append(entry)
+            next_check = wait if next_check is None else min(next_check, wait)
+            if self._global.wait_time(now) > 0:
+                break  # nothing else can go either
+        for entry in blocked:
+            heapq.heappush(self._queue, entry)
+        if self._queue and next_check is not None:
+            self._timer = asyncio.get_running_loop().call_later(next_check, self._pump)
+
+    def throttle(self, account: str | None, retry_after: float) -> None:
+        """The backend answered 429: hold back the bucket concerned."""
+        self.throttled += 1
+        now = time.monotonic()
+        bucket = self._bucket(account) if account is not None else self._global
+        bucket.pause(retry_after, now)
+        logger.warning("car-api rate limited (%s), pausing %.1fs", account or "global", retry_after)
+
+    def stats(self) -> dict:
+        return {
+            "lanes": {lane.name.lower(): stats.as_dict() for lane, stats in self.lanes.items()},
+            "throttled": self.throttled,
+            "accounts": len(self._accounts),
+        }
+
+
+api_scheduler = ApiScheduler(
+    global_rate=settings.api_global_rate,
+    global_burst=settings.api_global_burst,
+    account_rate=settings.api_account_rate,
+    account_burst=settings.api_account_burst,
+)
@@ -0,0 +1,165 @@
+"""Streaming export of audit logs to a gzip'd JSONL or CSV file.
+
+Pages of ``list_audit_logs`` are requested through a sliding window of at
+most ``concurrency`` requests. Pages are written in order as soon as the
+oldest outstanding one arrives, so memory holds at most one window of
+entries no matter how large the export is. Compression and file writes
+run in a worker thread to keep the event loop responsive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from bot.config import settings
+from bot.services import codec
+from bot.services.api_client import CarAPI
+
+logger = logging.getLogger(__name__)
+
+EXPORT_PAGE = 200
+FORMATS = ("jsonl", "csv")
+CSV_FIELDS = (
+    "id",
+    "timestamp",
+    "user_account",
+    "action",
+    "method",
+    "path",
+    "response_status",
+    "duration_ms",
+    "request_body",
+)
+
+_running: set[int] = set()
+
+
+class ExportBusyError(RuntimeError):
+    pass
+
+
+@dataclass
+class ExportProgress:
+    rows: int = 0
+    total: int | None = None  # as reported by the backend, if it does
+    pages: int = 0
+
+
+@dataclass(frozen=True)
+class ExportResult:
+    path: Path
+    rows: int
+    bytes: int
+    duration: float
+
+
+class _Writer:
+    def __init__(self, path: Path, fmt: str):
+        # Kept open across page writes and closed by close()
+        self._file = gzip.open(path, "wt", encoding="utf-8", newline="")  # noqa: SIM115
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(self._file, CSV_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, logs: list[dict]) -> None:
+        if self._csv is None:
+            self._file.writelines(codec.dumps_str(log) + "\n" for log in logs)
+            return
+        for log in logs:
+            self._csv.writerow(
+                {k: codec.dumps_str(v) if isinstance(v, dict | list) else v for k, v in log.items()}
+            )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+async def export_audit_logs(
+    api: CarAPI,
+    path: Path,
+    *,
+    owner: int,
+    fmt: str = "jsonl",
+    filters: dict | None = None,
+    concurrency: int = settings.audit_export_concurrency,
+    max_rows: int = settings.audit_export_max_rows,
+    on_progress: Callable[[ExportProgress], Awaitable[None]] | None = None,
+) -> ExportResult:
+    """Write every matching entry (up to ``max_rows``) to ``path``.
+
+    ``filters`` are passed to ``list_audit_logs`` (``user_account``,
+    ``action``, ``start_time``, ``end_time``). One export runs per owner at
+    a time; a second one raises ``ExportBusyError``.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if owner in _running:
+        raise ExportBusyError(owner)
+    _running.add(owner)
+
+    started = time.monotonic()
+    progress = ExportProgress()
+    last_page = -(-max_rows // EXPORT_PAGE) - 1
+    writer: _Writer | None = None
+
+    def fetch(page: int) -> asyncio.Task:
+        return asyncio.create_task(
+            api.list_audit_logs(**(filters or {}), limit=EXPORT_PAGE, offset=page * EXPORT_PAGE)
+        )
+
+    window: deque[asyncio.Task] = deque()
+    try:
+        writer = await asyncio.to_thread(_Writer, path, fmt)
+        next_page = 0
+        while next_page <= last_page and len(window) < concurrency:
+            window.append(fetch(next_page))
+            next_page += 1
+
+        while window:
+            result = await window.popleft()
+            logs = result.get("logs", []) if isinstance(result, dict) else result
+            if progress.total is None and isinstance(result, dict) and "total" in result:
+                progress.total = min(result["total"], max_rows)
+                last_page = min(last_page, -(-progress.total // EXPORT_PAGE) - 1)
+            logs = logs[: max_rows - progress.rows]
+            if logs:
+                await asyncio.to_thread(writer.write, logs)
+            progress.rows += len(logs)
+            progress.pages += 1
+            if on_progress:
+                await on_progress(progress)
+
+            # A short page is the end of the data; drop requests past it
+            if len(logs) < EXPORT_PAGE or progress.rows >= max_rows:
+                break
+            if next_page <= last_page:
+                window.append(fetch(next_page))
+                next_page += 1
+    finally:
+        for task in window:
+            task.cancel()
+        await asyncio.gather(*window, return_exceptions=True)
+        if writer is not None:
+            await asyncio.to_thread(writer.close)
+        _running.discard(owner)
+
+    duration = time.monotonic() - started
+    size = path.stat().st_size
+    logger.info(
+        "Exported %d audit entries (%s, %d bytes) for %s in %.1fs",
+        progress.rows,
+        fmt,
+        size,
+        owner,
+        duration,
+    )
+    return ExportResult(path, progress.rows, size, duration)
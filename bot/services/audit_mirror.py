@@ -0,0 +1,305 @@
+"""Local SQLite mirror of audit logs with full-text search.
+
+Each bot user's visible audit entries are copied into ``audit_logs``
+incrementally: a sync asks the backend only for entries at or after the
+newest mirrored timestamp. Syncs are bounded by ``audit_sync_max_rows``;
+the part of a window they did not reach is kept in
+``audit_sync_cursors`` and filled by later syncs, so the first backfill
+and large bursts complete over several syncs without leaving holes.
+Browsing, filtering by account/action/status and free-text search (FTS5
+over action, account and the raw entry) then run locally.
+
+Users who browsed recently are kept in sync by a periodic job; opening
+the browser also schedules a sync when the mirror is older than one
+interval, so the backend is only asked for deltas.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.sqlite import insert
+
+from bot.config import settings
+from bot.db.models import AuditLogEntry, AuditSyncCursor
+from bot.db.session import async_session
+from bot.services import codec
+from bot.services.api_client import CarAPI
+from bot.services.api_scheduler import background_lane
+from bot.services.auth_service import client_for_user
+
+logger = logging.getLogger(__name__)
+
+SYNC_PAGE = 100
+IDLE_AFTER = 3600.0  # seconds without browsing before periodic syncs stop
+
+
+@dataclass(frozen=True)
+class AuditFilters:
+    account: str | None = None
+    action: str | None = None
+    status_class: int | None = None  # 2 for 2xx, 4 for 4xx, ...
+    text: str | None = None
+
+    @property
+    def active(self) -> bool:
+        return any((self.account, self.action, self.status_class, self.text))
+
+
+def fts_query(raw: str) -> str:
+    """Quote each word as an FTS5 prefix term so user input cannot break the syntax."""
+    terms = ['"{}"*'.format(word.replace('"', '""')) for word in raw.split()]
+    return " ".join(terms)
+
+
+def _row(owner_id: int, log: dict) -> dict:
+    try:
+        status = int(log.get("response_status"))
+    except (TypeError, ValueError):
+        status = None
+    return {
+        "owner_id": owner_id,
+        "log_id": int(log["id"]),
+        "user_account": log.get("user_account"),
+        "action": log.get("action"),
+        "response_status": status,
+        "timestamp": log.get("timestamp"),
+        "duration_ms": log.get("duration_ms"),
+        "data": codec.dumps_str(log),
+    }
+
+
+class AuditMirror:
+    def __init__(self, interval: float, max_rows: int):
+        self.interval = interval
+        self.max_rows = max_rows
+        self._synced_at: dict[int, float] = {}
+        self._used_at: dict[int, float] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    def synced(self, telegram_id: int) -> bool:
+        return telegram_id in self._synced_at
+
+    def touch(self, telegram_id: int) -> None:
+        """Record browsing and sync in the background if the mirror is behind."""
+        now = time.monotonic()
+        self._used_at[telegram_id] = now
+        task = self._tasks.get(telegram_id)
+        behind = now - self._synced_at.get(telegram_id, 0.0) > self.interval
+        if behind and (task is None or task.done()):
+            self._tasks[telegram_id] = asyncio.create_task(
+                self._sync_quietly(telegram_id), name=f"audit-sync-{telegram_id}"
+            )
+
+    async def _sync_quietly(self, telegram_id: int) -> None:
+        try:
+            with background_lane():
+                await self.sync(telegram_id)
+        except Exception:
+            logger.warning("Audit sync for %s failed", telegram_id, exc_info=True)
+
+    async def sync(self, telegram_id: int) -> int:
+        """Pull entries missing from the mirror; returns how many were added.
+
+        The backend lists newest first. Each sync takes the entries newer
+        than the mirror, then spends what is left of ``max_rows`` on the
+        gap an earlier bounded sync left behind. Whatever is still
+        unfetched is kept as the gap for the next sync.
+        """
+        lock = self._locks.setdefault(telegram_id, asyncio.Lock())
+        async with lock:
+            api = await client_for_user(telegram_id)
+            if api is None:
+                return 0
+            async with async_session() as session:
+                since = (
+                    await session.execute(
+                        select(func.max(AuditLogEntry.timestamp)).where(
+                            AuditLogEntry.owner_id == telegram_id
+                        )
+                    )
+                ).scalar()
+                cursor = await session.get(AuditSyncCursor, telegram_id)
+                gap = (cursor.gap_start, cursor.gap_end) if cursor else None
+
+            started = time.perf_counter()
+            added, fetched, oldest, complete = await self._fetch(
+                api, telegram_id, since, None, self.max_rows
+            )
+            if not complete:
+                # Anything older than the newest gap joins it; refetched rows are ignored
+                gap = (gap[0] if gap else since, oldest)
+            if gap and fetched < self.max_rows:
+                more, _, oldest, complete = await self._fetch(
+                    api, telegram_id, gap[0], gap[1], self.max_rows - fetched
+                )
+                added += more
+                gap = None if complete else (gap[0], oldest)
+            await self._save_gap(telegram_id, gap)
+
+            self._synced_at[telegram_id] = time.monotonic()
+        if added:
+            logger.info(
+                "Mirrored %d audit entries for %s in %.0fms%s",
+                added,
+                telegram_id,
+                (time.perf_counter() - started) * 1000,
+                ", backfill pending" if gap else "",
+            )
+        return added
+
+    async def _fetch(
+        self, api: CarAPI, telegram_id: int, start: str | None, end: str | None, budget: int
+    ) -> tuple[int, int, str | None, bool]:
+        """Page ``[start, end]`` newest first, up to ``budget`` entries.
+
+        Returns entries added, entries fetched, the oldest timestamp seen
+        and whether the window was exhausted.
+        """
+        added = fetched = 0
+        oldest = end
+        while fetched < budget:
+            result = await api.list_audit_logs(
+                start_time=start, end_time=end, limit=SYNC_PAGE, offset=fetched
+            )
+            logs = result.get("logs", []) if isinstance(result, dict) else result
+            if logs:
+                added += await self._store(telegram_id, logs)
+                oldest = logs[-1].get("timestamp") or oldest
+            fetched += len(logs)
+            if len(logs) < SYNC_PAGE:
+                return added, fetched, oldest, True
+        return added, fetched, oldest, False
+
+    async def _store(self, telegram_id: int, logs: list[dict]) -> int:
+        rows = [_row(telegram_id, log) for log in logs]
+        async with async_session() as session:
+            known = (
+                await session.execute(
+                    select(func.count()).where(
+                        AuditLogEntry.owner_id == telegram_id,
+                        AuditLogEntry.log_id.in_([row["log_id"] for row in rows]),
+                    )
+                )
+            ).scalar_one()
+            await session.execute(insert(AuditLogEntry).on_conflict_do_nothing(), rows)
+            await session.commit()
+        return len(rows) - known
+
+    async def _save_gap(self, telegram_id: int, gap: tuple[str | None, str | None] | None) -> None:
+        async with async_session() as session:
+            if gap is None or gap[1] is None:
+                await session.execute(
+                    delete(AuditSyncCursor).where(AuditSyncCursor.owner_id == telegram_id)
+                )
+            else:
+                values = {"owner_id": telegram_id, "gap_start": gap[0], "gap_end": gap[1]}
+                await session.execute(
+                    insert(AuditSyncCursor)
+                    .values(values)
+                    .on_conflict_do_update(index_elements=["owner_id"], set_=values)
+                )
+            await session.commit()
+
+    async def sync_active(self) -> None:
+        """Periodic job: keep the mirrors of recent browsers current."""
+        now = time.monotonic()
+        for telegram_id, used_at in list(self._used_at.items()):
+            if now - used_at > IDLE_AFTER:
+                del self._used_at[telegram_id]
+                continue
+            try:
+                await self.sync(telegram_id)
+            except Exception:
+                logger.warning("Audit sync for %s failed", telegram_id, exc_info=True)
+
+    async def newest_id(self, telegram_id: int) -> int:
+        async with async_session() as session:
+            result = await session.execute(
+                select(func.max(AuditLogEntry.log_id)).where(AuditLogEntry.owner_id == telegram_id)
+            )
+            return result.scalar() or 0
+
+    async def query(
+        self,
+        telegram_id: int,
+        filters: AuditFilters,
+        limit: int,
+        offset: int = 0,
+        up_to: int | None = None,
+    ) -> tuple[list[dict], int]:
+        """Matching entries newest first, and the total number of matches.
+
+        ``up_to`` pins the listing to entries no newer than that id, so
+        pages stay put while syncs add entries.
+        """
+        conditions = [AuditLogEntry.owner_id == telegram_id]
+        if up_to is not None:
+            conditions.append(AuditLogEntry.log_id <= up_to)
+        if filters.account:
+            conditions.append(AuditLogEntry.user_account == filters.account)
+        if filters.action:
+            conditions.append(AuditLogEntry.action == filters.action)
+        if filters.status_class:
+            low = filters.status_class * 100
+            conditions.append(AuditLogEntry.response_status.between(low, low + 99))
+        if filters.text and (match := fts_query(filters.text)):
+            conditions.append(
+                AuditLogEntry.id.in_(
+                    select(text("rowid"))
+                    .select_from(text("audit_logs_fts"))
+                    .where(text("audit_logs_fts MATCH :match").bindparams(match=match))
+                )
+            )
+
+        async with async_session() as session:
+            total = (
+                await session.execute(
+                    select(func.count()).select_from(AuditLogEntry).where(*conditions)
+                )
+            ).scalar_one()
+            rows = (
+                await session.execute(
+                    select(AuditLogEntry.data)
+                    .where(*conditions)
+                    .order_by(AuditLogEntry.log_id.desc())
+                    .limit(limit)
+                    .offset(offset)
+                )
+            ).scalars()
+            return [codec.loads(data) for data in rows], total
+
+    async def get(self, telegram_id: int, log_id: int) -> dict | None:
+        async with async_session() as session:
+            data = (
+                await session.execute(
+                    select(AuditLogEntry.data).where(
+                        AuditLogEntry.owner_id == telegram_id, AuditLogEntry.log_id == log_id
+                    )
+                )
+            ).scalar_one_or_none()
+        return codec.loads(data) if data else None
+
+    async def top_actions(self, telegram_id: int, limit: int = 8) -> list[str]:
+        """Most frequent actions in the user's mirror, for the filter menu."""
+        action = AuditLogEntry.action
+        async with async_session() as session:
+            result = await session.execute(
+                select(action)
+                .where(AuditLogEntry.owner_id == telegram_id, action.is_not(None))
+                .group_by(action)
+                .order_by(func.count().desc())
+                .limit(limit)
+            )
+            return list(result.scalars())
+
+
+audit_mirror = AuditMirror(
+    interval=settings.audit_sync_interval,
+    max_rows=settings.audit_sync_max_rows,
+)
@@ -8,7 +8,9 @@ import json
 import logging
 import os
 import time
-from datetime import datetime
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime
 
 import httpx
 import jwt
@@ -19,17 +21,24 @@ from bot.config import settings
 from bot.db.models import OAuthState, User
 from bot.db.session import async_session
 from bot.keyboards.main_menu import main_menu_keyboard
+from bot.services.api_client import CarAPI
 from bot.texts import fa
 
 logger = logging.getLogger(__name__)
 
 
+SQLITE_TIMESTAMP = "%Y-%m-%d %H:%M:%S"  # format of CURRENT_TIMESTAMP, always UTC
+
+
 def generate_pkce() -> tuple[str, str]:
     """Generate PKCE code_verifier and code_challenge (S256)."""
     verifier = base64.urlsafe_b64encode(os.urandom(32)).rstrip(b"=").decode()
+    return verifier, code_challenge(verifier)
+
+
+def code_challenge(verifier: str) -> str:
     digest = hashlib.sha256(verifier.encode()).digest()
-    challenge = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
-    return verifier, challenge
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
 
 
 def build_authorize_url(state: str, code_challenge: str) -> str:
@@ -47,36 +56,186 @@ def build_authorize_url(state: str, code_challenge: str) -> str:
     return f"{settings.oauth_authorize_url}?{qs}"
 
 
-async def create_login_state(telegram_id: int, chat_id: int) -> str:
-    """Create an OAuth state and return the authorize URL."""
-    state = base64.urlsafe_b64encode(os.urandom(24)).decode()
-    verifier, challenge = generate_pkce()
+def _sqlite_timestamp(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, UTC).strftime(SQLITE_TIMESTAMP)
+
+
+def _parse_sqlite_timestamp(value: str | None) -> float:
+    if not value:
+        return 0.0
+    return datetime.strptime(value, SQLITE_TIMESTAMP).replace(tzinfo=UTC).timestamp()
+
+
+@dataclass
+class PendingLogin:
+    state: str
+    telegram_id: int
+    chat_id: int
+    code_verifier: str
+    created_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    @classmethod
+    def from_row(cls, row: OAuthState) -> PendingLogin:
+        return cls(
+            state=row.state,
+            telegram_id=row.telegram_id,
+            chat_id=row.chat_id,
+            code_verifier=row.code_verifier,
+            created_at=_parse_sqlite_timestamp(row.created_at),
+        )
+
+
+class PendingLoginCache:
+    """In-memory front for ``oauth_states``, keyed by state and by user.
+
+    The table stays the source of truth (it survives restarts); the cache
+    lets repeated /start presses and the OAuth callback skip the database.
+    """
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._by_state: OrderedDict[str, PendingLogin] = OrderedDict()
+        self._by_user: dict[tuple[int, int], str] = {}
+
+    def get(self, state: str) -> PendingLogin | None:
+        return self._by_state.get(state)
+
+    def for_user(self, telegram_id: int, chat_id: int) -> PendingLogin | None:
+        state = self._by_user.get((telegram_id, chat_id))
+        return self._by_state.get(state) if state else None
+
+    def put(self, pending: PendingLogin) -> None:
+        self._by_state[pending.state] = pending
+        self._by_user[(pending.telegram_id, pending.chat_id)] = pending.state
+        while len(self._by_state) > self.max_size:
+            _, oldest = self._by_state.popitem(last=False)
+            self._drop_user_link(oldest)
+
+    def forget_user(self, telegram_id: int) -> None:
+        for state, pending in list(self._by_state.items()):
+            if pending.telegram_id == telegram_id:
+                del self._by_state[state]
+                self._drop_user_link(pending)
+
+    def prune(self, max_age: float) -> None:
+        for state, pending in list(self._by_state.items()):
+            if pending.age > max_age:
+                del self._by_state[state]
+                self._drop_user_link(pending)
+
+    def clear(self) -> None:
+        self._by_state.clear()
+        self._by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._by_state)
+
+    def _drop_user_link(self, pending: PendingLogin) -> None:
+        key = (pending.telegram_id, pending.chat_id)
+        if self._by_user.get(key) == pending.state:
+            del self._by_user[key]
+
+
+pending_logins = PendingLoginCache()
+
 
+async def _find_reusable_login(telegram_id: int, chat_id: int) -> PendingLogin | None:
+    max_age = settings.oauth_state_reuse_window
+    pending = pending_logins.for_user(telegram_id, chat_id)
+    if pending:
+        return pending if pending.age < max_age else None
+
+    # Not cached (e.g. after a restart): the newest row may still be usable
+    cutoff = _sqlite_timestamp(time.time() - max_age)
     async with async_session() as session:
-        oauth_state = OAuthState(
-            state=state,
-            telegram_id=telegram_id,
-            chat_id=chat_id,
-            code_verifier=verifier,
+        result = await session.execute(
+            select(OAuthState)
+            .where(
+                OAuthState.telegram_id == telegram_id,
+                OAuthState.chat_id == chat_id,
+                OAuthState.created_at >= cutoff,
+            )
+            .order_by(OAuthState.created_at.desc())
+            .limit(1)
         )
-        session.add(oauth_state)
-        await session.commit()
+        row = result.scalar_one_or_none()
+    if row is None:
+        return None
+    pending = PendingLogin.from_row(row)
+    pending_logins.put(pending)
+    return pending
+
+
+async def create_login_state(telegram_id: int, chat_id: int) -> str:
+    """Return the authorize URL for a pending login, creating one if needed.
+
+    A state created within ``oauth_state_reuse_window`` is handed out again,
+    so repeated /start presses do not write a new row each time.
+    """
+    pending = await _find_reusable_login(telegram_id, chat_id)
+    if pending is None:
+        state = base64.urlsafe_b64encode(os.urandom(24)).decode()
+        verifier, _ = generate_pkce()
+        now = time.time()
+
+        async with async_session() as session:
+            oauth_state = OAuthState(
+                state=state,
+                telegram_id=telegram_id,
+                chat_id=chat_id,
+                code_verifier=verifier,
+                created_at=_sqlite_timestamp(now),
+            )
+            session.add(oauth_state)
+            await session.commit()
+
+        pending = PendingLogin(state, telegram_id, chat_id, verifier, now)
+        pending_logins.put(pending)
+
+    return build_authorize_url(pending.state, code_challenge(pending.code_verifier))
 
-    return build_authorize_url(state, challenge)
+
+async def _lookup_login(state: str) -> PendingLogin | None:
+    pending = pending_logins.get(state)
+    if pending is None:
+        async with async_session() as session:
+            result = await session.execute(select(OAuthState).where(OAuthState.state == state))
+            row = result.scalar_one_or_none()
+        if row is None:
+            return None
+        pending = PendingLogin.from_row(row)
+    if pending.age > settings.oauth_state_ttl:
+        return None
+    return pending
+
+
+async def purge_expired_states() -> int:
+    """Delete OAuth states older than ``oauth_state_ttl``; returns rows removed."""
+    pending_logins.prune(settings.oauth_state_ttl)
+    cutoff = _sqlite_timestamp(time.time() - settings.oauth_state_ttl)
+    async with async_session() as session:
+        result = await session.execute(delete(OAuthState).where(OAuthState.created_at < cutoff))
+        await session.commit()
+    if result.rowcount:
+        logger.info("Purged %d expired OAuth states", result.rowcount)
+    return result.rowcount
 
 
 async def handle_oauth_callback(bot: Bot, code: str, state: str) -> None:
     """Exchange auth code for tokens, store user, notify via Telegram."""
-    async with async_session() as session:
-        result = await session.execute(select(OAuthState).where(OAuthState.state == state))
-        oauth_state = result.scalar_one_or_none()
+    pending = await _lookup_login(state)
+    if not pending:
+        raise ValueError("Invalid or expired OAuth state")
 
-        if not oauth_state:
-            raise ValueError("Invalid or expired OAuth state")
+    telegram_id = pending.telegram_id
+    chat_id = pending.chat_id
+    code_verifier = pending.code_verifier
 
-        telegram_id = oauth_state.telegram_id
-        chat_id = oauth_state.chat_id
-        code_verifier = oauth_state.code_verifier
+    async with async_session() as session:
 
         # Exchange code for tokens
         token_data = await exchange_code(code, code_verifier)
@@ -133,9 +292,10 @@ async def handle_oauth_callback(bot: Bot, code: str, state: str) -> None:
             )
             session.add(user)
 
-        # Clean up OAuth state
-        await session.execute(delete(OAuthState).where(OAuthState.state == state))
+        # Clean up every pending login of this user, not just the one used
+        await session.execute(delete(OAuthState).where(OAuthState.telegram_id == telegram_id))
         await session.commit()
+    pending_logins.forget_user(telegram_id)
 
     # Notify user in Telegram
     acct = user.selected_account or username
@@ -219,3 +379,37 @@ async def logout_user(telegram_id: int) -> None:
             user.id_token = None
             user.token_expires_at = None
             await session.commit()
+
+
+async def client_for_user(telegram_id: int) -> CarAPI | None:
+    """API client with the user's current token, refreshed if about to expire.
+
+    For background work that outlives the request that started it.
+    """
+    user = await get_user(telegram_id)
+    if not user or not user.access_token:
+        return None
+    expiring = user.token_expires_at and user.token_expires_at - time.time() < 60
+    if expiring and not await refresh_tokens(user):
+        return None
+    return CarAPI(user.access_token)
+
+
+async def admin_ids() -> list[int]:
+    """Logged-in admins, most recently active first."""
+    async with async_session() as session:
+        result = await session.execute(
+            select(User.telegram_id)
+            .where(User.is_admin == 1, User.access_token.is_not(None))
+            .order_by(User.last_active_at.desc().nulls_last())
+        )
+        return list(result.scalars())
+
+
+async def admin_client() -> CarAPI | None:
+    """Client for admin-only background polling, using any admin with a valid token."""
+    for telegram_id in await admin_ids():
+        api = await client_for_user(telegram_id)
+        if api is not None:
+            return api
+    return None
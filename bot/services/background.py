@@ -0,0 +1,95 @@
+"""Periodic background jobs started alongside the bot."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from bot.services.api_scheduler import background_lane
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Run ``func`` every ``interval`` seconds until stopped.
+
+    Failures are logged and the job keeps running, so one bad iteration
+    never takes a housekeeping loop down for the lifetime of the process.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        interval: float,
+        *,
+        initial_delay: float = 0.0,
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.initial_delay = initial_delay
+        self.runs = 0
+        self.failures = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        with background_lane():
+            await self._loop()
+
+    async def _loop(self) -> None:
+        if self.initial_delay:
+            await asyncio.sleep(self.initial_delay)
+        while True:
+            try:
+                await self.func()
+                self.runs += 1
+            except Exception:
+                self.failures += 1
+                logger.exception("Background job %s failed", self.name)
+            await asyncio.sleep(self.interval)
+
+
+_jobs: dict[str, PeriodicTask] = {}
+
+
+def register(
+    name: str,
+    func: Callable[[], Awaitable[Any]],
+    interval: float,
+    *,
+    initial_delay: float = 0.0,
+) -> PeriodicTask:
+    job = PeriodicTask(name, func, interval, initial_delay=initial_delay)
+    _jobs[name] = job
+    return job
+
+
+def get(name: str) -> PeriodicTask | None:
+    return _jobs.get(name)
+
+
+def start_all() -> None:
+    for job in _jobs.values():
+        job.start()
+        logger.info("Background job %s started (every %ss)", job.name, job.interval)
+
+
+async def stop_all() -> None:
+    await asyncio.gather(*(job.stop() for job in _jobs.values()))
@@ -0,0 +1,112 @@
+"""JSON codec with the fastest available backend.
+
+orjson is preferred, then msgspec, then the stdlib ``json`` module. All
+backends produce compact UTF-8 output with non-ASCII text left unescaped,
+which keeps Persian strings readable and the payloads small.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+class DecodeError(ValueError):
+    """Raised for malformed JSON regardless of the backend in use."""
+
+
+@dataclass(frozen=True)
+class Backend:
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any], bytes]
+    dumps_pretty: Callable[[Any], bytes]
+
+
+def _orjson_backend() -> Backend:
+    import orjson
+
+    opts = orjson.OPT_NON_STR_KEYS
+    return Backend(
+        name="orjson",
+        loads=orjson.loads,
+        dumps=lambda obj: orjson.dumps(obj, option=opts),
+        dumps_pretty=lambda obj: orjson.dumps(obj, option=opts | orjson.OPT_INDENT_2),
+    )
+
+
+def _msgspec_backend() -> Backend:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    return Backend(
+        name="msgspec",
+        loads=decoder.decode,
+        dumps=encoder.encode,
+        dumps_pretty=lambda obj: msgspec.json.format(encoder.encode(obj), indent=2),
+    )
+
+
+def _stdlib_backend() -> Backend:
+    return Backend(
+        name="json",
+        loads=json.loads,
+        dumps=lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(),
+        dumps_pretty=lambda obj: json.dumps(obj, ensure_ascii=False, indent=2).encode(),
+    )
+
+
+_FACTORIES: dict[str, Callable[[], Backend]] = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "json": _stdlib_backend,
+}
+
+
+def get_backend(name: str = "auto") -> Backend:
+    """Resolve a backend by name; ``auto`` picks the first importable one."""
+    candidates = BACKENDS if name == "auto" else (name,)
+    for candidate in candidates:
+        factory = _FACTORIES.get(candidate)
+        if factory is None:
+            raise ValueError(f"Unknown JSON backend: {candidate}")
+        try:
+            return factory()
+        except ImportError:
+            if name != "auto":
+                raise
+    return _stdlib_backend()
+
+
+backend = get_backend(settings.json_backend)
+logger.debug("Using %s JSON backend", backend.name)
+
+
+def loads(data: bytes | str) -> Any:
+    try:
+        return backend.loads(data)
+    except ValueError as e:
+        raise DecodeError(str(e)) from e
+
+
+def dumps(obj: Any) -> bytes:
+    return backend.dumps(obj)
+
+
+def dumps_str(obj: Any) -> str:
+    return backend.dumps(obj).decode()
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Indented output for showing payloads to users."""
+    return backend.dumps_pretty(obj).decode()
@@ -0,0 +1,264 @@
+"""Periodic SQLite housekeeping within a per-run time budget.
+
+Each run prunes rows past their retention, refreshes planner statistics
+and returns free pages to the filesystem, in that order, so pages freed
+by pruning are reclaimed in the same run. Steps are skipped once the
+budget is spent; deletes and vacuuming work in small batches so a run
+overshoots the budget by at most one batch. Work left unfinished is
+listed in the report's ``skipped``: a step name, or ``prune:<table>``
+for a table whose pruning ran out of time. The one-time full VACUUM
+cannot be interrupted, so it only runs when its estimated duration fits
+the remaining budget and the disk has room for the copy it writes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, literal_column, or_, select, text
+
+from bot.config import settings
+from bot.db.models import AuditLogEntry, AuditSyncCursor, Base, NotificationPreference, User
+from bot.db.session import async_session, engine
+from bot.services.auth_service import purge_expired_states
+
+logger = logging.getLogger(__name__)
+
+PRUNE_BATCH = 500
+VACUUM_CHUNK_PAGES = 256
+VACUUM_BYTES_PER_SECOND = 20 * 1024 * 1024  # conservative full VACUUM rate on a PVC
+ANALYSIS_LIMIT = 400  # rows sampled per index by ANALYZE / PRAGMA optimize
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+_lock = asyncio.Lock()
+last_report: MaintenanceReport | None = None
+
+
+class MaintenanceBusyError(RuntimeError):
+    pass
+
+
+@dataclass
+class DatabaseStats:
+    page_size: int
+    page_count: int
+    freelist_count: int
+    auto_vacuum: str
+    file_bytes: int
+    rows: dict[str, int]
+
+    @property
+    def size_bytes(self) -> int:
+        return self.page_size * self.page_count
+
+    @property
+    def free_bytes(self) -> int:
+        return self.page_size * self.freelist_count
+
+    @property
+    def fragmentation_pct(self) -> float:
+        return 100 * self.freelist_count / self.page_count if self.page_count else 0.0
+
+
+@dataclass
+class MaintenanceReport:
+    started_at: float
+    budget: float
+    before: DatabaseStats
+    after: DatabaseStats | None = None
+    duration: float = 0.0
+    pruned: dict[str, int] = field(default_factory=dict)
+    analyzed: bool = False
+    vacuumed_pages: int = 0
+    skipped: list[str] = field(default_factory=list)
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        after = self.after or self.before
+        return max(0, self.before.file_bytes - after.file_bytes)
+
+
+def is_running() -> bool:
+    return _lock.locked()
+
+
+async def _pragma(conn, name: str) -> int:
+    return (await conn.execute(text(f"PRAGMA {name}"))).scalar() or 0
+
+
+async def collect_stats() -> DatabaseStats:
+    async with engine.connect() as conn:
+        page_size = await _pragma(conn, "page_size")
+        page_count = await _pragma(conn, "page_count")
+        freelist_count = await _pragma(conn, "freelist_count")
+        auto_vacuum = await _pragma(conn, "auto_vacuum")
+        rows = {}
+        for table in Base.metadata.sorted_tables:
+            rows[table.name] = (
+                await conn.execute(select(func.count()).select_from(table))
+            ).scalar_one()
+
+    file_bytes = 0
+    for path in (settings.database_path, f"{settings.database_path}-wal"):
+        if os.path.exists(path):
+            file_bytes += os.path.getsize(path)
+
+    return DatabaseStats(
+        page_size=page_size,
+        page_count=page_count,
+        freelist_count=freelist_count,
+        auto_vacuum=AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+        file_bytes=file_bytes or page_size * page_count,
+        rows=rows,
+    )
+
+
+async def _delete_batched(report: MaintenanceReport, table, condition, deadline: float) -> None:
+    """Delete matching rows PRUNE_BATCH at a time until done or out of time."""
+    rowid = literal_column("rowid")
+    total = 0
+    while time.monotonic() < deadline:
+        batch = select(rowid).select_from(table).where(condition).limit(PRUNE_BATCH)
+        async with async_session() as session:
+            result = await session.execute(delete(table).where(rowid.in_(batch)))
+            await session.commit()
+        total += result.rowcount
+        if result.rowcount < PRUNE_BATCH:
+            break
+    else:
+        report.skipped.append(f"prune:{table.name}")
+    report.pruned[table.name] = total
+
+
+async def _prune(report: MaintenanceReport, deadline: float) -> None:
+    cutoff = (datetime.utcnow() - timedelta(days=settings.user_retention_days)).isoformat()
+    last_seen = func.coalesce(User.last_active_at, User.created_at)
+    await _delete_batched(
+        report,
+        User.__table__,
+        (User.access_token.is_(None)) & or_(last_seen.is_(None), last_seen < cutoff),
+        deadline,
+    )
+    await _delete_batched(
+        report,
+        NotificationPreference.__table__,
+        NotificationPreference.telegram_id.not_in(select(User.telegram_id)),
+        deadline,
+    )
+    # Mirrored audit entries are only kept while their owner is logged in
+    logged_in = select(User.telegram_id).where(User.access_token.is_not(None))
+    await _delete_batched(
+        report, AuditLogEntry.__table__, AuditLogEntry.owner_id.not_in(logged_in), deadline
+    )
+    await _delete_batched(
+        report, AuditSyncCursor.__table__, AuditSyncCursor.owner_id.not_in(logged_in), deadline
+    )
+    report.pruned["oauth_states"] = await purge_expired_states()
+
+
+async def _analyze(report: MaintenanceReport, deadline: float) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}"))
+        has_stats = (
+            await conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            )
+        ).scalar()
+        # optimize only re-analyzes tables whose statistics look stale,
+        # which needs statistics to exist in the first place
+        await conn.execute(text("PRAGMA optimize" if has_stats else "ANALYZE"))
+        await conn.commit()
+    report.analyzed = True
+
+
+async def _vacuum(report: MaintenanceReport, deadline: float) -> None:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if await _pragma(conn, "auto_vacuum") != 2:
+            # Switching modes needs one full VACUUM; afterwards every run
+            # can release free pages incrementally.
+            if not _full_vacuum_fits(report.before, deadline):
+                report.skipped.append("vacuum")
+                return
+            logger.info("Converting database to incremental auto_vacuum")
+            await conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            await conn.execute(text("VACUUM"))
+            report.vacuumed_pages = report.before.freelist_count
+            return
+
+        while time.monotonic() < deadline:
+            free = await _pragma(conn, "freelist_count")
+            if not free:
+                break
+            # SQLite frees one page per step of this pragma, but the sqlite3
+            # module steps a row-less statement only once; executescript
+            # runs it to completion.
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({min(free, VACUUM_CHUNK_PAGES)});"
+            )
+            released = free - await _pragma(conn, "freelist_count")
+            if released <= 0:
+                break
+            report.vacuumed_pages += released
+        else:
+            if await _pragma(conn, "freelist_count"):
+                report.skipped.append("vacuum")
+
+
+def _full_vacuum_fits(stats: DatabaseStats, deadline: float) -> bool:
+    """VACUUM rewrites the live pages into a copy and cannot be stopped midway."""
+    live_bytes = stats.size_bytes - stats.free_bytes
+    directory = os.path.dirname(os.path.abspath(settings.database_path))
+    try:
+        disk_free = shutil.disk_usage(directory).free
+    except OSError:
+        disk_free = 0
+    if disk_free < stats.file_bytes:
+        logger.warning(
+            "Skipping VACUUM: %d bytes free on disk, up to %d needed", disk_free, stats.file_bytes
+        )
+        return False
+    return time.monotonic() + live_bytes / VACUUM_BYTES_PER_SECOND < deadline
+
+
+async def run_maintenance(budget: float | None = None) -> MaintenanceReport:
+    """Run one maintenance pass; raises MaintenanceBusyError if one is running."""
+    global last_report
+    if _lock.locked():
+        raise MaintenanceBusyError("Database maintenance already running")
+
+    async with _lock:
+        budget = settings.db_maintenance_budget if budget is None else budget
+        started = time.monotonic()
+        deadline = started + budget
+        report = MaintenanceReport(
+            started_at=time.time(), budget=budget, before=await collect_stats()
+        )
+
+        for name, step in (("prune", _prune), ("analyze", _analyze), ("vacuum", _vacuum)):
+            if time.monotonic() >= deadline:
+                report.skipped.append(name)
+                continue
+            await step(report, deadline)
+
+        report.after = await collect_stats()
+        report.duration = time.monotonic() - started
+        last_report = report
+
+    logger.info(
+        "Database maintenance took %.2fs: pruned %s, vacuumed %d pages, %.1f%% free, skipped %s",
+        report.duration,
+        report.pruned,
+        report.vacuumed_pages,
+        report.after.fragmentation_pct,
+        report.skipped or "nothing",
+    )
+    return report
@@ -0,0 +1,276 @@
+"""In-memory index of the fleet for instant "cars near me" and facets.
+
+Vehicles from ``list_vehicles`` are stored column-wise in typed arrays
+and bucketed into a fixed grid of ``CELL_DEG`` degree cells. A radius
+query only scans the cells overlapping the radius' bounding box and ranks
+the candidates by great-circle distance.
+
+Each facet (propulsion, model, promotions, charge) is precomputed as a
+bitmap held in a Python int, bit ``i`` standing for row ``i``. Combining
+filters is then a handful of big-integer AND/NOT operations and counting
+matches is ``int.bit_count()``, with no per-vehicle work at query time.
+
+The index is rebuilt off the request path: handlers read the current
+snapshot and at most schedule a background refresh.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
+
+from bot.config import settings
+from bot.services.auth_service import client_for_user
+
+logger = logging.getLogger(__name__)
+
+CELL_DEG = 0.01  # ~1.1km north-south
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+IDLE_AFTER = 600.0  # seconds without lookups before background refreshes pause
+
+Cell = tuple[int, int]
+
+PROPULSION_GAS, PROPULSION_EV, PROPULSION_HYBRID = 1, 2, 3
+SNOW_PROMOTION_WORDS = ("snow", "neige", "hiver", "winter")
+CHARGED_PCT = 50
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def vehicle_location(vehicle: dict) -> tuple[float, float] | None:
+    loc = vehicle.get("currentVehicleLocation") or vehicle.get("vehicleLocation") or {}
+    lat, lng = loc.get("latitude"), loc.get("longitude")
+    if lat is None or lng is None:
+        return None
+    return float(lat), float(lng)
+
+
+def _has_snow_promotion(vehicle: dict) -> bool:
+    promotions = vehicle.get("promotions") or vehicle.get("vehiclePromotions") or []
+    text = " ".join(
+        str(p.get("name") or p.get("description") or "") if isinstance(p, dict) else str(p)
+        for p in promotions
+    ).lower()
+    return any(word in text for word in SNOW_PROMOTION_WORDS)
+
+
+# Facet name → predicate over the raw vehicle; "model:<name>" facets are added per model
+FACETS: dict[str, Callable[[dict], bool]] = {
+    "gas": lambda v: v.get("vehiclePropulsionTypeId") == PROPULSION_GAS,
+    "ev": lambda v: v.get("vehiclePropulsionTypeId") == PROPULSION_EV,
+    "hybrid": lambda v: v.get("vehiclePropulsionTypeId") == PROPULSION_HYBRID,
+    "prius": lambda v: "prius" in str(v.get("model") or "").lower(),
+    "snow": _has_snow_promotion,
+    "charged": lambda v: (v.get("energyLevelPercentage") or 0) >= CHARGED_PCT,
+}
+
+# Search wizard filters expressed as facets
+SEARCH_FILTER_FACETS = {
+    "no_prius": ("-prius",),
+    "no_ev": ("-ev",),
+    "snow_car": ("snow",),
+}
+
+
+def iter_rows(mask: int) -> Iterator[int]:
+    """Row numbers of the set bits, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@dataclass(frozen=True)
+class NearbyVehicle:
+    vehicle: dict[str, Any]
+    distance_km: float
+
+
+class FleetIndex:
+    def __init__(self, vehicles: list[dict], cell_deg: float = CELL_DEG):
+        self.cell_deg = cell_deg
+        self.vehicles: list[dict] = []
+        self.ids = array("q")
+        self.lats = array("d")
+        self.lngs = array("d")
+        self.energy = array("b")  # percent, -1 when unknown
+        self.propulsion = array("b")  # vehiclePropulsionTypeId, 0 when unknown
+        self._cells: dict[Cell, list[int]] = {}
+        facet_bits: dict[str, bytearray] = {}
+
+        located = [(v, loc) for v in vehicles if (loc := vehicle_location(v)) is not None]
+        size = (len(located) + 7) // 8
+        for row, (vehicle, location) in enumerate(located):
+            self.vehicles.append(vehicle)
+            self.ids.append(int(vehicle.get("vehicleId", vehicle.get("vehicle_id")) or 0))
+            self.lats.append(location[0])
+            self.lngs.append(location[1])
+            energy = vehicle.get("energyLevelPercentage")
+            self.energy.append(int(energy) if energy is not None else -1)
+            self.propulsion.append(int(vehicle.get("vehiclePropulsionTypeId") or 0))
+            self._cells.setdefault(self._cell(*location), []).append(row)
+
+            names = [name for name, predicate in FACETS.items() if predicate(vehicle)]
+            if vehicle.get("model"):
+                names.append(f"model:{vehicle['model']}")
+            for name in names:
+                bits = facet_bits.setdefault(name, bytearray(size))
+                bits[row >> 3] |= 1 << (row & 7)
+
+        self.all = (1 << len(self.vehicles)) - 1
+        self.facets: dict[str, int] = {
+            name: int.from_bytes(bits, "little") for name, bits in facet_bits.items()
+        }
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.vehicles)
+
+    @property
+    def models(self) -> list[str]:
+        return sorted(name[6:] for name in self.facets if name.startswith("model:"))
+
+    def mask(self, facets: Iterable[str]) -> int:
+        """Rows matching every facet; a leading ``-`` excludes the facet instead."""
+        result = self.all
+        for facet in facets:
+            if facet.startswith("-"):
+                result &= ~self.facets.get(facet[1:], 0)
+            else:
+                result &= self.facets.get(facet, 0)
+        return result
+
+    def search_filter_mask(self, filters: dict[str, bool]) -> int:
+        return self.mask(
+            f for key, on in filters.items() if on for f in SEARCH_FILTER_FACETS.get(key, ())
+        )
+
+    def rows(self, mask: int, start: int = 0, limit: int | None = None) -> list[dict]:
+        stop = None if limit is None else start + limit
+        return [self.vehicles[row] for row in islice(iter_rows(mask), start, stop)]
+
+    def _cell(self, lat: float, lng: float) -> Cell:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def _within(self, lat: float, lng: float, radius_km: float, mask: int | None = None):
+        dlat = radius_km / KM_PER_DEG_LAT
+        dlng = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 0.01))
+        lat_lo, lng_lo = self._cell(lat - dlat, lng - dlng)
+        lat_hi, lng_hi = self._cell(lat + dlat, lng + dlng)
+        if (lat_hi - lat_lo + 1) * (lng_hi - lng_lo + 1) > len(self._cells):
+            # A box wider than the fleet: scan the occupied cells instead
+            cells = (
+                rows
+                for (i, j), rows in self._cells.items()
+                if lat_lo <= i <= lat_hi and lng_lo <= j <= lng_hi
+            )
+        else:
+            cells = (
+                self._cells.get((i, j), ())
+                for i in range(lat_lo, lat_hi + 1)
+                for j in range(lng_lo, lng_hi + 1)
+            )
+        for rows in cells:
+            for row in rows:
+                if mask is not None and not (mask >> row) & 1:
+                    continue
+                distance = haversine_km(lat, lng, self.lats[row], self.lngs[row])
+                if distance <= radius_km:
+                    yield distance, row
+
+    def nearest(
+        self, lat: float, lng: float, radius_km: float, limit: int = 5, mask: int | None = None
+    ) -> list[NearbyVehicle]:
+        """Closest vehicles within ``radius_km``, nearest first."""
+        best = heapq.nsmallest(limit, self._within(lat, lng, radius_km, mask))
+        return [NearbyVehicle(self.vehicles[row], distance) for distance, row in best]
+
+    def count_within(
+        self, lat: float, lng: float, radius_km: float, mask: int | None = None
+    ) -> int:
+        return sum(1 for _ in self._within(lat, lng, radius_km, mask))
+
+
+class FleetCache:
+    """Current index plus its background refresh.
+
+    Refreshes use the token of the last user who looked something up and
+    pause when nobody has used the index for ``IDLE_AFTER`` seconds.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self.index = FleetIndex([])
+        self.refreshes = 0
+        self._refresh_task: asyncio.Task | None = None
+        self._last_user: int | None = None
+        self._last_used = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.refreshes > 0
+
+    @property
+    def stale(self) -> bool:
+        return not self.ready or time.monotonic() - self.index.built_at > self.max_age
+
+    def touch(self, telegram_id: int) -> FleetIndex:
+        """Record a lookup and return the current index.
+
+        A stale index is still returned; the rebuild runs in the background.
+        """
+        self._last_user = telegram_id
+        self._last_used = time.monotonic()
+        if self.stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh_quietly(), name="fleet-refresh")
+        return self.index
+
+    async def _refresh_quietly(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            logger.warning("Fleet index refresh failed", exc_info=True)
+
+    async def refresh(self) -> None:
+        if self._last_user is None:
+            return
+        api = await client_for_user(self._last_user)
+        if api is None:
+            return
+        result = await api.list_vehicles()
+        await self.load(result if isinstance(result, list) else result.get("vehicles", []))
+
+    async def load(self, vehicles: list[dict]) -> None:
+        """Rebuild from a vehicle list the caller already has."""
+        started = time.perf_counter()
+        # Building is pure CPU; keep it off the event loop
+        self.index = await asyncio.to_thread(FleetIndex, vehicles)
+        self.refreshes += 1
+        logger.debug(
+            "Fleet index rebuilt: %d vehicles in %.1fms",
+            len(self.index),
+            (time.perf_counter() - started) * 1000,
+        )
+
+    async def refresh_if_used(self) -> None:
+        """Periodic job: keep the index warm while people are using it."""
+        if time.monotonic() - self._last_used < IDLE_AFTER:
+            await self.refresh()
+
+
+fleet = FleetCache(max_age=settings.fleet_refresh_interval)
@@ -0,0 +1,238 @@
+"""Event-loop lag monitoring and cached dependency checks for readiness."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+
+import httpx
+from sqlalchemy import text
+
+from bot.config import settings
+from bot.db.session import engine
+from bot.middlewares.concurrency import update_limiter
+from bot.services.api_scheduler import api_scheduler
+
+logger = logging.getLogger(__name__)
+
+CHECK_TIMEOUT = 3.0
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(values)) - 1)
+    return values[min(index, len(values) - 1)]
+
+
+class LoopLagMonitor:
+    """Measures scheduling lag of the event loop.
+
+    A coroutine sleeps for ``interval`` and records how late it wakes up.
+    A watchdog thread watches the coroutine's heartbeat and, when the loop
+    stays blocked longer than ``slow_callback_ms``, logs the stack of the
+    loop thread so the blocking callback can be identified.
+    """
+
+    def __init__(self, interval: float, slow_callback_ms: float, window: int = 120):
+        self.interval = interval
+        self.slow_callback_ms = slow_callback_ms
+        self.slow_callbacks = 0
+        self._lags: deque[float] = deque(maxlen=window)
+        self._heartbeat = time.monotonic()
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop_thread = 0
+
+    def start(self) -> None:
+        if self._task:
+            return
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self._lags.append(lag * 1000)
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        threshold = self.slow_callback_ms / 1000
+        reported = False
+        while not self._stop.wait(max(threshold / 2, 0.01)):
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled <= threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            self.slow_callbacks += 1
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame, limit=15)) if frame else "?"
+            logger.warning(
+                "Event loop blocked for %.0fms, currently in:\n%s", stalled * 1000, stack
+            )
+
+    def stats(self) -> dict[str, float]:
+        lags = sorted(self._lags)
+        return {
+            "samples": len(lags),
+            "p50_ms": round(percentile(lags, 50), 2),
+            "p95_ms": round(percentile(lags, 95), 2),
+            "p99_ms": round(percentile(lags, 99), 2),
+            "max_ms": round(lags[-1], 2) if lags else 0.0,
+            "slow_callbacks": self.slow_callbacks,
+        }
+
+    def is_lagging(self, threshold_ms: float) -> bool:
+        """True when lag is sustained, not just a single spike."""
+        recent = sorted(list(self._lags)[-20:])
+        return len(recent) >= 5 and percentile(recent, 50) > threshold_ms
+
+
+@dataclass
+class CheckResult:
+    ok: bool
+    latency_ms: float
+    checked_at: float
+    error: str | None = None
+
+    def as_dict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "latency_ms": round(self.latency_ms, 1),
+            "age_s": round(time.monotonic() - self.checked_at, 1),
+            "error": self.error,
+        }
+
+
+class DependencyChecks:
+    """Periodically probes SQLite and car-api and caches the outcome.
+
+    Probe handlers only read the cached results, so Kubernetes polling
+    frequency never translates into load on the dependencies.
+    """
+
+    CRITICAL = ("database",)
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.results: dict[str, CheckResult] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._run(), name="dependency-checks")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self) -> None:
+        await asyncio.gather(
+            self._probe("database", self._check_database),
+            self._probe("car_api", self._check_car_api),
+        )
+
+    async def _probe(self, name: str, check) -> None:
+        started = time.monotonic()
+        error = None
+        try:
+            await asyncio.wait_for(check(), timeout=CHECK_TIMEOUT)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:200]
+        now = time.monotonic()
+        self.results[name] = CheckResult(error is None, (now - started) * 1000, now, error)
+        if error:
+            logger.warning("Dependency check %s failed: %s", name, error)
+
+    @staticmethod
+    async def _check_database() -> None:
+        # Reading the schema needs a SHARED lock, so this fails fast when
+        # another connection holds the database exclusively.
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT count(*) FROM sqlite_master"))
+
+    @staticmethod
+    async def _check_car_api() -> None:
+        url = f"{settings.api_base_url.rstrip('/')}/api/v1/health/live"
+        async with httpx.AsyncClient(timeout=CHECK_TIMEOUT) as client:
+            resp = await client.get(url)
+            resp.raise_for_status()
+
+    def is_fresh(self, name: str) -> bool:
+        result = self.results.get(name)
+        return result is not None and time.monotonic() - result.checked_at < self.interval * 3
+
+
+loop_monitor = LoopLagMonitor(
+    interval=settings.loop_lag_interval,
+    slow_callback_ms=settings.slow_callback_ms,
+)
+dependency_checks = DependencyChecks(interval=settings.health_check_interval)
+
+
+def readiness() -> tuple[bool, dict]:
+    """Evaluate readiness from cached state only."""
+    lagging = loop_monitor.is_lagging(settings.loop_lag_ready_ms)
+    critical_ok = all(
+        dependency_checks.is_fresh(name) and dependency_checks.results[name].ok
+        for name in DependencyChecks.CRITICAL
+    )
+    all_ok = all(r.ok for r in dependency_checks.results.values())
+
+    ready = critical_ok and not lagging
+    if not ready:
+        status = "unready"
+    elif not all_ok:
+        status = "degraded"
+    else:
+        status = "ready"
+    return ready, {
+        "status": status,
+        "checks": {name: r.as_dict() for name, r in dependency_checks.results.items()},
+        "loop_lag": loop_monitor.stats(),
+        "updates": update_limiter.stats(),
+        "car_api": api_scheduler.stats(),
+    }
+
+
+def start() -> None:
+    loop_monitor.start()
+    dependency_checks.start()
+
+
+async def stop() -> None:
+    await loop_monitor.stop()
+    await dependency_checks.stop()
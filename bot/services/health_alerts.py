@@ -0,0 +1,227 @@
+"""Threshold alerts for admins from one shared backend health poller.
+
+A single periodic job reads ``health_detail``, ``get_dispatcher_health``
+and ``get_ipv6_statistics`` with any admin's token and evaluates a fixed
+set of rules over the snapshot. A rule only fires after
+``alert_confirm_polls`` consecutive breaching polls and only resolves
+after as many healthy ones; numeric rules also clear at a lower level
+than they trigger at, so a value hovering at the threshold does not
+flap. Each transition is pushed once to every logged-in admin, with all
+transitions of one poll combined into a single message.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from aiogram import Bot
+
+from bot.config import settings
+from bot.services.auth_service import admin_client, admin_ids
+from bot.services.reachability import reachability
+from bot.texts import fa
+
+logger = logging.getLogger(__name__)
+
+HEALTHY_STATUSES = {"healthy", "ok"}
+CLEAR_RATIO = 0.8  # numeric rules clear below this share of their threshold
+SPIKE_POLLS = 10  # blocked-IP spikes are measured against the low of this many polls
+
+Snapshot = dict[str, dict | None]  # source -> response, None if the call failed
+
+
+def _number(value: object) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _first(source: dict | None, *keys: str) -> object:
+    if not isinstance(source, dict):
+        return None
+    for key in keys:
+        if source.get(key) is not None:
+            return source[key]
+    return None
+
+
+def _active_agents(snap: Snapshot) -> float | None:
+    agents = _number(_first(snap.get("dispatcher"), "active_agents", "connected_agents"))
+    if agents is None:
+        agents = _number(_first(snap.get("health"), "connected_agents"))
+    return agents
+
+
+@dataclass
+class Rule:
+    name: str
+    label: str
+    read: Callable[[Snapshot], object]
+    breached: Callable[[object], bool]
+    cleared: Callable[[object], bool]
+    firing: bool = False
+    streak: int = 0  # consecutive polls disagreeing with ``firing``
+    since: float = 0.0
+    value: object = None
+
+
+@dataclass(frozen=True)
+class Transition:
+    rule: str
+    label: str
+    fired: bool
+    value: object
+    lasted: float  # seconds the previous state lasted
+
+
+def default_rules() -> list[Rule]:
+    min_agents = settings.alert_min_agents
+    max_blocked = settings.alert_max_blocked_ips
+    spike = settings.alert_blocked_ips_spike
+    return [
+        Rule(
+            "backend",
+            fa.ALERT_BACKEND,
+            lambda snap: snap.get("health") is None,
+            lambda failed: failed,
+            lambda failed: not failed,
+        ),
+        Rule(
+            "health",
+            fa.ALERT_HEALTH,
+            lambda snap: _first(snap.get("health"), "status"),
+            lambda status: status not in HEALTHY_STATUSES,
+            lambda status: status in HEALTHY_STATUSES,
+        ),
+        Rule(
+            "dispatcher",
+            fa.ALERT_DISPATCHER,
+            lambda snap: _first(snap.get("dispatcher"), "status"),
+            lambda status: status not in HEALTHY_STATUSES,
+            lambda status: status in HEALTHY_STATUSES,
+        ),
+        Rule(
+            "agents",
+            fa.ALERT_AGENTS,
+            _active_agents,
+            lambda agents: agents < min_agents,
+            lambda agents: agents >= min_agents,
+        ),
+        Rule(
+            "blocked_ips",
+            fa.ALERT_BLOCKED_IPS,
+            lambda snap: _number(_first(snap.get("ipv6"), "blocked_ips", "blocked")),
+            lambda blocked: blocked >= max_blocked,
+            lambda blocked: blocked < max_blocked * CLEAR_RATIO,
+        ),
+        Rule(
+            "blocked_spike",
+            fa.ALERT_BLOCKED_SPIKE,
+            lambda snap: snap.get("blocked_ips_rise"),
+            lambda rise: rise >= spike,
+            lambda rise: rise < spike * CLEAR_RATIO,
+        ),
+    ]
+
+
+class HealthAlerts:
+    def __init__(self, rules: list[Rule], confirm_polls: int):
+        self.rules = rules
+        self.confirm_polls = max(1, confirm_polls)
+        self.polls = 0
+        self.sent = 0
+        self._blocked_history: deque[float] = deque(maxlen=SPIKE_POLLS)
+
+    @property
+    def firing(self) -> list[Rule]:
+        return [rule for rule in self.rules if rule.firing]
+
+    def evaluate(self, snapshot: Snapshot, now: float | None = None) -> list[Transition]:
+        """Advance every rule by one poll and return the state changes."""
+        now = time.time() if now is None else now
+        blocked = _number(_first(snapshot.get("ipv6"), "blocked_ips", "blocked"))
+        if blocked is not None:
+            low = min(self._blocked_history, default=blocked)
+            snapshot = {**snapshot, "blocked_ips_rise": blocked - low}
+            self._blocked_history.append(blocked)
+
+        transitions = []
+        for rule in self.rules:
+            value = rule.read(snapshot)
+            if value is None:
+                continue  # source unavailable: keep the current state
+            rule.value = value
+            flipping = rule.cleared(value) if rule.firing else rule.breached(value)
+            rule.streak = rule.streak + 1 if flipping else 0
+            if rule.streak < self.confirm_polls:
+                continue
+            lasted = now - rule.since if rule.since else 0.0
+            rule.firing, rule.streak, rule.since = not rule.firing, 0, now
+            transitions.append(Transition(rule.name, rule.label, rule.firing, value, lasted))
+        return transitions
+
+    async def _snapshot(self) -> Snapshot | None:
+        api = await admin_client()
+        if api is None:
+            return None
+        calls = (api.health_detail(), api.get_dispatcher_health(), api.get_ipv6_statistics())
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        snapshot: Snapshot = {}
+        for source, result in zip(("health", "dispatcher", "ipv6"), results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning("Health poll of %s failed: %s", source, result)
+                snapshot[source] = None
+            else:
+                snapshot[source] = result if isinstance(result, dict) else {}
+        return snapshot
+
+    async def poll(self, bot: Bot) -> list[Transition]:
+        """Periodic job: poll once, evaluate the rules and alert admins on changes."""
+        snapshot = await self._snapshot()
+        if snapshot is None:
+            return []
+        self.polls += 1
+        transitions = self.evaluate(snapshot)
+        if transitions:
+            await self._notify(bot, render(transitions))
+        return transitions
+
+    async def _notify(self, bot: Bot, text: str) -> None:
+        for telegram_id in await admin_ids():
+            try:
+                if await reachability.send_message(bot, telegram_id, text):
+                    self.sent += 1
+            except Exception:
+                logger.warning("Failed to send alert to admin %s", telegram_id, exc_info=True)
+
+
+def _duration(seconds: float) -> str:
+    minutes = round(seconds / 60)
+    return f"{minutes // 60}h{minutes % 60:02d}m" if minutes >= 60 else f"{minutes}m"
+
+
+def _value(value: object) -> str:
+    if isinstance(value, bool):
+        return ""
+    return f": {value:g}" if isinstance(value, float) else f": {value}"
+
+
+def render(transitions: list[Transition]) -> str:
+    lines = [fa.ALERT_TITLE]
+    for t in transitions:
+        value = _value(t.value)
+        if t.fired:
+            lines.append(f"🔴 {t.label}{value}")
+        else:
+            lasted = f" ({_duration(t.lasted)})" if t.lasted else ""
+            lines.append(f"🟢 {fa.ALERT_RESOLVED.format(label=t.label)}{value}{lasted}")
+    return "\n".join(lines)
+
+
+health_alerts = HealthAlerts(default_rules(), confirm_polls=settings.alert_confirm_polls)
@@ -0,0 +1,181 @@
+"""Background sampling of admin dashboard numbers into fixed-size ring buffers.
+
+Every ``metrics_sample_interval`` seconds the monitoring dashboard and the
+detailed health check are read with an admin's token and one value per
+metric is appended to a preallocated ``array('d')``. The buffers cover 24
+hours, so memory stays constant however long the bot runs. The admin
+screens render deltas, min/max and sparklines over the last hour and day
+from these buffers without calling the backend again.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from bot.config import settings
+from bot.services.auth_service import admin_client
+from bot.texts import fa
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600.0
+DAY = 86400.0
+WINDOWS = ((HOUR, "1h"), (DAY, "24h"))
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+SPARK_WIDTH = 24
+
+# name -> (label, reads the value from (dashboard, health))
+METRICS: dict[str, tuple[str, Callable[[dict, dict], object]]] = {
+    "active_agents": (
+        fa.METRIC_ACTIVE_AGENTS,
+        lambda dash, health: dash.get("coordinator", {}).get("active_agents"),
+    ),
+    "blocked_ips": (
+        fa.METRIC_BLOCKED_IPS,
+        lambda dash, health: dash.get("ipv6_pool", {}).get("blocked_ips"),
+    ),
+    "avg_latency_ms": (
+        fa.METRIC_AVG_LATENCY,
+        lambda dash, health: dash.get("ipv6_pool", {}).get("average_latency_ms"),
+    ),
+    "droplets": (
+        fa.METRIC_DROPLETS,
+        lambda dash, health: dash.get("droplets", {}).get("total"),
+    ),
+    "cost_per_hour": (
+        fa.METRIC_COST_PER_HOUR,
+        lambda dash, health: dash.get("droplets", {}).get("estimated_cost_per_hour_cents"),
+    ),
+    "active_searches": (
+        fa.METRIC_ACTIVE_SEARCHES,
+        lambda dash, health: health.get("active_searches"),
+    ),
+}
+
+
+def _number(value: object) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def sparkline(values: list[float], width: int = SPARK_WIDTH) -> str:
+    """Bucket ``values`` into at most ``width`` means and draw them as blocks."""
+    points = [v for v in values if not math.isnan(v)]
+    if not points:
+        return ""
+    buckets = min(width, len(points))
+    means = []
+    for i in range(buckets):
+        chunk = points[i * len(points) // buckets : (i + 1) * len(points) // buckets]
+        means.append(sum(chunk) / len(chunk))
+    low, high = min(means), max(means)
+    if high == low:
+        return SPARK_CHARS[0] * len(means)
+    scale = (len(SPARK_CHARS) - 1) / (high - low)
+    return "".join(SPARK_CHARS[round((m - low) * scale)] for m in means)
+
+
+@dataclass(frozen=True)
+class Trend:
+    current: float
+    delta: float
+    minimum: float
+    maximum: float
+    sparkline: str
+    samples: int
+
+
+class MetricSampler:
+    def __init__(self, interval: float, span: float = DAY):
+        self.interval = interval
+        self.capacity = max(2, math.ceil(span / interval) + 1)
+        self._times = array("d", bytes(8 * self.capacity))
+        self._values = {name: array("d", [math.nan]) * self.capacity for name in METRICS}
+        self._head = 0  # next slot to write
+        self._size = 0
+        self.failures = 0
+
+    def record(self, dashboard: dict, health: dict, at: float | None = None) -> None:
+        slot = self._head
+        self._times[slot] = time.time() if at is None else at
+        for name, (_, read) in METRICS.items():
+            self._values[name][slot] = _number(read(dashboard, health))
+        self._head = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _window(self, name: str, seconds: float, now: float) -> list[float]:
+        """Values of the last ``seconds``, oldest first."""
+        since = now - seconds
+        start = (self._head - self._size) % self.capacity
+        values = self._values[name]
+        window = []
+        for i in range(self._size):
+            slot = (start + i) % self.capacity
+            if self._times[slot] >= since:
+                window.append(values[slot])
+        return window
+
+    def trend(self, name: str, seconds: float, now: float | None = None) -> Trend | None:
+        window = self._window(name, seconds, time.time() if now is None else now)
+        points = [v for v in window if not math.isnan(v)]
+        if not points:
+            return None
+        return Trend(
+            current=points[-1],
+            delta=points[-1] - points[0],
+            minimum=min(points),
+            maximum=max(points),
+            sparkline=sparkline(points),
+            samples=len(points),
+        )
+
+    async def sample(self) -> None:
+        """Periodic job: one sample of every metric."""
+        api = await admin_client()
+        if api is None:
+            return
+        try:
+            dashboard = await api.get_dashboard()
+            health = await api.health_detail()
+        except Exception:
+            self.failures += 1
+            logger.warning("Metric sampling failed", exc_info=True)
+            return
+        self.record(dashboard if isinstance(dashboard, dict) else {}, health or {})
+
+    def render(self, names: list[str], now: float | None = None) -> str:
+        """Trend block for the admin screens; empty until the first sample."""
+        now = time.time() if now is None else now
+        lines = []
+        for name in names:
+            label = METRICS[name][0]
+            rows = []
+            for seconds, window in WINDOWS:
+                trend = self.trend(name, seconds, now)
+                if trend is None or trend.samples < 2:
+                    continue
+                rows.append(
+                    f"  {window}: {trend.sparkline} Δ{_fmt(trend.delta, signed=True)}"
+                    f" ({_fmt(trend.minimum)}–{_fmt(trend.maximum)})"
+                )
+            if rows:
+                lines.append(f"• {label}:")
+                lines.extend(rows)
+        if not lines:
+            return ""
+        return "\n".join([fa.METRIC_TRENDS_TITLE, *lines])
+
+
+def _fmt(value: float, signed: bool = False) -> str:
+    text = f"{value:+.1f}" if signed else f"{value:.1f}"
+    return text.removesuffix(".0")
+
+
+metrics_sampler = MetricSampler(interval=settings.metrics_sample_interval)
@@ -0,0 +1,302 @@
+"""Run one search on several accounts and stop the rest on the first hit.
+
+A multi-search is started from the search wizard. ``start_search`` goes
+out to every selected account concurrently, and the outcome is tracked in
+a single Telegram message. When the first ``search.completed`` webhook
+arrives for one of the accounts, that account wins and ``stop_search`` is
+sent to the others concurrently. Other search events only update the
+per-account state shown in the message.
+
+Events are matched to the searches this registry started: when the
+backend returned a search id on start, events carrying a different
+``search_id`` belong to another search on the same account and are
+ignored. Starting another search on an account, multi or single, takes
+the account over, and multi-searches that never settle are forgotten
+after ``multi_search_max_age``.
+
+State is kept in memory, like the wizard's FSM storage.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.callbacks.factory import SearchCB
+from bot.config import settings
+from bot.keyboards.builders import back_to_menu_button
+from bot.services.api_client import APIError, CarAPI
+from bot.services.auth_service import client_for_user
+from bot.texts import fa
+
+logger = logging.getLogger(__name__)
+
+# Per-account states
+STARTING = "starting"
+RUNNING = "running"
+FAILED = "failed"
+WON = "won"
+STOPPING = "stopping"
+STOPPED = "stopped"
+
+TERMINAL = {FAILED, WON, STOPPED}
+
+STATE_LABELS = {
+    STARTING: "⏳ در حال شروع",
+    RUNNING: "🔍 در حال جستجو",
+    FAILED: "❌ خطا",
+    WON: "✅ خودرو پیدا شد",
+    STOPPING: "⏳ در حال توقف",
+    STOPPED: "⏹ متوقف شد",
+}
+
+
+@dataclass
+class MultiSearch:
+    id: str
+    telegram_id: int
+    chat_id: int
+    message_id: int
+    accounts: list[str]
+    states: dict[str, str]
+    errors: dict[str, str] = field(default_factory=dict)
+    search_ids: dict[str, str] = field(default_factory=dict)  # backend ids, when returned
+    winner: str | None = None
+    vehicle: str | None = None
+    started_at: float = field(default_factory=time.time)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return all(state in TERMINAL for state in self.states.values())
+
+    def render(self) -> str:
+        if self.winner:
+            title = fa.MULTI_SEARCH_WON.format(account=self.winner, vehicle=self.vehicle or "?")
+        elif self.finished:
+            title = fa.MULTI_SEARCH_ENDED
+        else:
+            running = sum(state == RUNNING for state in self.states.values())
+            title = fa.MULTI_SEARCH_TITLE.format(running=running, total=len(self.accounts))
+        lines = [title, ""]
+        for account in self.accounts:
+            line = f"{STATE_LABELS[self.states[account]]} — {account}"
+            if account in self.errors:
+                line += f" ({self.errors[account][:60]})"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def keyboard(self) -> InlineKeyboardMarkup:
+        rows = []
+        if not self.finished:
+            rows.append(
+                [
+                    InlineKeyboardButton(
+                        text=fa.MULTI_SEARCH_STOP_ALL,
+                        callback_data=SearchCB(action="multi_stop", value=self.id).pack(),
+                    )
+                ]
+            )
+        rows.append([back_to_menu_button()])
+        return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+class MultiSearchRegistry:
+    def __init__(self, max_age: float = settings.multi_search_max_age):
+        self.max_age = max_age
+        self._searches: dict[str, MultiSearch] = {}
+        self._by_account: dict[str, MultiSearch] = {}
+
+    def get(self, search_id: str) -> MultiSearch | None:
+        return self._searches.get(search_id)
+
+    async def start(
+        self,
+        bot: Bot,
+        api: CarAPI,
+        telegram_id: int,
+        chat_id: int,
+        message_id: int,
+        accounts: list[str],
+        params: dict,
+    ) -> MultiSearch:
+        search = MultiSearch(
+            id=uuid.uuid4().hex[:12],
+            telegram_id=telegram_id,
+            chat_id=chat_id,
+            message_id=message_id,
+            accounts=list(accounts),
+            states=dict.fromkeys(accounts, STARTING),
+        )
+        self._expire()
+        # A newer multi-search takes over accounts from an older one
+        for account in accounts:
+            await self.release(bot, account)
+            self._by_account[account] = search
+        self._searches[search.id] = search
+
+        # Webhooks for these accounts wait until every start has returned,
+        # so a quick search.completed cannot race a start still in flight
+        async with search.lock:
+            await _edit(bot, search)
+            results = await asyncio.gather(
+                *(api.start_search(account, params) for account in accounts),
+                return_exceptions=True,
+            )
+            for account, result in zip(accounts, results, strict=True):
+                if isinstance(result, BaseException):
+                    search.states[account] = FAILED
+                    search.errors[account] = _error_text(result)
+                else:
+                    search.states[account] = RUNNING
+                    if search_id := _started_id(result):
+                        search.search_ids[account] = search_id
+            await self._settle(bot, search)
+        return search
+
+    async def release(self, bot: Bot, account: str) -> None:
+        """Another search was started on ``account``; its multi-search no longer owns it."""
+        search = self._by_account.pop(account, None)
+        if search is None:
+            return
+        async with search.lock:
+            if search.states.get(account) not in TERMINAL:
+                search.states[account] = STOPPED
+                search.errors[account] = fa.MULTI_SEARCH_TAKEN_OVER
+            await self._settle(bot, search)
+
+    async def handle_event(
+        self, bot: Bot, event_type: str, account: str | None, payload: dict
+    ) -> bool:
+        """Apply a search webhook event; returns True if it belonged to a multi-search."""
+        self._expire()
+        search = self._by_account.get(account) if account else None
+        if search is None or not event_type.startswith("search."):
+            return False
+        expected, received = search.search_ids.get(account), payload.get("search_id")
+        if expected and received and str(received) != expected:
+            return False  # another search on the same account
+
+        async with search.lock:
+            state = search.states.get(account)
+            if state is None or state in TERMINAL:
+                return True
+            if event_type == "search.completed":
+                if search.winner is None:
+                    search.winner = account
+                    search.vehicle = _vehicle_text(payload.get("vehicle", {}))
+                    search.states[account] = WON
+                    await self._stop_others(bot, search, except_account=account)
+                else:
+                    # Completed before its stop arrived; the user sees both hits
+                    search.states[account] = WON
+            elif event_type == "search.error":
+                search.states[account] = FAILED
+                search.errors[account] = str(payload.get("error", "?"))
+            elif event_type == "search.stopped":
+                search.states[account] = STOPPED
+            await self._settle(bot, search)
+        return True
+
+    async def stop_all(self, bot: Bot, search: MultiSearch) -> None:
+        async with search.lock:
+            await self._stop_others(bot, search, except_account=None)
+            await self._settle(bot, search)
+
+    async def _stop_others(self, bot: Bot, search: MultiSearch, except_account: str | None):
+        targets = [
+            account
+            for account, state in search.states.items()
+            if account != except_account and state not in TERMINAL
+        ]
+        if not targets:
+            return
+        for account in targets:
+            search.states[account] = STOPPING
+        await _edit(bot, search)
+
+        # The search may outlive the token it was started with
+        api = await client_for_user(search.telegram_id)
+        if api is None:
+            for account in targets:
+                search.states[account] = FAILED
+                search.errors[account] = fa.SESSION_EXPIRED
+            return
+        results = await asyncio.gather(
+            *(api.stop_search(account) for account in targets), return_exceptions=True
+        )
+        for account, result in zip(targets, results, strict=True):
+            # 404: the search had already ended on the backend
+            if isinstance(result, BaseException) and not _is_not_found(result):
+                search.states[account] = FAILED
+                search.errors[account] = _error_text(result)
+            else:
+                search.states[account] = STOPPED
+
+    async def _settle(self, bot: Bot, search: MultiSearch) -> None:
+        await _edit(bot, search)
+        if search.finished:
+            self._forget(search)
+            logger.info(
+                "Multi-search %s finished in %.0fs, winner %s",
+                search.id,
+                time.time() - search.started_at,
+                search.winner,
+            )
+
+    def _forget(self, search: MultiSearch) -> None:
+        self._searches.pop(search.id, None)
+        for account in search.accounts:
+            if self._by_account.get(account) is search:
+                del self._by_account[account]
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.max_age
+        for search in [s for s in self._searches.values() if s.started_at < cutoff]:
+            logger.info("Multi-search %s expired unsettled", search.id)
+            self._forget(search)
+
+
+async def _edit(bot: Bot, search: MultiSearch) -> None:
+    try:
+        await bot.edit_message_text(
+            search.render(),
+            chat_id=search.chat_id,
+            message_id=search.message_id,
+            reply_markup=search.keyboard(),
+        )
+    except TelegramBadRequest:
+        pass  # unchanged text, or the message was deleted
+    except Exception:
+        logger.warning("Failed to update multi-search %s message", search.id, exc_info=True)
+
+
+def _started_id(result: object) -> str | None:
+    if not isinstance(result, dict):
+        return None
+    search_id = result.get("search_id", result.get("id"))
+    return str(search_id) if search_id is not None else None
+
+
+def _is_not_found(error: BaseException) -> bool:
+    return isinstance(error, APIError) and error.status_code == 404
+
+
+def _error_text(error: BaseException) -> str:
+    return error.detail if isinstance(error, APIError) else type(error).__name__
+
+
+def _vehicle_text(vehicle: dict) -> str:
+    model = vehicle.get("model", "?")
+    number = vehicle.get("vehicle_nb", vehicle.get("number", "?"))
+    return f"{model} #{number}"
+
+
+multi_searches = MultiSearchRegistry()
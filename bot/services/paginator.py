@@ -0,0 +1,173 @@
+"""Cached, prefetching pagination over offset-based backend lists.
+
+Each user gets a view of a list when they open it. The view is anchored
+to the highest id seen on its first page, so entries created while the
+user is paging neither appear nor push older rows onto the next page:
+for newest-first lists the offset is shifted by how much ``total`` grew
+since the anchor was taken, and anything above the anchor is dropped.
+Oldest-first lists only grow past their last page, so they are cut at
+the ``total`` seen when the view was anchored instead.
+
+Fetched pages are kept per view for ``ttl`` seconds, and whenever a page
+is shown the next one is fetched in the background, so most "next" taps
+are answered from memory. Views are evicted least recently used first,
+as are pages within a view.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from bot.services.api_client import CarAPI
+
+logger = logging.getLogger(__name__)
+
+# (api, skip, limit) -> (items, total)
+Fetch = Callable[[CarAPI, int, int], Awaitable[tuple[list[dict], int]]]
+
+
+@dataclass(frozen=True)
+class Page:
+    number: int
+    items: list[dict]
+    total: int
+    total_pages: int
+
+
+@dataclass
+class _View:
+    created_at: float = field(default_factory=time.monotonic)
+    anchor: int = 0
+    base_total: int = 0
+    latest_total: int = 0
+    newest_first: bool = True
+    pages: OrderedDict[int, tuple[float, list[dict]]] = field(default_factory=OrderedDict)
+    inflight: dict[int, asyncio.Task] = field(default_factory=dict)
+
+
+class Paginator:
+    def __init__(
+        self,
+        fetch: Fetch,
+        per_page: int,
+        ttl: float,
+        max_pages: int = 8,
+        max_users: int = 1024,
+    ):
+        self.fetch = fetch
+        self.per_page = per_page
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self.max_users = max_users
+        self.hits = 0
+        self.misses = 0
+        self.prefetches = 0
+        self._views: OrderedDict[int, _View] = OrderedDict()
+
+    def invalidate(self, telegram_id: int) -> None:
+        """Forget a user's view, e.g. after they changed the list."""
+        view = self._views.pop(telegram_id, None)
+        if view:
+            for task in view.inflight.values():
+                task.cancel()
+
+    async def page(
+        self, telegram_id: int, api: CarAPI, number: int, *, restart: bool = False
+    ) -> Page:
+        """Page ``number`` of the user's view; ``restart`` re-anchors at the newest entry."""
+        view = self._views.get(telegram_id)
+        anchored = False
+        if restart or view is None or time.monotonic() - view.created_at > self.ttl:
+            self.invalidate(telegram_id)
+            view = self._views[telegram_id] = _View()
+            while len(self._views) > self.max_users:
+                self.invalidate(next(iter(self._views)))
+            await self._anchor(view, api)
+            anchored = True
+        self._views.move_to_end(telegram_id)
+
+        total_pages = max(1, -(-view.base_total // self.per_page))
+        number = max(0, min(number, total_pages - 1))
+        items = self._cached(view, number)
+        if items is not None and not anchored:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if items is None:
+                items = await self._load(view, api, number)
+
+        following = number + 1
+        if (
+            following < total_pages
+            and self._cached(view, following) is None
+            and following not in view.inflight
+        ):
+            self.prefetches += 1
+            self._start(view, api, following)
+        return Page(number, items, view.base_total, total_pages)
+
+    async def _anchor(self, view: _View, api: CarAPI) -> None:
+        items, total = await self.fetch(api, 0, self.per_page)
+        ids = [item.get("id", 0) for item in items]
+        view.anchor = max(ids, default=0)
+        view.newest_first = len(ids) < 2 or ids[0] >= ids[-1]
+        view.base_total = view.latest_total = total
+        self._store(view, 0, items)
+
+    def _cached(self, view: _View, number: int) -> list[dict] | None:
+        entry = view.pages.get(number)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        view.pages.move_to_end(number)
+        return entry[1]
+
+    def _store(self, view: _View, number: int, items: list[dict]) -> None:
+        view.pages[number] = (time.monotonic() + self.ttl, items)
+        view.pages.move_to_end(number)
+        while len(view.pages) > self.max_pages:
+            view.pages.popitem(last=False)
+
+    def _start(self, view: _View, api: CarAPI, number: int) -> asyncio.Task:
+        task = asyncio.create_task(self._fetch_page(view, api, number))
+        view.inflight[number] = task
+        task.add_done_callback(lambda t: self._finished(view, number, t))
+        return task
+
+    def _finished(self, view: _View, number: int, task: asyncio.Task) -> None:
+        if view.inflight.get(number) is task:
+            del view.inflight[number]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Fetching page %d failed", number, exc_info=task.exception())
+
+    async def _load(self, view: _View, api: CarAPI, number: int) -> list[dict]:
+        # Join a prefetch of the same page instead of asking twice
+        task = view.inflight.get(number) or self._start(view, api, number)
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled() or asyncio.current_task().cancelling():
+                raise
+            # invalidate() dropped the view under us; this caller still wants its page
+            return await self._fetch_page(view, api, number)
+
+    async def _fetch_page(self, view: _View, api: CarAPI, number: int) -> list[dict]:
+        for _ in range(2):
+            grown = max(0, view.latest_total - view.base_total) if view.newest_first else 0
+            items, total = await self.fetch(api, number * self.per_page + grown, self.per_page)
+            changed = total != view.latest_total
+            view.latest_total = total
+            # Entries arrived between the two calls: the shift is stale, try once more
+            if not (changed and view.newest_first):
+                break
+        if view.newest_first:
+            items = [item for item in items if item.get("id", 0) <= view.anchor]
+        else:
+            # Oldest-first lists grow at the end: cut at the size seen when anchoring
+            items = items[: max(0, view.base_total - number * self.per_page)]
+        self._store(view, number, items)
+        return items
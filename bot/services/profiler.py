@@ -0,0 +1,196 @@
+"""On-demand CPU and memory profiling of the live event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+
+from bot.config import settings
+
+MODES = ("sample", "cprofile")
+SAMPLE_INTERVAL = 0.005
+MAX_STACK_DEPTH = 64
+TRACEMALLOC_FRAMES = 1
+TOP_ALLOCATIONS = 25
+
+_lock = asyncio.Lock()
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a capture is requested while another one is running."""
+
+
+@dataclass
+class ProfileCapture:
+    mode: str
+    seconds: float
+    started_at: float
+    samples: int = 0
+    collapsed: str = ""
+    pstats_data: bytes = b""
+    allocations: list[str] = field(default_factory=list)
+
+    @property
+    def stamp(self) -> str:
+        return time.strftime("%Y%m%d-%H%M%S", time.gmtime(self.started_at))
+
+    def profile_file(self) -> tuple[str, bytes]:
+        """Return (filename, content) of the CPU profile."""
+        if self.mode == "cprofile":
+            return f"profile-{self.stamp}.pstats", self.pstats_data
+        return f"profile-{self.stamp}.collapsed.txt", self.collapsed.encode()
+
+    def allocations_file(self) -> tuple[str, bytes]:
+        return f"tracemalloc-{self.stamp}.txt", "\n".join(self.allocations).encode()
+
+    def summary(self, limit: int = 15) -> str:
+        """Human-readable top entries, used for web replies and captions."""
+        if self.mode == "cprofile":
+            return pstats_summary(self.pstats_data, limit)
+        return "\n".join(top_leaf_frames(self.collapsed, limit))
+
+
+def is_running() -> bool:
+    return _lock.locked()
+
+
+async def capture(seconds: float, mode: str = "sample") -> ProfileCapture:
+    """Profile the running event loop for ``seconds`` seconds.
+
+    Only one capture runs at a time; duration is clamped to
+    ``settings.profiler_max_seconds`` to keep the overhead bounded.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown profiler mode: {mode}")
+    if _lock.locked():
+        raise ProfilerBusyError("A profile capture is already running")
+
+    seconds = max(0.1, min(float(seconds), settings.profiler_max_seconds))
+    async with _lock:
+        result = ProfileCapture(mode=mode, seconds=seconds, started_at=time.time())
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        try:
+            if mode == "cprofile":
+                result.pstats_data = await _run_cprofile(seconds)
+            else:
+                counts, result.samples = await _run_sampler(seconds)
+                result.collapsed = "\n".join(f"{stack} {n}" for stack, n in counts.most_common())
+            result.allocations = _top_allocations(tracemalloc.take_snapshot())
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+        return result
+
+
+async def _run_cprofile(seconds: float) -> bytes:
+    # cProfile hooks the current thread, which is the event loop thread,
+    # so every task scheduled during the window is accounted for.
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.disable()
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
+
+
+async def _run_sampler(seconds: float) -> tuple[Counter[str], int]:
+    target = threading.get_ident()
+    stop = threading.Event()
+    counts: Counter[str] = Counter()
+    samples = 0
+
+    def sample() -> None:
+        nonlocal samples
+        while not stop.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            counts[_collapse(frame)] += 1
+            samples += 1
+
+    thread = threading.Thread(target=sample, name="profiler-sampler", daemon=True)
+    thread.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        stop.set()
+        await asyncio.to_thread(thread.join)
+    return counts, samples
+
+
+def _collapse(frame) -> str:
+    """Render a frame chain root-first in flamegraph "collapsed" syntax."""
+    parts: list[str] = []
+    while frame is not None and len(parts) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def _short_path(path: str) -> str:
+    marker = f"site-packages{os.sep}"
+    if marker in path:
+        return path.split(marker, 1)[1]
+    cwd = os.getcwd() + os.sep
+    return path.removeprefix(cwd)
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot) -> list[str]:
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+    )
+    stats = snapshot.statistics("lineno")
+    total = sum(s.size for s in stats)
+    lines = [f"Total traced: {total / 1024:.1f} KiB in {len(stats)} locations"]
+    for stat in stats[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        lines.append(
+            f"{stat.size / 1024:9.1f} KiB {stat.count:7d} blocks  "
+            f"{_short_path(frame.filename)}:{frame.lineno}"
+        )
+    return lines
+
+
+def top_leaf_frames(collapsed: str, limit: int) -> list[str]:
+    """Self-time ranking of the innermost frames of a collapsed profile."""
+    leaves: Counter[str] = Counter()
+    total = 0
+    for line in collapsed.splitlines():
+        stack, _, n = line.rpartition(" ")
+        leaves[stack.rsplit(";", 1)[-1]] += int(n)
+        total += int(n)
+    return [f"{n * 100 / total:5.1f}% {frame}" for frame, n in leaves.most_common(limit)]
+
+
+def pstats_summary(data: bytes, limit: int) -> str:
+    stats = pstats.Stats(_MarshalledStats(data), stream=(out := io.StringIO()))
+    stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return out.getvalue()
+
+
+class _MarshalledStats:
+    """Adapter so pstats.Stats can load raw marshalled profile data."""
+
+    def __init__(self, data: bytes):
+        self.stats = marshal.loads(data)
+
+    def create_stats(self) -> None:
+        pass
@@ -0,0 +1,97 @@
+"""Tracking of users the bot can no longer message.
+
+When Telegram answers a send with Forbidden (the user blocked the bot or
+deleted their account) or "chat not found", the user is recorded in
+``users.unreachable_since`` and in an in-memory set. Fan-outs check the
+set and skip those chats instead of failing on every event. The mark is
+cleared as soon as the user sends the bot anything again.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+from aiogram.types import Message
+from sqlalchemy import select, update
+
+from bot.db.models import User
+from bot.db.session import async_session
+from bot.services.auth_service import SQLITE_TIMESTAMP
+
+logger = logging.getLogger(__name__)
+
+
+def is_unreachable_error(error: BaseException) -> bool:
+    if isinstance(error, TelegramForbiddenError):
+        return True
+    return isinstance(error, TelegramBadRequest) and "chat not found" in error.message.lower()
+
+
+class Reachability:
+    def __init__(self):
+        self._unreachable: set[int] = set()
+        self.skipped = 0
+
+    def __contains__(self, telegram_id: int) -> bool:
+        return telegram_id in self._unreachable
+
+    @property
+    def count(self) -> int:
+        return len(self._unreachable)
+
+    async def load(self) -> None:
+        """Fill the exclusion set from the database, at startup."""
+        async with async_session() as session:
+            result = await session.execute(
+                select(User.telegram_id).where(User.unreachable_since.is_not(None))
+            )
+            self._unreachable = set(result.scalars())
+        if self._unreachable:
+            logger.info("%d users are unreachable", len(self._unreachable))
+
+    async def mark_unreachable(self, telegram_id: int, reason: str) -> None:
+        if telegram_id in self._unreachable:
+            return
+        self._unreachable.add(telegram_id)
+        logger.info("User %s is unreachable: %s", telegram_id, reason)
+        async with async_session() as session:
+            await session.execute(
+                update(User)
+                .where(User.telegram_id == telegram_id)
+                .values(unreachable_since=datetime.now(UTC).strftime(SQLITE_TIMESTAMP))
+            )
+            await session.commit()
+
+    async def mark_reachable(self, telegram_id: int) -> None:
+        if telegram_id not in self._unreachable:
+            return
+        self._unreachable.discard(telegram_id)
+        logger.info("User %s is reachable again", telegram_id)
+        async with async_session() as session:
+            await session.execute(
+                update(User).where(User.telegram_id == telegram_id).values(unreachable_since=None)
+            )
+            await session.commit()
+
+    async def send_message(self, bot: Bot, chat_id: int, text: str, **kwargs) -> Message | None:
+        """``bot.send_message`` that skips unreachable chats and records new ones.
+
+        Returns None when the chat was skipped or turned out unreachable;
+        other errors propagate.
+        """
+        if chat_id in self._unreachable:
+            self.skipped += 1
+            return None
+        try:
+            return await bot.send_message(chat_id, text, **kwargs)
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            if not is_unreachable_error(e):
+                raise
+            await self.mark_unreachable(chat_id, e.message)
+            return None
+
+
+reachability = Reachability()
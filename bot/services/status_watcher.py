@@ -0,0 +1,171 @@
+"""Shared polling of search/optimization status for users without webhooks.
+
+One watch exists per (account, kind), no matter how many users follow it,
+so backend polling scales with watched accounts rather than viewers. The
+poll interval starts at ``watch_fast_interval``, stretches while the
+status stays the same and snaps back when it changes. Once the status is
+no longer active the subscribers get a final update and the watch ends.
+The status menus of subscribers read the latest polled result instead of
+fetching their own while it is fresh; other users fetch with their own
+token, since the result was polled with a subscriber's.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiogram import Bot
+
+from bot.config import settings
+from bot.services.api_client import APIError, CarAPI
+from bot.services.api_scheduler import background_lane
+from bot.services.auth_service import client_for_user
+from bot.services.reachability import reachability
+from bot.texts import fa
+
+logger = logging.getLogger(__name__)
+
+KINDS = {
+    "search": "get_search_status",
+    "optimization": "get_optimization_status",
+}
+ACTIVE_STATES = {"pending", "starting", "running"}
+BACKOFF = 1.5
+
+WatchKey = tuple[str, str]
+
+
+@dataclass
+class Watch:
+    account: str
+    kind: str
+    subscribers: set[int] = field(default_factory=set)
+    status: str | None = None
+    result: dict[str, Any] | None = None
+    updated_at: float = 0.0
+    interval: float = 0.0
+    polls: int = 0
+    failures: int = 0
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+
+class StatusWatcher:
+    def __init__(self, fast_interval: float, max_interval: float):
+        self.fast_interval = fast_interval
+        self.max_interval = max_interval
+        self._watches: dict[WatchKey, Watch] = {}
+
+    def subscribe(self, bot: Bot, telegram_id: int, account: str, kind: str) -> Watch:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown watch kind: {kind}")
+        key = (account, kind)
+        watch = self._watches.get(key)
+        if watch is None:
+            watch = self._watches[key] = Watch(account, kind, interval=self.fast_interval)
+        watch.subscribers.add(telegram_id)
+        if watch.task is None or watch.task.done():
+            watch.task = asyncio.create_task(self._run(bot, watch), name=f"watch-{kind}-{account}")
+        return watch
+
+    def unsubscribe(self, telegram_id: int, account: str, kind: str) -> None:
+        watch = self._watches.get((account, kind))
+        if watch:
+            watch.subscribers.discard(telegram_id)
+            if not watch.subscribers:
+                self._drop(watch)
+
+    def is_subscribed(self, telegram_id: int, account: str, kind: str) -> bool:
+        watch = self._watches.get((account, kind))
+        return watch is not None and telegram_id in watch.subscribers
+
+    def latest(self, telegram_id: int, account: str, kind: str) -> dict[str, Any] | None:
+        """Last polled result for a subscriber, if no older than one poll interval."""
+        watch = self._watches.get((account, kind))
+        if watch is None or watch.result is None or telegram_id not in watch.subscribers:
+            return None
+        if time.monotonic() - watch.updated_at > watch.interval:
+            return None
+        return watch.result
+
+    async def stop(self) -> None:
+        watches = list(self._watches.values())
+        for watch in watches:
+            self._drop(watch)
+        await asyncio.gather(*(w.task for w in watches if w.task), return_exceptions=True)
+
+    def _drop(self, watch: Watch) -> None:
+        if self._watches.get((watch.account, watch.kind)) is watch:
+            del self._watches[(watch.account, watch.kind)]
+        if watch.task and watch.task is not asyncio.current_task():
+            watch.task.cancel()
+
+    async def _run(self, bot: Bot, watch: Watch) -> None:
+        with background_lane():
+            await self._loop(bot, watch)
+
+    async def _loop(self, bot: Bot, watch: Watch) -> None:
+        while watch.subscribers:
+            result = await self._poll(watch)
+            if result is None:
+                # Back off on failures without touching the last known state
+                watch.failures += 1
+                await asyncio.sleep(
+                    min(self.fast_interval * BACKOFF**watch.failures, self.max_interval)
+                )
+                continue
+            watch.failures = 0
+
+            status = result.get("status") or "idle"
+            changed = watch.status is not None and status != watch.status
+            watch.status, watch.result = status, result
+            watch.updated_at = time.monotonic()
+            if changed:
+                await self._notify(bot, watch)
+
+            if status not in ACTIVE_STATES:
+                break
+            watch.interval = (
+                self.fast_interval if changed else min(watch.interval * BACKOFF, self.max_interval)
+            )
+            await asyncio.sleep(watch.interval)
+        self._drop(watch)
+
+    async def _poll(self, watch: Watch) -> dict[str, Any] | None:
+        api: CarAPI | None = None
+        for telegram_id in list(watch.subscribers):
+            api = await client_for_user(telegram_id)
+            if api:
+                break
+            watch.subscribers.discard(telegram_id)  # logged out
+        if api is None:
+            return None
+
+        watch.polls += 1
+        try:
+            return await getattr(api, KINDS[watch.kind])(watch.account) or {}
+        except APIError as e:
+            if e.status_code == 404:
+                return {"status": "idle"}
+            logger.warning("Watch %s/%s failed: %s", watch.kind, watch.account, e.detail)
+        except Exception:
+            logger.warning("Watch %s/%s failed", watch.kind, watch.account, exc_info=True)
+        return None
+
+    async def _notify(self, bot: Bot, watch: Watch) -> None:
+        title = fa.WATCH_SEARCH_CHANGED if watch.kind == "search" else fa.WATCH_OPT_CHANGED
+        text = title.format(account=watch.account, status=watch.status)
+        for telegram_id in list(watch.subscribers):
+            try:
+                await reachability.send_message(bot, telegram_id, text)
+            except Exception:
+                logger.warning("Failed to push watch update to %s", telegram_id, exc_info=True)
+
+
+watcher = StatusWatcher(
+    fast_interval=settings.watch_fast_interval,
+    max_interval=settings.watch_max_interval,
+)
@@ -0,0 +1,107 @@
+"""Tuned aiohttp session for the Telegram Bot API client.
+
+aiogram's default session has a fixed connection pool, keep-alive and a
+single timeout for every method. This session takes its pool size,
+keep-alive and per-method timeouts from settings, can point at a
+self-hosted Bot API server (``telegram_api_url``), and records per-method
+request counts, errors and latency for the readiness endpoint.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import PRODUCTION, TelegramAPIServer
+from aiogram.methods import TelegramMethod
+
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Overridable through ``telegram_method_timeouts``
+DEFAULT_METHOD_TIMEOUTS = {
+    "answerCallbackQuery": 10.0,
+    "sendChatAction": 10.0,
+    "sendDocument": 300.0,
+}
+
+
+@dataclass
+class MethodStats:
+    calls: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class TunedSession(AiohttpSession):
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        keepalive: float = 15.0,
+        method_timeouts: dict[str, float] | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(limit=limit, **kwargs)
+        # 0 closes every connection after its request
+        if keepalive > 0:
+            self._connector_init["keepalive_timeout"] = keepalive
+        else:
+            self._connector_init["force_close"] = True
+        self.method_timeouts = method_timeouts or {}
+        self.stats: dict[str, MethodStats] = {}
+
+    async def make_request(
+        self, bot: Bot, method: TelegramMethod, timeout: int | None = None
+    ) -> Any:
+        name = method.__api_method__
+        if timeout is None:
+            timeout = self.method_timeouts.get(name)
+        stats = self.stats.setdefault(name, MethodStats())
+        started = time.perf_counter()
+        try:
+            return await super().make_request(bot, method, timeout=timeout)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            stats.calls += 1
+            stats.total_ms += elapsed
+            stats.max_ms = max(stats.max_ms, elapsed)
+
+    def metrics(self) -> dict[str, dict]:
+        return {name: stats.as_dict() for name, stats in sorted(self.stats.items())}
+
+
+def api_server(base_url: str = "", is_local: bool = False) -> TelegramAPIServer:
+    if not base_url:
+        return PRODUCTION
+    return TelegramAPIServer.from_base(base_url.rstrip("/"), is_local=is_local)
+
+
+def create_session() -> TunedSession:
+    """Session configured from settings."""
+    if settings.telegram_api_url:
+        logger.info("Using Bot API server at %s", settings.telegram_api_url)
+    return TunedSession(
+        api=api_server(settings.telegram_api_url, settings.telegram_api_is_local),
+        limit=settings.telegram_connection_limit,
+        keepalive=settings.telegram_keepalive,
+        timeout=settings.telegram_timeout,
+        method_timeouts={**DEFAULT_METHOD_TIMEOUTS, **settings.telegram_method_timeouts},
+    )
@@ -0,0 +1,150 @@
+"""Delivery health of all of a user's webhooks in one report.
+
+Recent deliveries of every webhook are fetched concurrently and reduced in
+a single pass to a success rate, p50/p95 ``duration_ms`` and the most
+common failing status. An optional probe fires ``test_webhook`` at every
+webhook at once. The report is ranked worst first so problems surface at
+the top.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass
+
+from bot.services.api_client import APIError, CarAPI
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_SAMPLE = 100  # most recent deliveries analysed per webhook
+REPORT_CONCURRENCY = 8
+LIST_PAGE = 50
+HEALTHY_RATE = 0.95
+
+
+@dataclass(frozen=True)
+class Probe:
+    success: bool
+    status: int | str
+    duration_ms: float | None
+
+
+@dataclass
+class WebhookHealth:
+    id: int
+    name: str
+    active: bool
+    deliveries: int = 0
+    successes: int = 0
+    p50_ms: float | None = None
+    p95_ms: float | None = None
+    top_failure: tuple[int | str, int] | None = None
+    error: str | None = None
+    probe: Probe | None = None
+
+    @property
+    def success_rate(self) -> float | None:
+        return self.successes / self.deliveries if self.deliveries else None
+
+    @property
+    def healthy(self) -> bool:
+        return not self.error and (self.success_rate or 0.0) >= HEALTHY_RATE
+
+    def rank_key(self) -> tuple:
+        """Worst first: fetch errors, then low success rate, then slow p95."""
+        if self.error:
+            return (0, 0.0, 0.0)
+        if self.success_rate is None:
+            return (2, 0.0, 0.0)
+        return (1, self.success_rate, -(self.p95_ms or 0.0))
+
+
+def _percentile(ordered: list[float], q: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _succeeded(delivery: dict) -> bool:
+    if "success" in delivery:
+        return bool(delivery["success"])
+    status = delivery.get("status_code")
+    return isinstance(status, int) and 200 <= status < 300
+
+
+def summarize(webhook: dict, deliveries: list[dict]) -> WebhookHealth:
+    health = WebhookHealth(
+        id=webhook.get("id", 0),
+        name=webhook.get("name", "?"),
+        active=bool(webhook.get("is_active")),
+    )
+    durations: list[float] = []
+    failures: Counter = Counter()
+    for delivery in deliveries:
+        health.deliveries += 1
+        if _succeeded(delivery):
+            health.successes += 1
+        else:
+            failures[delivery.get("status_code") or delivery.get("error") or "?"] += 1
+        duration = delivery.get("duration_ms")
+        if isinstance(duration, int | float):
+            durations.append(float(duration))
+
+    durations.sort()
+    health.p50_ms = _percentile(durations, 0.50)
+    health.p95_ms = _percentile(durations, 0.95)
+    if failures:
+        health.top_failure = failures.most_common(1)[0]
+    return health
+
+
+async def _all_webhooks(api: CarAPI) -> list[dict]:
+    webhooks: list[dict] = []
+    while True:
+        result = await api.list_webhooks(skip=len(webhooks), limit=LIST_PAGE)
+        page = result.get("webhooks", [])
+        webhooks.extend(page)
+        if len(page) < LIST_PAGE or len(webhooks) >= result.get("total", len(webhooks)):
+            return webhooks
+
+
+async def _check(
+    api: CarAPI, webhook: dict, probe: bool, semaphore: asyncio.Semaphore
+) -> WebhookHealth:
+    async with semaphore:
+        calls = [api.list_webhook_deliveries(webhook.get("id", 0), limit=DELIVERY_SAMPLE)]
+        if probe:
+            calls.append(api.test_webhook(webhook.get("id", 0)))
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+    deliveries = results[0]
+    if isinstance(deliveries, BaseException):
+        health = summarize(webhook, [])
+        health.error = deliveries.detail if isinstance(deliveries, APIError) else "?"
+    else:
+        health = summarize(webhook, deliveries.get("deliveries", []))
+
+    if probe:
+        outcome = results[1]
+        if isinstance(outcome, BaseException):
+            status = outcome.status_code if isinstance(outcome, APIError) else "?"
+            health.probe = Probe(False, status, None)
+        else:
+            health.probe = Probe(
+                bool(outcome.get("success")),
+                outcome.get("status_code", "?"),
+                outcome.get("duration_ms"),
+            )
+    return health
+
+
+async def collect(api: CarAPI, *, probe: bool = False) -> list[WebhookHealth]:
+    """Health of every webhook of the token's owner, worst first."""
+    webhooks = await _all_webhooks(api)
+    semaphore = asyncio.Semaphore(REPORT_CONCURRENCY)
+    report = await asyncio.gather(*(_check(api, wh, probe, semaphore) for wh in webhooks))
+    return sorted(report, key=WebhookHealth.rank_key)
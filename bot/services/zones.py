@@ -0,0 +1,228 @@
+"""Service zone index for validating search locations locally.
+
+``get_zones`` is compiled once into polygons with a bounding box each. A
+lookup tests the boxes first and only runs the even-odd ray cast for the
+few polygons whose box contains the point; rings are tested together, so
+holes fall out of the same rule. When the point is outside every zone the
+nearest boundary is found by scanning polygons in bounding-box distance
+order and stopping once no box can beat the best edge distance.
+
+Zones hardly ever change, so the index is loaded on first use and
+refreshed after ``zone_refresh_interval``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from array import array
+from dataclasses import dataclass
+
+from bot.config import settings
+from bot.services.auth_service import client_for_user
+from bot.services.fleet import KM_PER_DEG_LAT
+
+logger = logging.getLogger(__name__)
+
+RETRY_AFTER = 300.0  # seconds before retrying a failed zone download
+
+LatLng = tuple[float, float]
+
+
+def _point(raw) -> LatLng | None:
+    if isinstance(raw, dict):
+        lat = raw.get("latitude", raw.get("lat"))
+        lng = raw.get("longitude", raw.get("lng", raw.get("lon")))
+    elif isinstance(raw, list | tuple) and len(raw) >= 2:
+        lng, lat = raw[0], raw[1]  # GeoJSON order
+    else:
+        return None
+    if lat is None or lng is None:
+        return None
+    return float(lat), float(lng)
+
+
+def _is_point(raw) -> bool:
+    return isinstance(raw, dict) or (
+        isinstance(raw, list | tuple) and bool(raw) and isinstance(raw[0], int | float)
+    )
+
+
+def zone_polygons(zone: dict) -> list[list[list[LatLng]]]:
+    """Polygons of a zone, each a list of rings (outer boundary, then holes).
+
+    Accepts a GeoJSON ``geometry`` (Polygon or MultiPolygon) or a flat list
+    of points under ``polygon``/``points``/``boundary``/``coordinates``.
+    """
+    geometry = zone.get("geometry") or {}
+    if geometry.get("type") == "Polygon":
+        raw_polygons = [geometry.get("coordinates") or []]
+    elif geometry.get("type") == "MultiPolygon":
+        raw_polygons = geometry.get("coordinates") or []
+    else:
+        raw = next(
+            (zone[k] for k in ("polygon", "points", "boundary", "coordinates") if zone.get(k)), []
+        )
+        # Nesting depth down to the first point: ring 1, polygon 2, multipolygon 3
+        depth, probe = 0, raw
+        while isinstance(probe, list | tuple) and probe and not _is_point(probe):
+            depth, probe = depth + 1, probe[0]
+        raw_polygons = {1: [[raw]], 2: [raw], 3: raw}.get(depth, [])
+
+    polygons = []
+    for raw_rings in raw_polygons:
+        rings = []
+        for raw_ring in raw_rings:
+            ring = [p for p in map(_point, raw_ring) if p is not None]
+            if len(ring) >= 3:
+                rings.append(ring)
+        if rings:
+            polygons.append(rings)
+    return polygons
+
+
+@dataclass(frozen=True)
+class Zone:
+    id: str
+    name: str
+
+
+@dataclass(frozen=True)
+class ZoneMatch:
+    zone: Zone
+    distance_km: float  # 0 when the point is inside
+
+    @property
+    def inside(self) -> bool:
+        return self.distance_km == 0
+
+
+class ZonePolygon:
+    def __init__(self, zone: Zone, rings: list[list[LatLng]]):
+        self.zone = zone
+        self.rings = [(array("d", (p[0] for p in r)), array("d", (p[1] for p in r))) for r in rings]
+        self.min_lat = min(min(lats) for lats, _ in self.rings)
+        self.max_lat = max(max(lats) for lats, _ in self.rings)
+        self.min_lng = min(min(lngs) for _, lngs in self.rings)
+        self.max_lng = max(max(lngs) for _, lngs in self.rings)
+
+    def in_bbox(self, lat: float, lng: float) -> bool:
+        return self.min_lat <= lat <= self.max_lat and self.min_lng <= lng <= self.max_lng
+
+    def contains(self, lat: float, lng: float) -> bool:
+        inside = False
+        for lats, lngs in self.rings:
+            j = len(lats) - 1
+            for i in range(len(lats)):
+                if (lats[i] > lat) != (lats[j] > lat):
+                    cross = lngs[i] + (lat - lats[i]) * (lngs[j] - lngs[i]) / (lats[j] - lats[i])
+                    if lng < cross:
+                        inside = not inside
+                j = i
+        return inside
+
+    def bbox_distance_km(self, lat: float, lng: float) -> float:
+        dlat = max(self.min_lat - lat, 0.0, lat - self.max_lat)
+        dlng = max(self.min_lng - lng, 0.0, lng - self.max_lng)
+        return math.hypot(dlat, dlng * math.cos(math.radians(lat))) * KM_PER_DEG_LAT
+
+    def edge_distance_km(self, lat: float, lng: float) -> float:
+        """Distance to the nearest edge, on a local flat projection around the point."""
+        kx = KM_PER_DEG_LAT * math.cos(math.radians(lat))
+        best = math.inf
+        for lats, lngs in self.rings:
+            j = len(lats) - 1
+            for i in range(len(lats)):
+                ax, ay = (lngs[j] - lng) * kx, (lats[j] - lat) * KM_PER_DEG_LAT
+                bx, by = (lngs[i] - lng) * kx, (lats[i] - lat) * KM_PER_DEG_LAT
+                dx, dy = bx - ax, by - ay
+                length = dx * dx + dy * dy
+                t = 0.0 if length == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / length))
+                best = min(best, math.hypot(ax + t * dx, ay + t * dy))
+                j = i
+        return best
+
+
+class ZoneIndex:
+    def __init__(self, zones: list[dict]):
+        self.zones: list[Zone] = []
+        self.polygons: list[ZonePolygon] = []
+        for raw in zones:
+            zone_id = str(raw.get("zoneId", raw.get("id", len(self.zones))))
+            zone = Zone(zone_id, str(raw.get("name") or raw.get("zoneName") or zone_id))
+            polygons = zone_polygons(raw)
+            if polygons:
+                self.zones.append(zone)
+                self.polygons.extend(ZonePolygon(zone, rings) for rings in polygons)
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def locate(self, lat: float, lng: float) -> ZoneMatch | None:
+        """Containing zone, else the nearest one; None when there are no zones."""
+        for polygon in self.polygons:
+            if polygon.in_bbox(lat, lng) and polygon.contains(lat, lng):
+                return ZoneMatch(polygon.zone, 0.0)
+
+        best: ZoneMatch | None = None
+        by_box = sorted(self.polygons, key=lambda p: p.bbox_distance_km(lat, lng))
+        for polygon in by_box:
+            if best is not None and polygon.bbox_distance_km(lat, lng) >= best.distance_km:
+                break
+            distance = polygon.edge_distance_km(lat, lng)
+            if best is None or distance < best.distance_km:
+                best = ZoneMatch(polygon.zone, distance)
+        return best
+
+
+class ZoneCache:
+    """Lazily loaded zone index shared by every user."""
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self.index = ZoneIndex([])
+        self.loaded_at: float | None = None
+        self._failed_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def stale(self) -> bool:
+        now = time.monotonic()
+        if self._failed_at is not None and now - self._failed_at < RETRY_AFTER:
+            return False
+        return self.loaded_at is None or now - self.loaded_at > self.max_age
+
+    async def ensure(self, telegram_id: int) -> ZoneIndex:
+        """Current index, downloading it first if missing or expired.
+
+        A failed download keeps the previous index; callers treat an empty
+        index as "no zone information" rather than "nowhere is served".
+        """
+        if not self.stale:
+            return self.index
+        async with self._lock:
+            if not self.stale:
+                return self.index
+            api = await client_for_user(telegram_id)
+            if api is None:
+                return self.index
+            try:
+                result = await api.get_zones()
+            except Exception:
+                self._failed_at = time.monotonic()
+                logger.warning("Loading service zones failed", exc_info=True)
+                return self.index
+            zones = result.get("zones", []) if isinstance(result, dict) else result
+            self.index = ZoneIndex(zones or [])
+            self.loaded_at = time.monotonic()
+            self._failed_at = None
+            logger.info(
+                "Loaded %d service zones (%d polygons)", len(self.index), len(self.index.polygons)
+            )
+        return self.index
+
+
+zones = ZoneCache(max_age=settings.zone_refresh_interval)
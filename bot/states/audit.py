@@ -0,0 +1,7 @@
+"""Audit log browser FSM states."""
+
+from aiogram.fsm.state import State, StatesGroup
+
+
+class AuditForm(StatesGroup):
+    search_text = State()
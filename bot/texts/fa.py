@@ -28,6 +28,12 @@ ACCOUNT_SWITCHED = "✅ حساب به {account} تغییر کرد."
 ACCOUNT_STATUS_TITLE = "👤 وضعیت حساب: {account}"
 NEXT_FREE_TIME = "⏰ زمان بعدی آزاد: {time}"
 NO_ACCOUNTS = "هیچ حسابی در دسترس نیست."
+ACCOUNTS_OVERVIEW = "📋 نمای کلی حساب‌ها"
+OVERVIEW_TITLE = "📋 نمای کلی حساب‌ها ({done}/{total})"
+OVERVIEW_LOADING = "⏳ در حال دریافت..."
+OVERVIEW_NO_RENTAL = "بدون اجاره"
+OVERVIEW_IDLE = "غیرفعال"
+OVERVIEW_REFRESH = "🔄 به‌روزرسانی"
 
 # Search
 SEARCH_TITLE = "🔍 جستجوی خودرو"
@@ -50,7 +56,34 @@ SEARCH_STATUS_FOUND = "✅ خودرو پیدا شد!"
 SEARCH_STATUS_STOPPED = "متوقف شده"
 SEARCH_SUMMARY = "📍 موقعیت: {lat}, {lng}\n" "📏 شعاع: {radius} کیلومتر\n" "🔧 فیلترها: {filters}"
 SEARCH_CUSTOM_RADIUS = "سفارشی..."
-SEARCH_RADIUS_PROMPT = "شعاع را به متر وارد کنید:"
+SEARCH_RADIUS_PROMPT = "شعاع را به متر وارد کنید (حداکثر {max}):"
+SEARCH_MULTI = "🔀 جستجو در چند حساب"
+NEARBY_TITLE = "🚙 نزدیک‌ترین خودروهای آزاد:"
+NEARBY_NONE = "🚙 خودروی آزادی در {radius} کیلومتری شما نیست."
+NEARBY_COUNT = "🚙 اکنون {count} خودرو در این شعاع آزاد است."
+ZONE_INSIDE = "🗺 منطقهٔ سرویس: {zone}"
+ZONE_OUTSIDE = "⚠️ این نقطه خارج از مناطق سرویس است؛ نزدیک‌ترین منطقه «{zone}» در {distance} است."
+ZONE_OUT_OF_RANGE = (
+    "❌ این نقطه خارج از مناطق سرویس است (نزدیک‌ترین منطقه «{zone}» در {distance}).\n"
+    "لوکیشن دیگری ارسال کنید."
+)
+ZONE_RADIUS_TOO_SMALL = (
+    "❌ شعاع جستجو به هیچ منطقهٔ سرویس نمی‌رسد؛ نزدیک‌ترین منطقه «{zone}» در {distance} است."
+)
+MULTI_SEARCH_SELECT = "حساب‌هایی را که جستجو روی آن‌ها اجرا شود انتخاب کنید:"
+MULTI_SEARCH_START = "▶️ شروع در {count} حساب"
+MULTI_SEARCH_NO_TARGETS = "حداقل یک حساب انتخاب کنید."
+MULTI_SEARCH_TITLE = "🔀 جستجوی چندحسابی ({running}/{total} فعال)"
+MULTI_SEARCH_WON = "✅ خودرو در حساب {account} پیدا شد!\n🚙 {vehicle}"
+MULTI_SEARCH_ENDED = "⏹ جستجوی چندحسابی پایان یافت."
+MULTI_SEARCH_STOP_ALL = "⏹ توقف همه"
+MULTI_SEARCH_TAKEN_OVER = "جستجوی دیگری روی این حساب شروع شد"
+WATCH_ON = "🔔 پیگیری وضعیت"
+WATCH_OFF = "🔕 لغو پیگیری"
+WATCH_STARTED = "🔔 تغییرات وضعیت برای شما ارسال می‌شود."
+WATCH_STOPPED = "🔕 پیگیری لغو شد."
+WATCH_SEARCH_CHANGED = "🔍 وضعیت جستجوی {account}: {status}"
+WATCH_OPT_CHANGED = "📊 وضعیت بهینه‌سازی {account}: {status}"
 
 # Optimization
 OPT_TITLE = "📊 بهینه‌سازی خودرو"
@@ -102,6 +135,19 @@ VEHICLE_DETAIL = (
     "🚙 {model} #{number}\n" "📍 {location}\n" "⛽ {fuel_type}\n" "🔋 باتری: {battery}%"
 )
 VEHICLES_EMPTY = "خودرویی یافت نشد."
+VEHICLES_BROWSE = "🎛 فیلتر سریع"
+FLEET_TITLE = "🎛 خودروهای آزاد: {count} از {total}"
+FLEET_LOADING = "⏳ فهرست خودروها در حال آماده‌سازی است، چند لحظه دیگر تلاش کنید."
+FLEET_NO_MATCH = "خودرویی با این فیلترها پیدا نشد."
+FLEET_FACET_GAS = "⛽ بنزینی"
+FLEET_FACET_EV = "⚡ برقی"
+FLEET_FACET_HYBRID = "♻️ هیبریدی"
+FLEET_FACET_SNOW = "❄️ لاستیک زمستانه"
+FLEET_FACET_CHARGED = "🔋 شارژ ۵۰٪+"
+FLEET_FACET_NO_PRIUS = "🚫 بدون پریوس"
+FLEET_MODEL_ANY = "🚗 مدل: همه"
+FLEET_MODEL = "🚗 مدل: {model}"
+FLEET_RESET = "🔄 حذف فیلترها"
 
 # Webhooks
 WEBHOOK_TITLE = "🔔 وب‌هوک‌ها"
@@ -113,11 +159,29 @@ WEBHOOK_CREATED = "✅ وب‌هوک ایجاد شد."
 WEBHOOK_DELETED = "✅ وب‌هوک حذف شد."
 WEBHOOK_UPDATED = "✅ وب‌هوک به‌روزرسانی شد."
 WEBHOOK_TEST_SENT = "✅ تست ارسال شد."
+WEBHOOK_REPORT = "📊 گزارش سلامت"
+WEBHOOK_REPORT_PROBE = "🧪 تست همه"
+WEBHOOK_REPORT_TITLE = "📊 سلامت وب‌هوک‌ها (آخرین {sample} تحویل هر کدام)"
+WEBHOOK_REPORT_LOADING = "⏳ در حال بررسی وب‌هوک‌ها..."
+WEBHOOK_REPORT_NO_DELIVERIES = "بدون تحویل"
+WEBHOOK_REPORT_SUMMARY = "✅ {healthy} سالم | ⚠️ {degraded} مشکل‌دار | ⚪ {idle} بدون تحویل"
 
 # Audit
 AUDIT_TITLE = "📋 لاگ‌های حسابرسی"
 AUDIT_EMPTY = "لاگی یافت نشد."
 AUDIT_FILTER = "🔍 فیلتر"
+AUDIT_FILTERS_TITLE = "🔍 فیلتر لاگ‌ها\nروی هر گزینه بزنید تا اعمال یا حذف شود."
+AUDIT_ACTIVE_FILTERS = "🔍 فیلترها: {filters}"
+AUDIT_SEARCH = "🔎 جستجوی متن"
+AUDIT_SEARCH_PROMPT = "عبارت مورد نظر را برای جستجو در لاگ‌ها وارد کنید:"
+AUDIT_FILTER_CLEAR = "🧹 حذف فیلترها"
+AUDIT_EXPORT = "📦 خروجی فایل"
+AUDIT_EXPORT_TITLE = (
+    "📦 خروجی لاگ‌ها\n" "بازه و قالب فایل را انتخاب کنید. فیلترهای حساب و عملیات هم اعمال می‌شوند."
+)
+AUDIT_EXPORT_PROGRESS = "⏳ در حال دریافت لاگ‌ها... {rows}/{total}"
+AUDIT_EXPORT_DONE = "✅ {rows} لاگ در {seconds:.1f} ثانیه صادر شد."
+AUDIT_EXPORT_BUSY = "⏳ خروجی قبلی شما هنوز در حال انجام است."
 AUDIT_DETAIL = (
     "📋 لاگ #{id}\n"
     "👤 کاربر: {user}\n"
@@ -151,11 +215,39 @@ ADMIN_MONITORING = "📊 مانیتورینگ"
 ADMIN_HEALTH = "💚 سلامت"
 ADMIN_VERSION = "📌 نسخه"
 ADMIN_NOT_AUTHORIZED = "⛔ شما دسترسی ادمین ندارید."
+ADMIN_UNREACHABLE_USERS = "🚫 {count} کاربر ربات را مسدود کرده‌اند یا در دسترس نیستند."
+ADMIN_PROFILER = "🔬 پروفایلر"
+PROFILER_TITLE = "🔬 پروفایل زنده ربات\nنوع و مدت نمونه‌برداری را انتخاب کنید:"
+PROFILER_RUNNING = "⏳ در حال پروفایل ({mode}) به مدت {seconds} ثانیه..."
+PROFILER_BUSY = "⚠️ یک پروفایل دیگر در حال اجراست."
+PROFILER_DONE = "✅ پروفایل تکمیل شد ({mode}، {seconds} ثانیه، {samples} نمونه)."
+ADMIN_DATABASE = "🗄 پایگاه داده"
+DB_TITLE = "🗄 وضعیت پایگاه داده"
+DB_RUN_MAINTENANCE = "🧹 اجرای نگهداری"
+DB_MAINTENANCE_RUNNING = "⏳ در حال نگهداری پایگاه داده..."
+DB_MAINTENANCE_BUSY = "⚠️ نگهداری پایگاه داده در حال اجراست."
+DB_NO_REPORT = "هنوز نگهداری‌ای اجرا نشده است."
+METRIC_TRENDS_TITLE = "📈 روند:"
+METRIC_ACTIVE_AGENTS = "ایجنت‌های فعال"
+METRIC_BLOCKED_IPS = "IPهای مسدود"
+METRIC_AVG_LATENCY = "میانگین تأخیر (ms)"
+METRIC_DROPLETS = "دراپلت‌ها"
+METRIC_COST_PER_HOUR = "هزینه/ساعت (¢)"
+METRIC_ACTIVE_SEARCHES = "جستجوهای فعال"
+ALERT_TITLE = "🚨 هشدار سیستم"
+ALERT_RESOLVED = "برطرف شد: {label}"
+ALERT_BACKEND = "سرور در دسترس نیست"
+ALERT_HEALTH = "وضعیت سلامت سرور"
+ALERT_DISPATCHER = "وضعیت دیسپچر"
+ALERT_AGENTS = "ایجنت‌های فعال کم است"
+ALERT_BLOCKED_IPS = "IPهای مسدود زیاد است"
+ALERT_BLOCKED_SPIKE = "افزایش ناگهانی IPهای مسدود"
 
 # Notifications
 NOTIF_SEARCH_COMPLETED = "✅ جستجو تکمیل شد!\n🚙 {vehicle}\n📍 {location}"
 NOTIF_RENTAL_BOOKED = "✅ اجاره رزرو شد!\n🚙 {vehicle}"
 NOTIF_OPTIMIZATION_SWAP = "🔄 خودرو بهتر پیدا شد!\n🚙 {vehicle}\n📊 امتیاز: {score}"
+NOTIF_DIGEST_TITLE = "📬 {count} رویداد جدید"
 
 # Pagination
 PAGE_PREV = "◀️ قبلی"
@@ -171,5 +263,7 @@ NO = "خیر"
 ERROR_GENERIC = "❌ خطایی رخ داد. لطفاً دوباره تلاش کنید."
 ERROR_API = "❌ خطا در ارتباط با سرور: {error}"
 LOADING = "⏳ در حال بارگذاری..."
+CALLBACK_IN_PROGRESS = "⏳ درخواست قبلی هنوز در حال انجام است..."
+BUSY = "⚠️ ربات در حال حاضر شلوغ است، لطفاً چند لحظه دیگر دوباره تلاش کنید."
 ENABLED = "✅"
 DISABLED = "❌"
@@ -1,17 +1,36 @@
 import hashlib
 import hmac
-import json
 import logging
+from typing import Any
 
 from aiohttp import web
 
 from bot.config import settings
+from bot.services import codec
 
 logger = logging.getLogger(__name__)
 
 
+def json_response(data: Any, status: int = 200) -> web.Response:
+    """Like ``web.json_response`` but encoded once, straight to bytes."""
+    return web.Response(body=codec.dumps(data), status=status, content_type="application/json")
+
+
 async def health_handler(request: web.Request) -> web.Response:
-    return web.json_response({"status": "ok"})
+    """Liveness: the process is up and serving HTTP."""
+    return json_response({"status": "ok"})
+
+
+async def ready_handler(request: web.Request) -> web.Response:
+    """Readiness: built from cached checks, never touches dependencies itself."""
+    from bot.services.health import readiness
+    from bot.services.telegram_session import TunedSession
+
+    ready, body = readiness()
+    session = getattr(request.app.get("bot"), "session", None)
+    if isinstance(session, TunedSession):
+        body["telegram"] = session.metrics()
+    return json_response(body, status=200 if ready else 503)
 
 
 async def oauth_callback_handler(request: web.Request) -> web.Response:
@@ -66,18 +85,20 @@ async def webhook_receiver_handler(request: web.Request) -> web.Response:
         signature = request.headers.get("X-Webhook-Signature", "")
         timestamp = request.headers.get("X-Webhook-Timestamp", "")
         # Backend signs "{timestamp}.{payload}" and sends "sha256={hex}"
-        message = f"{timestamp}.{body.decode()}"
-        expected = hmac.new(
-            settings.webhook_secret.encode("utf-8"),
-            message.encode("utf-8"),
-            hashlib.sha256,
-        ).hexdigest()
+        mac = hmac.new(settings.webhook_secret.encode("utf-8"), digestmod=hashlib.sha256)
+        mac.update(timestamp.encode("utf-8"))
+        mac.update(b".")
+        mac.update(body)
+        expected = mac.hexdigest()
         received = signature.removeprefix("sha256=")
         if not hmac.compare_digest(received, expected):
             logger.warning("Webhook signature mismatch")
-            return web.json_response({"error": "invalid signature"}, status=401)
+            return json_response({"error": "invalid signature"}, status=401)
 
-    data = json.loads(body)
+    try:
+        data = codec.loads(body)
+    except codec.DecodeError:
+        return json_response({"error": "invalid json"}, status=400)
 
     from bot.notifications.dispatcher import dispatch_notification
 
@@ -86,9 +107,44 @@ async def webhook_receiver_handler(request: web.Request) -> web.Response:
         await dispatch_notification(bot, data)
     except Exception:
         logger.exception("Failed to dispatch notification")
-        return web.json_response({"error": "dispatch failed"}, status=500)
+        return json_response({"error": "dispatch failed"}, status=500)
+
+    return json_response({"status": "ok"})
 
-    return web.json_response({"status": "ok"})
+
+def _is_authorized(request: web.Request) -> bool:
+    token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    return hmac.compare_digest(token.encode(), settings.admin_api_token.encode())
+
+
+async def profile_handler(request: web.Request) -> web.Response:
+    """Capture a CPU profile and allocation snapshot of the running bot."""
+    from bot.services import profiler
+
+    if not settings.admin_api_token:
+        raise web.HTTPNotFound()
+    if not _is_authorized(request):
+        return json_response({"error": "unauthorized"}, status=401)
+
+    mode = request.query.get("mode", "sample")
+    try:
+        seconds = float(request.query.get("seconds", "10"))
+        result = await profiler.capture(seconds, mode)
+    except ValueError as e:
+        return json_response({"error": str(e)}, status=400)
+    except profiler.ProfilerBusyError as e:
+        return json_response({"error": str(e)}, status=409)
+
+    return json_response(
+        {
+            "mode": result.mode,
+            "seconds": result.seconds,
+            "samples": result.samples,
+            "summary": result.summary(),
+            "collapsed": result.collapsed,
+            "allocations": result.allocations,
+        }
+    )
 
 
 def create_app(bot=None) -> web.Application:
@@ -96,6 +152,8 @@ def create_app(bot=None) -> web.Application:
     if bot:
         app["bot"] = bot
     app.router.add_get("/health", health_handler)
+    app.router.add_get("/ready", ready_handler)
     app.router.add_get("/oauth/callback", oauth_callback_handler)
     app.router.add_post("/webhooks/notify", webhook_receiver_handler)
+    app.router.add_get("/debug/profile", profile_handler)
     return app
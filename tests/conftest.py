@@ -79,3 +79,20 @@ def admin_user():
         selected_account="amin",
         is_admin=1,
     )
+
+
+@pytest_asyncio.fixture
+async def fake_telegram():
+    from tests.fake_telegram import FakeTelegramServer
+
+    server = FakeTelegramServer()
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def telegram_bot(fake_telegram):
+    bot = fake_telegram.make_bot()
+    yield bot
+    await bot.session.close()
@@ -0,0 +1,290 @@
+"""Local stand-in for the Telegram Bot API.
+
+Serves the subset of Bot API methods the bot uses so handlers and the
+notification fan-out can be exercised end-to-end without a real token.
+Every call is recorded, and flood control (HTTP 429 with ``retry_after``)
+can be simulated either by rate limits or by injecting failures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import json
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.enums import ParseMode
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+FAKE_TOKEN = "123456:FAKE-TOKEN"
+BOT_USER = {"id": 123456, "is_bot": True, "first_name": "Mashinato", "username": "mashinato_bot"}
+
+
+@dataclass
+class RecordedCall:
+    method: str
+    params: dict[str, Any]
+    ok: bool
+    timestamp: float = field(default_factory=time.monotonic)
+
+    @property
+    def chat_id(self) -> int | None:
+        value = self.params.get("chat_id")
+        return int(value) if value is not None else None
+
+
+class FakeTelegramServer:
+    """In-process Bot API server backed by aiohttp.
+
+    ``per_chat_interval`` mimics Telegram's "one message per second per chat"
+    rule and ``global_rate`` the ~30 messages per second bot-wide limit.
+    Both only apply to message-producing methods.
+    """
+
+    RATE_LIMITED_METHODS = frozenset({"sendmessage", "sendlocation", "editmessagetext"})
+
+    def __init__(
+        self,
+        token: str = FAKE_TOKEN,
+        *,
+        per_chat_interval: float | None = None,
+        global_rate: int | None = None,
+        retry_after: int = 1,
+        latency: float = 0.0,
+    ):
+        self.token = token
+        self.per_chat_interval = per_chat_interval
+        self.global_rate = global_rate
+        self.retry_after = retry_after
+        self.latency = latency
+        self.calls: list[RecordedCall] = []
+        self.webhook_url = ""
+        self.blocked_chats: set[int] = set()  # chats that answer 403, as after a block
+
+        self._message_ids = itertools.count(1)
+        self._update_ids = itertools.count(1)
+        self._updates: list[dict] = []
+        self._updates_event = asyncio.Event()
+        self._forced_failures: dict[str, deque[int]] = defaultdict(deque)
+        self._last_per_chat: dict[int, float] = {}
+        self._global_window: deque[float] = deque()
+        self._server: TestServer | None = None
+
+        self._methods: dict[str, Callable[[dict], Awaitable[Any]]] = {
+            "getme": self._get_me,
+            "getupdates": self._get_updates,
+            "setwebhook": self._set_webhook,
+            "deletewebhook": self._delete_webhook,
+            "sendmessage": self._send_message,
+            "editmessagetext": self._edit_message_text,
+            "answercallbackquery": self._answer_callback_query,
+            "sendlocation": self._send_location,
+            "sendchataction": self._send_chat_action,
+        }
+
+    # ── Lifecycle ─────────────────────────────────────────────────────
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self._handle)
+        self._server = TestServer(app)
+        await self._server.start_server()
+        return self.base_url
+
+    async def close(self) -> None:
+        if self._server:
+            await self._server.close()
+            self._server = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "server not started"
+        return str(self._server.make_url("")).rstrip("/")
+
+    @property
+    def api_server(self) -> TelegramAPIServer:
+        return TelegramAPIServer.from_base(self.base_url)
+
+    def make_bot(self, **session_kwargs: Any) -> Bot:
+        """Build an aiogram Bot whose session talks to this server."""
+        session = AiohttpSession(api=self.api_server, **session_kwargs)
+        return Bot(
+            token=self.token,
+            session=session,
+            default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+        )
+
+    # ── Test helpers ──────────────────────────────────────────────────
+
+    def fail_next(self, method: str, retry_after: int | None = None, times: int = 1) -> None:
+        """Answer the next ``times`` calls to ``method`` with 429."""
+        delay = self.retry_after if retry_after is None else retry_after
+        self._forced_failures[method.lower()].extend([delay] * times)
+
+    def push_update(self, update: dict) -> dict:
+        """Queue a raw update for getUpdates; ``update_id`` is assigned if missing."""
+        update.setdefault("update_id", next(self._update_ids))
+        self._updates.append(update)
+        self._updates_event.set()
+        return update
+
+    def calls_for(self, method: str, *, ok: bool | None = None) -> list[RecordedCall]:
+        method = method.lower()
+        return [c for c in self.calls if c.method == method and (ok is None or c.ok is ok)]
+
+    def count(self, method: str, *, ok: bool | None = True) -> int:
+        return len(self.calls_for(method, ok=ok))
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self._forced_failures.clear()
+        self._last_per_chat.clear()
+        self._global_window.clear()
+        self.blocked_chats.clear()
+
+    # ── Request handling ──────────────────────────────────────────────
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        if request.match_info["token"] != self.token:
+            return _error(401, "Unauthorized")
+
+        method = request.match_info["method"].lower()
+        params = _decode_params(await request.post())
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        retry_after = self._check_flood(method, params)
+        if retry_after is not None:
+            self.calls.append(RecordedCall(method, params, ok=False))
+            return _error(
+                429,
+                f"Too Many Requests: retry after {retry_after}",
+                parameters={"retry_after": retry_after},
+            )
+
+        chat_id = params.get("chat_id")
+        if chat_id is not None and int(chat_id) in self.blocked_chats:
+            self.calls.append(RecordedCall(method, params, ok=False))
+            return _error(403, "Forbidden: bot was blocked by the user")
+
+        impl = self._methods.get(method)
+        if impl is None:
+            self.calls.append(RecordedCall(method, params, ok=False))
+            return _error(404, "Not Found: method not found")
+
+        self.calls.append(RecordedCall(method, params, ok=True))
+        return web.json_response({"ok": True, "result": await impl(params)})
+
+    def _check_flood(self, method: str, params: dict) -> int | None:
+        forced = self._forced_failures.get(method)
+        if forced:
+            return forced.popleft()
+        if method not in self.RATE_LIMITED_METHODS:
+            return None
+
+        now = time.monotonic()
+        if self.global_rate is not None:
+            while self._global_window and now - self._global_window[0] >= 1.0:
+                self._global_window.popleft()
+            if len(self._global_window) >= self.global_rate:
+                return self.retry_after
+        chat_id = params.get("chat_id")
+        if self.per_chat_interval is not None and chat_id is not None:
+            last = self._last_per_chat.get(int(chat_id))
+            if last is not None and now - last < self.per_chat_interval:
+                return self.retry_after
+            self._last_per_chat[int(chat_id)] = now
+        if self.global_rate is not None:
+            self._global_window.append(now)
+        return None
+
+    # ── Methods ───────────────────────────────────────────────────────
+
+    async def _get_me(self, params: dict) -> dict:
+        return BOT_USER
+
+    async def _get_updates(self, params: dict) -> list[dict]:
+        offset = int(params.get("offset", 0) or 0)
+        timeout = float(params.get("timeout", 0) or 0)
+        # Confirming an offset drops everything before it, as Telegram does
+        self._updates = [u for u in self._updates if u["update_id"] >= offset]
+        if not self._updates and timeout:
+            self._updates_event.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._updates_event.wait(), timeout=timeout)
+        limit = int(params.get("limit", 100) or 100)
+        return self._updates[:limit]
+
+    async def _set_webhook(self, params: dict) -> bool:
+        self.webhook_url = params.get("url", "")
+        return True
+
+    async def _delete_webhook(self, params: dict) -> bool:
+        self.webhook_url = ""
+        return True
+
+    async def _send_message(self, params: dict) -> dict:
+        return self._message(params, text=params.get("text", ""))
+
+    async def _edit_message_text(self, params: dict) -> dict | bool:
+        if params.get("inline_message_id"):
+            return True
+        message = self._message(params, text=params.get("text", ""))
+        message["message_id"] = int(params.get("message_id", message["message_id"]))
+        message["edit_date"] = int(time.time())
+        return message
+
+    async def _answer_callback_query(self, params: dict) -> bool:
+        return True
+
+    async def _send_chat_action(self, params: dict) -> bool:
+        return True
+
+    async def _send_location(self, params: dict) -> dict:
+        location = {
+            "latitude": float(params["latitude"]),
+            "longitude": float(params["longitude"]),
+        }
+        return self._message(params, location=location)
+
+    def _message(self, params: dict, **content: Any) -> dict:
+        chat_id = int(params.get("chat_id", 0))
+        message = {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private" if chat_id > 0 else "group"},
+            "from": BOT_USER,
+            **content,
+        }
+        if params.get("reply_markup"):
+            message["reply_markup"] = params["reply_markup"]
+        return message
+
+
+def _decode_params(form: Any) -> dict[str, Any]:
+    """aiogram sends scalars as plain strings and objects JSON-encoded."""
+    params: dict[str, Any] = {}
+    for key, value in form.items():
+        if isinstance(value, str) and value[:1] in ("{", "["):
+            with contextlib.suppress(json.JSONDecodeError):
+                value = json.loads(value)
+        params[key] = value
+    return params
+
+
+def _error(code: int, description: str, **extra: Any) -> web.Response:
+    return web.json_response(
+        {"ok": False, "error_code": code, "description": description, **extra},
+        status=code,
+    )
@@ -0,0 +1,72 @@
+"""Tests for the schema migration runner."""
+
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.db.migrations import MIGRATIONS, current_version, migrate
+
+LEGACY_SCHEMA = (
+    "CREATE TABLE users (telegram_id INTEGER PRIMARY KEY, access_token TEXT, "
+    "last_active_at TEXT, created_at TEXT)",
+    "CREATE TABLE oauth_states (state TEXT PRIMARY KEY, telegram_id INTEGER NOT NULL, "
+    "chat_id INTEGER NOT NULL, code_verifier TEXT NOT NULL, created_at TEXT)",
+    "CREATE TABLE notification_preferences (telegram_id INTEGER, event_type TEXT, "
+    "enabled INTEGER, PRIMARY KEY (telegram_id, event_type))",
+)
+
+
+async def _indexes(engine) -> set[str]:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_%'")
+        )
+        return set(result.scalars())
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_fresh_database_is_stamped(engine):
+    assert await migrate(engine) == []
+    assert await current_version(engine) == MIGRATIONS[-1].version
+    assert "ix_users_active" in await _indexes(engine)
+
+
+@pytest.mark.asyncio
+async def test_legacy_database_is_migrated_to_fresh_schema(engine):
+    async with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            await conn.execute(text(statement))
+
+    applied = await migrate(engine)
+
+    assert [m.version for m in applied] == [m.version for m in MIGRATIONS]
+    assert all(m.duration_ms >= 0 for m in applied)
+    assert await migrate(engine) == []
+
+    fresh = create_async_engine("sqlite+aiosqlite:///:memory:")
+    await migrate(fresh)
+    assert await _indexes(engine) == await _indexes(fresh)
+    await fresh.dispose()
+
+
+@pytest.mark.asyncio
+async def test_active_user_query_uses_partial_index(engine):
+    await migrate(engine)
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text("EXPLAIN QUERY PLAN SELECT * FROM users WHERE access_token IS NOT NULL")
+        )
+        plan = " ".join(row[-1] for row in result)
+    assert "ix_users_active" in plan
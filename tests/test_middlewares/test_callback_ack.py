@@ -0,0 +1,67 @@
+"""Tests for early callback acknowledgement."""
+
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from aiogram.types import CallbackQuery
+
+from bot.middlewares.callback_ack import CallbackAckMiddleware
+from bot.texts import fa
+
+
+def _callback(bot, query_id: str, data: str = "btn") -> CallbackQuery:
+    return CallbackQuery.model_validate(
+        {
+            "id": query_id,
+            "from": {"id": 7, "is_bot": False, "first_name": "A"},
+            "chat_instance": "ci",
+            "data": data,
+            "message": {
+                "message_id": 10,
+                "date": 0,
+                "chat": {"id": 7, "type": "private"},
+                "text": "menu",
+            },
+        }
+    ).as_(bot)
+
+
+def _answers(fake_telegram) -> list[str | None]:
+    return [c.params.get("text") for c in fake_telegram.calls_for("answerCallbackQuery")]
+
+
+@pytest.mark.asyncio
+async def test_slow_handler_is_acknowledged_early(fake_telegram, telegram_bot):
+    mw = CallbackAckMiddleware(delay=0.05)
+
+    async def slow(callback, data):
+        await asyncio.sleep(0.2)
+        await callback.answer("saved", show_alert=True)
+        return "done"
+
+    result = await mw(slow, _callback(telegram_bot, "q1"), {"bot": telegram_bot})
+
+    assert result == "done"
+    assert _answers(fake_telegram) == [fa.LOADING]
+    assert fake_telegram.count("sendChatAction") == 1
+    # The late alert cannot be shown as a toast any more, so it becomes a message
+    assert [c.params["text"] for c in fake_telegram.calls_for("sendMessage")] == ["saved"]
+    assert mw.early_acks == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_handler_answers_itself(fake_telegram, telegram_bot):
+    mw = CallbackAckMiddleware(delay=0.05)
+
+    async def fast(callback, data):
+        await callback.answer("ok")
+        await asyncio.sleep(0.1)
+
+    await mw(fast, _callback(telegram_bot, "q1"), {"bot": telegram_bot})
+    assert _answers(fake_telegram) == ["ok"]
+    assert fake_telegram.count("sendChatAction") == 0
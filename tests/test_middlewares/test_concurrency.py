@@ -0,0 +1,138 @@
+"""Tests for the update concurrency limiter."""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from aiogram.types import Update
+
+from bot.middlewares.concurrency import UpdateLimiter
+from bot.texts import fa
+
+
+def _update(chat_id: int, data: str | None = None) -> tuple[Update, dict]:
+    update = MagicMock(spec=Update)
+    update.message = None
+    update.callback_query = None
+    if data is not None:
+        update.callback_query = MagicMock()
+        update.callback_query.data = data
+        update.callback_query.message.message_id = 1
+        update.callback_query.answer = AsyncMock()
+    else:
+        update.message = MagicMock()
+        update.message.answer = AsyncMock()
+    chat = MagicMock()
+    chat.id = chat_id
+    return update, {"event_chat": chat}
+
+
+@pytest.mark.asyncio
+async def test_updates_of_one_chat_run_in_order_and_globally_capped():
+    limiter = UpdateLimiter(max_inflight=2, max_waiting=100, max_chat_queue=10)
+    log: list[tuple[str, int, int]] = []
+    running = peak = 0
+
+    async def handler(event, data):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        log.append(("start", data["event_chat"].id, data["n"]))
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    calls = []
+    for n in range(5):
+        for chat_id in (1, 2, 3):
+            update, data = _update(chat_id)
+            calls.append(limiter(handler, update, {**data, "n": n}))
+    await asyncio.gather(*calls)
+
+    assert peak == 2
+    for chat_id in (1, 2, 3):
+        assert [n for _, c, n in log if c == chat_id] == [0, 1, 2, 3, 4]
+    assert limiter.stats()["processed"] == 15
+    assert limiter.stats()["chats"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sheds_deep_chat_queues_and_duplicate_taps():
+    limiter = UpdateLimiter(max_inflight=4, max_waiting=100, max_chat_queue=2)
+    release = asyncio.Event()
+
+    async def wait(*_):
+        await release.wait()
+
+    handler = AsyncMock(side_effect=wait)
+
+    first, data = _update(1, data="refresh")
+    dup, _ = _update(1, data="refresh")
+    second, _ = _update(1)
+    third, _ = _update(1)
+    tasks = [asyncio.create_task(limiter(handler, first, data))]
+    await asyncio.sleep(0)
+    await limiter(handler, dup, data)
+    tasks.append(asyncio.create_task(limiter(handler, second, data)))
+    await asyncio.sleep(0)
+    await limiter(handler, third, data)
+
+    dup.callback_query.answer.assert_awaited_once_with(fa.CALLBACK_IN_PROGRESS, show_alert=False)
+    third.message.answer.assert_awaited_once_with(fa.BUSY)
+    assert limiter.stats()["waiting"] == 1
+    release.set()
+    await asyncio.gather(*tasks)
+    assert handler.await_count == 2
+    assert (limiter.shed, limiter.duplicates) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_sheds_when_global_queue_is_full():
+    limiter = UpdateLimiter(max_inflight=1, max_waiting=1, max_chat_queue=10)
+    release = asyncio.Event()
+
+    async def wait(*_):
+        await release.wait()
+
+    handler = AsyncMock(side_effect=wait)
+
+    tasks = []
+    for chat_id in (1, 2):
+        update, data = _update(chat_id)
+        tasks.append(asyncio.create_task(limiter(handler, update, data)))
+        await asyncio.sleep(0)
+    rejected, data = _update(3, data="menu")
+    await limiter(handler, rejected, data)
+    rejected.callback_query.answer.assert_awaited_once_with(fa.BUSY, show_alert=True)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert limiter.stats()["peak_waiting"] == 1
+
+
+@pytest.mark.asyncio
+async def test_detached_jobs_free_the_chat_slot():
+    limiter = UpdateLimiter(max_inflight=4, max_waiting=100, max_chat_queue=1)
+    finish = asyncio.Event()
+
+    async def long_job():
+        await finish.wait()
+
+    async def export(event, data):
+        limiter.detach(long_job(), name="export")
+
+    back = AsyncMock()
+    await limiter(export, *_update(1, "export"))
+    update, data = _update(1, "back")
+    await asyncio.wait_for(limiter(back, update, data), timeout=1)
+
+    back.assert_awaited_once()
+    update.callback_query.answer.assert_not_awaited()
+    assert limiter.stats()["detached"] == 1
+    finish.set()
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["detached"] == 0
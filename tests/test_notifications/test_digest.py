@@ -0,0 +1,70 @@
+"""Tests for notification digesting."""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.notifications.digest import MESSAGE_LIMIT, NotificationDigest, render_digest
+
+
+def test_window_lookup_prefers_exact_then_family():
+    d = NotificationDigest(5.0, {"search.error": 60.0})
+    assert d.window_for("search.error") == 60.0
+    assert d.window_for("search.started") == 5.0
+    assert d.window_for("rental.booked") == 0.0
+    assert d.window_for("search.completed") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_burst_is_sent_once_after_window():
+    bot = AsyncMock()
+    d = NotificationDigest(0.05)
+    await d.submit(bot, 1, "amin", "search.started", "a")
+    await d.submit(bot, 1, "amin", "optimization.swap", "b")
+    await d.submit(bot, 2, "amin", "search.started", "c")
+    bot.send_message.assert_not_awaited()
+
+    await asyncio.sleep(0.1)
+    assert bot.send_message.await_count == 2
+    texts = {call.args[0]: call.args[1] for call in bot.send_message.await_args_list}
+    assert "a" in texts[1] and "b" in texts[1]
+    assert texts[2] == "c"
+    assert d.pending_count == 0
+
+
+@pytest.mark.asyncio
+async def test_urgent_event_flushes_pending_immediately():
+    bot = AsyncMock()
+    d = NotificationDigest(30.0)
+    await d.submit(bot, 1, "amin", "search.started", "started")
+    await d.submit(bot, 1, "sanaz", "search.started", "other account")
+    await d.submit(bot, 1, "amin", "rental.booked", "booked")
+
+    bot.send_message.assert_awaited_once()
+    text = bot.send_message.await_args.args[1]
+    assert text.index("started") < text.index("booked")
+    assert d.pending_count == 1
+    await d.flush_all()
+    assert bot.send_message.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_shorter_window_pulls_deadline_forward():
+    bot = AsyncMock()
+    d = NotificationDigest(30.0, {"search.error": 0.05})
+    await d.submit(bot, 1, "amin", "search.started", "a")
+    await d.submit(bot, 1, "amin", "search.error", "b")
+    await asyncio.sleep(0.1)
+    bot.send_message.assert_awaited_once()
+
+
+def test_render_digest_splits_long_bursts():
+    chunks = render_digest(["x" * 1500] * 5)
+    assert len(chunks) > 1
+    assert all(len(c) <= MESSAGE_LIMIT for c in chunks)
+    assert render_digest(["only"]) == ["only"]
@@ -0,0 +1,169 @@
+"""Tests for notification fan-out, run against the fake Bot API server."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.db.models import NotificationPreference, User
+from bot.notifications.digest import digest
+from bot.notifications.dispatcher import dispatch_notification, format_event
+from bot.services.reachability import reachability
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    with patch("bot.notifications.dispatcher.async_session", factory):
+        yield factory
+
+
+async def _add_users(factory, users):
+    async with factory() as session:
+        session.add_all(users)
+        await session.commit()
+
+
+async def _dispatch(bot, event: dict) -> None:
+    await dispatch_notification(bot, event)
+    await digest.flush_all()
+
+
+def _user(telegram_id: int, accounts: str = '["amin"]', token: str | None = "t") -> User:
+    return User(telegram_id=telegram_id, access_token=token, accessible_accounts=accounts)
+
+
+def test_format_event_search_completed():
+    text = format_event(
+        "search.completed",
+        {"type": "search.completed", "data": {"account": "amin", "vehicle": {"model": "Rav4"}}},
+    )
+    assert "Rav4" in text
+
+
+@pytest.mark.asyncio
+async def test_dispatch_fans_out_to_account_holders(session_factory, fake_telegram, telegram_bot):
+    await _add_users(
+        session_factory,
+        [
+            _user(1),
+            _user(2, accounts='["amin", "sanaz"]'),
+            _user(3, accounts='["sanaz"]'),
+            _user(4, token=None),
+        ],
+    )
+
+    await _dispatch(telegram_bot, {"type": "search.started", "data": {"account": "amin"}})
+
+    sent = fake_telegram.calls_for("sendMessage", ok=True)
+    assert sorted(c.chat_id for c in sent) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_respects_disabled_preference(session_factory, fake_telegram, telegram_bot):
+    await _add_users(
+        session_factory,
+        [
+            _user(1),
+            _user(2),
+            NotificationPreference(telegram_id=2, event_type="search.started", enabled=0),
+        ],
+    )
+
+    await _dispatch(telegram_bot, {"type": "search.started", "data": {"account": "amin"}})
+
+    assert [c.chat_id for c in fake_telegram.calls_for("sendMessage")] == [1]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_survives_flood_control(session_factory, fake_telegram, telegram_bot):
+    await _add_users(session_factory, [_user(1), _user(2)])
+    fake_telegram.fail_next("sendMessage", retry_after=3)
+
+    await _dispatch(telegram_bot, {"type": "search.started", "data": {"account": "amin"}})
+
+    assert fake_telegram.count("sendMessage", ok=False) == 1
+    assert fake_telegram.count("sendMessage", ok=True) == 1
+
+
+@pytest.mark.asyncio
+async def test_blocked_users_are_recorded_and_skipped(session_factory, fake_telegram, telegram_bot):
+    await _add_users(session_factory, [_user(1), _user(2)])
+    fake_telegram.blocked_chats.add(2)
+    event = {"type": "search.started", "data": {"account": "amin"}}
+
+    with patch("bot.services.reachability.async_session", session_factory):
+        await _dispatch(telegram_bot, event)
+        assert 2 in reachability
+        async with session_factory() as session:
+            assert (await session.get(User, 2)).unreachable_since is not None
+
+        # The next events skip the chat without calling Telegram
+        await _dispatch(telegram_bot, event)
+        await _dispatch(telegram_bot, event)
+        assert fake_telegram.count("sendMessage", ok=False) == 1
+        assert fake_telegram.count("sendMessage", ok=True) == 3
+
+        # Writing to the bot again lifts the exclusion
+        await reachability.mark_reachable(2)
+        fake_telegram.blocked_chats.clear()
+        await _dispatch(telegram_bot, event)
+        assert [c.chat_id for c in fake_telegram.calls_for("sendMessage", ok=True)][-2:] == [1, 2]
+        await reachability.load()
+        assert reachability.count == 0
+
+
+@pytest.mark.asyncio
+async def test_fake_server_per_chat_flood_limit(fake_telegram, telegram_bot):
+    fake_telegram.per_chat_interval = 60.0
+
+    await telegram_bot.send_message(42, "first")
+    with pytest.raises(TelegramRetryAfter) as exc_info:
+        await telegram_bot.send_message(42, "second")
+    await telegram_bot.send_message(43, "other chat")
+
+    assert exc_info.value.retry_after == fake_telegram.retry_after
+    assert fake_telegram.count("sendMessage") == 2
+
+
+@pytest.mark.asyncio
+async def test_fake_server_round_trips_updates(fake_telegram, telegram_bot):
+    fake_telegram.push_update(
+        {
+            "callback_query": {
+                "id": "cb1",
+                "from": {"id": 7, "is_bot": False, "first_name": "U"},
+                "chat_instance": "x",
+                "data": "menu:main",
+            }
+        }
+    )
+
+    updates = await telegram_bot.get_updates(offset=0, timeout=0)
+    assert updates[0].callback_query.data == "menu:main"
+
+    await telegram_bot.answer_callback_query("cb1")
+    msg = await telegram_bot.send_location(7, latitude=45.5, longitude=-73.6)
+    assert msg.location.latitude == 45.5
+    edited = await telegram_bot.edit_message_text("new", chat_id=7, message_id=msg.message_id)
+    assert edited.message_id == msg.message_id
+    assert fake_telegram.count("answerCallbackQuery") == 1
+
+
+@pytest.mark.asyncio
+async def test_search_burst_is_digested_per_user(session_factory, fake_telegram, telegram_bot):
+    await _add_users(session_factory, [_user(1), _user(2)])
+
+    for event_type in ("search.started", "search.error", "search.error", "search.completed"):
+        await dispatch_notification(
+            telegram_bot, {"type": event_type, "data": {"account": "amin", "error": "x"}}
+        )
+
+    sent = fake_telegram.calls_for("sendMessage")
+    assert sorted(c.chat_id for c in sent) == [1, 2]
+    assert "4" in sent[0].params["text"]
@@ -0,0 +1,112 @@
+"""Tests for the concurrent multi-account overview."""
+
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services import account_overview
+from bot.services.api_client import APIError
+
+
+class FakeAPI:
+    def __init__(self, delays: dict[str, float] | None = None, token_id: str = "alice"):
+        self.delays = delays or {}
+        self.token_id = token_id
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _call(self, account: str, result: dict) -> dict:
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(account, 0.01))
+        finally:
+            self.in_flight -= 1
+        return result
+
+    async def get_current_rental(self, account):
+        await self._call(account, {})
+        raise APIError(404, "no rental")
+
+    async def get_search_status(self, account):
+        return await self._call(account, {"status": "running"})
+
+    async def get_optimization_status(self, account):
+        if account == "broken":
+            raise APIError(500, "boom")
+        return await self._call(account, {"status": "idle"})
+
+    async def get_next_free_time(self, account):
+        return await self._call(account, {"next_free_time": "18:00"})
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    account_overview._cache.clear()
+    yield
+    account_overview._cache.clear()
+
+
+async def _collect(api, accounts, concurrency=8):
+    return [s async for s in account_overview.iter_overview(api, accounts, concurrency)]
+
+
+@pytest.mark.asyncio
+async def test_accounts_yielded_in_completion_order():
+    api = FakeAPI(delays={"slow": 0.2, "fast": 0.01})
+
+    snapshots = await _collect(api, ["slow", "fast"])
+
+    assert [s.account for s in snapshots] == ["fast", "slow"]
+    assert snapshots[0].results["search"] == {"status": "running"}
+    assert snapshots[0].results["rental"] == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    api = FakeAPI()
+
+    await _collect(api, [f"acc{i}" for i in range(6)], concurrency=3)
+
+    assert api.calls == 24
+    assert api.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_are_reported_and_results_cached():
+    api = FakeAPI()
+
+    [snapshot] = await _collect(api, ["broken"])
+    assert snapshot.errors == {"optimization": "boom"}
+    assert set(snapshot.results) == {"rental", "search", "next_free"}
+
+    calls = api.calls
+    await _collect(api, ["broken"])
+    assert api.calls == calls  # only the failed call is retried, and it fails before _call
+
+
+@pytest.mark.asyncio
+async def test_cached_results_are_not_shared_between_callers():
+    alice, bob = FakeAPI(token_id="alice"), FakeAPI(token_id="bob")
+    await _collect(alice, ["amin"])
+    await _collect(bob, ["amin"])
+    assert bob.calls == alice.calls == 4
+
+
+def test_render_overview_marks_pending_accounts():
+    from bot.handlers.account import render_overview
+
+    snapshot = account_overview.AccountSnapshot(
+        "amin", results={"rental": {}, "search": {"status": "running"}}
+    )
+    text = render_overview(["amin", "sanaz"], {"amin": snapshot})
+
+    assert "(1/2)" in text
+    assert "running" in text
+    assert text.index("sanaz") > text.index("amin")
@@ -0,0 +1,116 @@
+"""Tests for the car-api request scheduler."""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services.api_client import CarAPI
+from bot.services.api_scheduler import (
+    ApiScheduler,
+    Lane,
+    account_of,
+    background_lane,
+    lane_for,
+)
+
+
+def test_lane_for_method_and_context():
+    assert lane_for("POST") is Lane.WRITE
+    assert lane_for("get") is Lane.READ
+    with background_lane():
+        assert lane_for("POST") is Lane.BACKGROUND
+    assert lane_for("DELETE") is Lane.WRITE
+
+
+def test_account_of():
+    assert account_of("/api/v1/accounts/acc-1/status") == "acc-1"
+    assert account_of("/api/v1/admin/dashboard") is None
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_granted_in_lane_order():
+    scheduler = ApiScheduler(global_rate=100, global_burst=1, account_rate=100, account_burst=10)
+    await scheduler.acquire(Lane.READ)  # drains the global bucket
+    order = []
+
+    async def call(lane):
+        await scheduler.acquire(lane)
+        order.append(lane)
+
+    tasks = [asyncio.create_task(call(lane)) for lane in (Lane.BACKGROUND, Lane.READ, Lane.WRITE)]
+    await asyncio.sleep(0)
+    assert scheduler.stats()["lanes"]["background"]["waiting"] == 1
+    await asyncio.gather(*tasks)
+    assert order == [Lane.WRITE, Lane.READ, Lane.BACKGROUND]
+    assert scheduler.lanes[Lane.WRITE].delayed == 1
+
+
+@pytest.mark.asyncio
+async def test_busy_account_does_not_block_others():
+    scheduler = ApiScheduler(global_rate=100, global_burst=10, account_rate=0.1, account_burst=1)
+    await scheduler.acquire(Lane.WRITE, "busy")
+    slow = asyncio.create_task(scheduler.acquire(Lane.WRITE, "busy"))
+    await asyncio.wait_for(scheduler.acquire(Lane.BACKGROUND, "other"), timeout=1)
+    assert not slow.done()
+    slow.cancel()
+    await asyncio.gather(slow, return_exceptions=True)
+    assert scheduler.stats()["lanes"]["write"]["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_throttle_pauses_account():
+    scheduler = ApiScheduler(global_rate=100, global_burst=10, account_rate=100, account_burst=10)
+    scheduler.throttle("acc", 0.05)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await scheduler.acquire(Lane.READ, "acc")
+    assert loop.time() - started >= 0.04
+    assert scheduler.stats()["throttled"] == 1
+
+
+def _response(status: int, content: bytes = b"", headers: dict | None = None) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = status
+    resp.content = content
+    resp.text = content.decode()
+    resp.headers = headers or {}
+    return resp
+
+
+@pytest.mark.asyncio
+async def test_car_api_retries_after_429():
+    scheduler = ApiScheduler(global_rate=100, global_burst=10, account_rate=100, account_burst=10)
+    responses = [_response(429, b"slow down", {"Retry-After": "0"}), _response(200, b'{"ok": 1}')]
+    with (
+        patch("bot.services.api_client.api_scheduler", scheduler),
+        patch("httpx.AsyncClient") as mock_client_cls,
+    ):
+        mock_client = AsyncMock()
+        mock_client.request = AsyncMock(side_effect=responses)
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=None)
+        mock_client_cls.return_value = mock_client
+
+        result = await CarAPI("token")._get("/api/v1/accounts/acc/status")
+
+    assert result == {"ok": 1}
+    assert mock_client.request.await_count == 2
+    assert scheduler.throttled == 1
+    assert scheduler.lanes[Lane.READ].granted == 2
+
+
+def test_refilled_buckets_are_pruned_and_paused_ones_kept():
+    scheduler = ApiScheduler(global_rate=100, global_burst=10, account_rate=1e6, account_burst=1)
+    with patch("bot.services.api_scheduler.MAX_ACCOUNTS", 3):
+        scheduler._prune_at = 3
+        for name in ("a", "b"):
+            scheduler._bucket(name).take()
+        scheduler.throttle("paused", 60)
+        scheduler._bucket("new")
+
+    assert set(scheduler._accounts) == {"paused", "new"}
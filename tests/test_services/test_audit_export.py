@@ -0,0 +1,121 @@
+"""Tests for the streaming audit export."""
+
+import asyncio
+import csv
+import gzip
+import json
+import os
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services import audit_export
+from bot.services.audit_export import ExportBusyError, export_audit_logs
+
+
+class FakeAuditAPI:
+    def __init__(self, count: int, report_total: bool = True):
+        self.count = count
+        self.report_total = report_total
+        self.in_flight = 0
+        self.peak = 0
+        self.offsets: list[int] = []
+
+    async def list_audit_logs(self, *, limit, offset, **filters):
+        self.offsets.append(offset)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        # Later pages answer faster, so completion order differs from page order
+        await asyncio.sleep(0.02 / (1 + offset // limit))
+        self.in_flight -= 1
+        logs = [
+            {"id": i, "action": filters.get("action"), "request_body": {"n": i}}
+            for i in range(offset, min(offset + limit, self.count))
+        ]
+        result = {"logs": logs}
+        if self.report_total:
+            result["total"] = self.count
+        return result
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("report_total", [True, False])
+async def test_jsonl_export_is_ordered_and_bounded(tmp_path, report_total):
+    api = FakeAuditAPI(1050, report_total)
+    seen = []
+
+    async def on_progress(progress):
+        seen.append(progress.rows)
+
+    path = tmp_path / "audit.jsonl.gz"
+    result = await export_audit_logs(
+        api, path, owner=1, filters={"action": "x"}, concurrency=3, on_progress=on_progress
+    )
+
+    with gzip.open(path, "rt") as f:
+        ids = [json.loads(line)["id"] for line in f]
+    assert ids == list(range(1050))
+    assert result.rows == 1050
+    assert seen == [200, 400, 600, 800, 1000, 1050]
+    assert api.peak <= 3
+    if report_total:
+        assert max(api.offsets) == 1000  # nothing requested past the reported total
+
+
+class GrowingAuditAPI:
+    """Newest-first list that gains an entry before every page fetch."""
+
+    def __init__(self, count: int):
+        self.entries = [
+            {"id": i, "timestamp": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}"}
+            for i in reversed(range(count))
+        ]
+
+    async def list_audit_logs(self, *, limit, offset, end_time=None, **filters):
+        self.entries.insert(
+            0, {"id": self.entries[0]["id"] + 1, "timestamp": "2026-01-01T01:00:00"}
+        )
+        matching = [e for e in self.entries if end_time is None or e["timestamp"] <= end_time]
+        await asyncio.sleep(0)
+        return {"logs": matching[offset : offset + limit], "total": len(matching)}
+
+
+@pytest.mark.asyncio
+async def test_export_window_ignores_entries_logged_meanwhile(tmp_path):
+    api = GrowingAuditAPI(450)
+    path = tmp_path / "audit.jsonl.gz"
+
+    result = await export_audit_logs(
+        api, path, owner=1, filters={"end_time": "2026-01-01T00:59:59"}, concurrency=1
+    )
+
+    with gzip.open(path, "rt") as f:
+        ids = [json.loads(line)["id"] for line in f]
+    assert ids == list(range(449, -1, -1))
+    assert result.rows == 450
+
+
+@pytest.mark.asyncio
+async def test_csv_export_respects_max_rows(tmp_path):
+    api = FakeAuditAPI(1000)
+    path = tmp_path / "audit.csv.gz"
+
+    result = await export_audit_logs(api, path, owner=1, fmt="csv", max_rows=250)
+
+    with gzip.open(path, "rt", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert result.rows == len(rows) == 250
+    assert json.loads(rows[3]["request_body"]) == {"n": 3}
+
+
+@pytest.mark.asyncio
+async def test_one_export_per_owner(tmp_path):
+    api = FakeAuditAPI(600)
+    first = asyncio.create_task(export_audit_logs(api, tmp_path / "a.gz", owner=7))
+    await asyncio.sleep(0)
+    with pytest.raises(ExportBusyError):
+        await export_audit_logs(api, tmp_path / "b.gz", owner=7)
+    await first
+    assert 7 not in audit_export._running
@@ -0,0 +1,120 @@
+"""Tests for the local audit log mirror."""
+
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.db.migrations import migrate
+from bot.services.audit_mirror import AuditFilters, AuditMirror, fts_query
+
+
+class FakeAuditAPI:
+    """Newest-first audit endpoint honouring start_time, end_time, limit and offset."""
+
+    def __init__(self, count: int):
+        self.logs: list[dict] = []
+        self.calls: list[dict] = []
+        self.add(count)
+
+    def add(self, count: int) -> None:
+        for _ in range(count):
+            i = len(self.logs) + 1
+            self.logs.append(
+                {
+                    "id": i,
+                    "user_account": "alice" if i % 2 else "bob",
+                    "action": "start_search" if i % 3 else "end_rental",
+                    "response_status": 500 if i % 10 == 0 else 200,
+                    "timestamp": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}",
+                    "request_body": {"note": "flat tire" if i == 42 else "ok"},
+                }
+            )
+
+    async def list_audit_logs(
+        self, *, start_time=None, end_time=None, limit=10, offset=0, **kwargs
+    ):
+        self.calls.append({"start_time": start_time, "offset": offset})
+        matching = [
+            log
+            for log in reversed(self.logs)
+            if (not start_time or log["timestamp"] >= start_time)
+            and (not end_time or log["timestamp"] <= end_time)
+        ]
+        return {"logs": matching[offset : offset + limit], "total": len(matching)}
+
+
+@pytest.fixture
+async def mirror():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    await migrate(engine)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with patch("bot.services.audit_mirror.async_session", factory):
+        yield AuditMirror(interval=60, max_rows=10_000)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_only_fetches_deltas(mirror):
+    api = FakeAuditAPI(250)
+    with patch("bot.services.audit_mirror.client_for_user", AsyncMock(return_value=api)):
+        assert await mirror.sync(1) == 250
+        assert len(api.calls) == 3
+
+        api.calls.clear()
+        api.add(5)
+        assert await mirror.sync(1) == 5
+        assert api.calls == [{"start_time": "2026-01-01T00:04:10", "offset": 0}]
+
+    logs, total = await mirror.query(1, AuditFilters(), limit=3)
+    assert total == 255
+    assert [log["id"] for log in logs] == [255, 254, 253]
+    # Other users have their own mirror
+    assert await mirror.query(2, AuditFilters(), limit=3) == ([], 0)
+
+
+@pytest.mark.asyncio
+async def test_bounded_syncs_fill_the_gap_they_leave(mirror):
+    mirror.max_rows = 100
+    api = FakeAuditAPI(250)
+    with patch("bot.services.audit_mirror.client_for_user", AsyncMock(return_value=api)):
+        # The newest entries come first, the older ones over later syncs
+        assert await mirror.sync(1) == 100
+        assert [log["id"] for log in (await mirror.query(1, AuditFilters(), limit=1))[0]] == [250]
+        added = [await mirror.sync(1) for _ in range(3)]
+        assert sum(added) == 150 and added[-1] == 0
+
+        # A burst larger than one sync, while nothing is left to backfill
+        api.add(180)
+        added = [await mirror.sync(1) for _ in range(3)]
+        assert added[0] == 100 and sum(added) == 180 and added[-1] == 0
+
+    logs, total = await mirror.query(1, AuditFilters(), limit=500)
+    assert total == 430
+    assert [log["id"] for log in logs] == list(range(430, 0, -1))
+
+
+@pytest.mark.asyncio
+async def test_filters_and_full_text_search(mirror):
+    api = FakeAuditAPI(60)
+    with patch("bot.services.audit_mirror.client_for_user", AsyncMock(return_value=api)):
+        await mirror.sync(1)
+
+    _, total = await mirror.query(1, AuditFilters(account="bob", status_class=5), limit=10)
+    assert total == 6
+    _, total = await mirror.query(1, AuditFilters(action="end_rental"), limit=10)
+    assert total == 20
+
+    logs, total = await mirror.query(1, AuditFilters(text="flat"), limit=10)
+    assert (total, logs[0]["id"]) == (1, 42)
+    # Quotes in user input are escaped rather than parsed
+    assert await mirror.query(1, AuditFilters(text='tire" OR "ok'), limit=10) == ([], 0)
+    assert fts_query('a "b') == '"a"* """b"*'
+
+    assert (await mirror.get(1, 42))["request_body"]["note"] == "flat tire"
+    assert await mirror.get(2, 42) is None
+    assert await mirror.top_actions(1) == ["start_search", "end_rental"]
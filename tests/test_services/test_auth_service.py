@@ -1,11 +1,40 @@
 """Tests for auth service."""
 
 import os
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 os.environ.setdefault("BOT_TOKEN", "test:token")
 os.environ.setdefault("DATABASE_PATH", ":memory:")
 
-from bot.services.auth_service import build_authorize_url, generate_pkce
+from bot.db.models import OAuthState
+from bot.services.auth_service import (
+    _lookup_login,
+    _sqlite_timestamp,
+    build_authorize_url,
+    create_login_state,
+    generate_pkce,
+    pending_logins,
+    purge_expired_states,
+)
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    pending_logins.clear()
+    with patch("bot.services.auth_service.async_session", factory):
+        yield factory
+    pending_logins.clear()
+
+
+async def _count_states(factory) -> int:
+    async with factory() as session:
+        return await session.scalar(select(func.count()).select_from(OAuthState))
 
 
 def test_generate_pkce():
@@ -21,3 +50,38 @@ def test_build_authorize_url():
     assert "test-challenge" in url
     assert "response_type=code" in url
     assert "code_challenge_method=S256" in url
+
+
+@pytest.mark.asyncio
+async def test_repeated_login_reuses_pending_state(session_factory):
+    first = await create_login_state(1, 1)
+    second = await create_login_state(1, 1)
+    other = await create_login_state(2, 2)
+
+    assert first == second
+    assert other != first
+    assert await _count_states(session_factory) == 2
+
+
+@pytest.mark.asyncio
+async def test_pending_state_reused_after_restart(session_factory):
+    first = await create_login_state(1, 1)
+    pending_logins.clear()
+
+    assert await create_login_state(1, 1) == first
+    assert await _count_states(session_factory) == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_states_are_rejected_and_purged(session_factory):
+    old = _sqlite_timestamp(time.time() - 3600)
+    async with session_factory() as session:
+        session.add(
+            OAuthState(state="old", telegram_id=1, chat_id=1, code_verifier="v", created_at=old)
+        )
+        await session.commit()
+    await create_login_state(2, 2)
+
+    assert await _lookup_login("old") is None
+    assert await purge_expired_states() == 1
+    assert await _count_states(session_factory) == 1
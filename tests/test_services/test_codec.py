@@ -0,0 +1,55 @@
+"""Tests for the JSON codec layer."""
+
+import json
+import os
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services import codec
+
+PAYLOAD = {"type": "search.completed", "data": {"account": "امین", "score": 87.5, "ids": [1, 2]}}
+
+
+def _available_backends():
+    names = []
+    for name in codec.BACKENDS:
+        try:
+            codec.get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+@pytest.mark.parametrize("name", _available_backends())
+def test_backend_round_trip(name):
+    backend = codec.get_backend(name)
+    encoded = backend.dumps(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert "امین".encode() in encoded  # non-ASCII is not escaped
+    assert backend.loads(encoded) == PAYLOAD
+    assert json.loads(backend.dumps_pretty(PAYLOAD)) == PAYLOAD
+    assert b"\n  " in backend.dumps_pretty(PAYLOAD)
+
+
+def test_auto_falls_back_to_available_backend():
+    assert codec.get_backend("auto").name in codec.BACKENDS
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        codec.get_backend("simdjson")
+
+
+def test_decode_error_is_uniform():
+    with pytest.raises(codec.DecodeError):
+        codec.loads(b"{not json")
+    assert isinstance(codec.DecodeError("x"), ValueError)
+
+
+def test_dumps_str_and_pretty():
+    assert codec.loads(codec.dumps_str(PAYLOAD)) == PAYLOAD
+    assert codec.dumps_pretty({"a": 1}).startswith("{\n")
@@ -0,0 +1,115 @@
+"""Tests for database maintenance."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.config import settings
+from bot.db.migrations import migrate
+from bot.db.models import AuditLogEntry, NotificationPreference, User
+from bot.services import db_maintenance
+
+
+@pytest.fixture
+async def database(tmp_path, monkeypatch):
+    path = tmp_path / "bot.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    await migrate(engine)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(settings, "database_path", str(path))
+    with (
+        patch("bot.services.db_maintenance.engine", engine),
+        patch("bot.services.db_maintenance.async_session", factory),
+        patch("bot.services.auth_service.async_session", factory),
+    ):
+        yield factory
+    await engine.dispose()
+
+
+async def _seed(factory):
+    async with factory() as session:
+        session.add_all(
+            [
+                User(telegram_id=1, access_token="t", last_active_at="2020-01-01T00:00:00"),
+                User(telegram_id=2, access_token=None, last_active_at="2020-01-01T00:00:00"),
+                User(telegram_id=3, access_token=None, last_active_at="2999-01-01T00:00:00"),
+                NotificationPreference(telegram_id=1, event_type="search.error", enabled=0),
+                NotificationPreference(telegram_id=99, event_type="search.error", enabled=0),
+                AuditLogEntry(owner_id=1, log_id=1, data="{}"),
+                AuditLogEntry(owner_id=3, log_id=1, data="{}"),
+            ]
+        )
+        await session.commit()
+        # Bulk data that leaves free pages behind once deleted
+        await session.execute(text("CREATE TABLE scratch (blob TEXT)"))
+        for _ in range(200):
+            await session.execute(text("INSERT INTO scratch VALUES (:b)"), {"b": "x" * 4000})
+        await session.execute(text("DROP TABLE scratch"))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_maintenance_prunes_analyzes_and_vacuums(database):
+    await _seed(database)
+
+    report = await db_maintenance.run_maintenance(budget=10)
+
+    assert report.pruned == {
+        "users": 1,
+        "notification_preferences": 1,
+        "audit_logs": 1,
+        "audit_sync_cursors": 0,
+        "oauth_states": 0,
+    }
+    assert report.analyzed
+    assert report.skipped == []
+    assert report.before.freelist_count > 0
+    assert report.after.freelist_count == 0
+    assert report.after.auto_vacuum == "incremental"
+    assert report.reclaimed_bytes > 0
+    assert db_maintenance.last_report is report
+
+    async with database() as session:
+        remaining = (await session.execute(select(User.telegram_id))).scalars().all()
+    assert sorted(remaining) == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_maintenance_respects_budget(database):
+    await _seed(database)
+
+    report = await db_maintenance.run_maintenance(budget=0)
+
+    assert report.skipped == ["prune", "analyze", "vacuum"]
+    assert report.after.rows["users"] == 3
+
+
+@pytest.mark.asyncio
+async def test_incremental_vacuum_after_conversion(database):
+    await db_maintenance.run_maintenance(budget=10)
+    await _seed(database)
+
+    report = await db_maintenance.run_maintenance(budget=10)
+
+    assert report.before.auto_vacuum == "incremental"
+    assert report.vacuumed_pages >= report.before.freelist_count > 0
+    assert report.after.freelist_count == 0
+
+
+@pytest.mark.asyncio
+async def test_full_vacuum_skipped_without_disk_room(database):
+    await _seed(database)
+
+    with patch("bot.services.db_maintenance.shutil.disk_usage") as disk_usage:
+        disk_usage.return_value.free = 0
+        report = await db_maintenance.run_maintenance(budget=10)
+
+    assert report.skipped == ["vacuum"]
+    assert report.vacuumed_pages == 0
+    assert report.after.auto_vacuum == "none"
@@ -0,0 +1,141 @@
+"""Tests for the fleet spatial and facet index."""
+
+import asyncio
+import os
+import random
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services.fleet import FleetCache, FleetIndex, haversine_km, iter_rows
+
+MONTREAL = (45.5017, -73.5673)
+
+
+def _vehicles(n: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "vehicleId": i,
+            "model": "Corolla",
+            "currentVehicleLocation": {
+                "latitude": MONTREAL[0] + rng.uniform(-0.1, 0.1),
+                "longitude": MONTREAL[1] + rng.uniform(-0.1, 0.1),
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def test_haversine_known_distance():
+    # Montreal to Quebec City is roughly 233km
+    assert 225 < haversine_km(*MONTREAL, 46.8139, -71.2080) < 240
+
+
+@pytest.mark.parametrize("radius_km", [0.3, 1.0, 2.5, 7.0, 40.0])
+def test_nearest_matches_brute_force(radius_km):
+    vehicles = _vehicles(500)
+    index = FleetIndex(vehicles)
+    lat, lng = MONTREAL
+
+    distances = []
+    for v in vehicles:
+        loc = v["currentVehicleLocation"]
+        distances.append(
+            (haversine_km(lat, lng, loc["latitude"], loc["longitude"]), v["vehicleId"])
+        )
+    expected = [vid for dist, vid in sorted(distances) if dist <= radius_km]
+
+    nearest = index.nearest(lat, lng, radius_km, limit=10)
+    assert [n.vehicle["vehicleId"] for n in nearest] == expected[:10]
+    assert index.count_within(lat, lng, radius_km) == len(expected)
+
+
+def test_huge_radius_scans_occupied_cells():
+    index = FleetIndex(_vehicles(200))
+    assert index.count_within(*MONTREAL, 1e17) == 200
+
+
+def test_vehicles_without_location_are_skipped():
+    index = FleetIndex([{"vehicleId": 1}, {"vehicleId": 2, "currentVehicleLocation": None}])
+    assert len(index) == 0
+    assert index.nearest(*MONTREAL, 5) == []
+
+
+def _faceted(n: int) -> list[dict]:
+    rng = random.Random(7)
+    vehicles = _vehicles(n)
+    for v in vehicles:
+        v["model"] = rng.choice(["Corolla", "Prius C", "Kona EV"])
+        v["vehiclePropulsionTypeId"] = 2 if v["model"] == "Kona EV" else rng.choice([1, 3])
+        v["energyLevelPercentage"] = rng.randint(0, 100)
+        v["promotions"] = [{"name": "Pneus d'hiver"}] if rng.random() < 0.3 else []
+    return vehicles
+
+
+@pytest.mark.parametrize(
+    "facets",
+    [
+        ["ev"],
+        ["-prius"],
+        ["snow", "-ev"],
+        ["hybrid", "charged", "model:Prius C"],
+        ["-prius", "-ev"],
+    ],
+)
+def test_facet_masks_match_brute_force(facets):
+    vehicles = _faceted(300)
+    index = FleetIndex(vehicles)
+
+    def matches(v, facet):
+        return {
+            "ev": v["vehiclePropulsionTypeId"] == 2,
+            "hybrid": v["vehiclePropulsionTypeId"] == 3,
+            "prius": "prius" in v["model"].lower(),
+            "snow": bool(v["promotions"]),
+            "charged": v["energyLevelPercentage"] >= 50,
+        }.get(facet, v["model"] == facet.removeprefix("model:"))
+
+    def keep(v, facet):
+        if facet.startswith("-"):
+            return not matches(v, facet[1:])
+        return matches(v, facet)
+
+    expected = [v["vehicleId"] for v in vehicles if all(keep(v, f) for f in facets)]
+    mask = index.mask(facets)
+    assert mask.bit_count() == len(expected)
+    assert [v["vehicleId"] for v in index.rows(mask)] == expected
+    assert [v["vehicleId"] for v in index.rows(mask, 2, 3)] == expected[2:5]
+
+
+def test_search_filters_narrow_radius_counts():
+    index = FleetIndex(_faceted(300))
+    everything = index.count_within(*MONTREAL, 20)
+    mask = index.search_filter_mask({"no_prius": True, "no_ev": True, "snow_car": False})
+    filtered = index.count_within(*MONTREAL, 20, mask)
+
+    assert mask == index.mask(["-prius", "-ev"])
+    assert 0 < filtered < everything
+    assert all(
+        "prius" not in n.vehicle["model"].lower() and n.vehicle["vehiclePropulsionTypeId"] != 2
+        for n in index.nearest(*MONTREAL, 20, limit=50, mask=mask)
+    )
+    assert index.models == ["Corolla", "Kona EV", "Prius C"]
+    assert list(iter_rows(0b10110)) == [1, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_cache_refreshes_in_background():
+    api = AsyncMock()
+    api.list_vehicles.return_value = {"vehicles": _vehicles(20)}
+    cache = FleetCache(max_age=60)
+
+    with patch("bot.services.fleet.client_for_user", AsyncMock(return_value=api)):
+        assert len(cache.touch(1)) == 0  # returns immediately with the empty index
+        await asyncio.sleep(0.05)
+        assert cache.ready
+        assert len(cache.touch(1)) == 20
+    api.list_vehicles.assert_awaited_once()
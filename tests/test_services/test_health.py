@@ -0,0 +1,88 @@
+"""Tests for loop-lag monitoring and readiness evaluation."""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services import health
+from bot.services.health import DependencyChecks, LoopLagMonitor, percentile
+from bot.web.server import create_app
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_monitor_detects_blocked_loop():
+    monitor = LoopLagMonitor(interval=0.02, slow_callback_ms=50)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)  # block the loop
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    stats = monitor.stats()
+    assert stats["max_ms"] >= 100
+    assert stats["slow_callbacks"] >= 1
+
+
+def test_monitor_requires_sustained_lag():
+    monitor = LoopLagMonitor(interval=0.5, slow_callback_ms=100)
+    monitor._lags.extend([1.0] * 10 + [900.0])
+    assert not monitor.is_lagging(500)
+    monitor._lags.extend([900.0] * 15)
+    assert monitor.is_lagging(500)
+
+
+@pytest.mark.asyncio
+async def test_dependency_checks_cache_failures():
+    checks = DependencyChecks(interval=10)
+    with (
+        patch.object(DependencyChecks, "_check_database", AsyncMock()),
+        patch.object(
+            DependencyChecks, "_check_car_api", AsyncMock(side_effect=ConnectionError("down"))
+        ),
+    ):
+        await checks.refresh()
+
+    assert checks.results["database"].ok
+    assert not checks.results["car_api"].ok
+    assert "down" in checks.results["car_api"].error
+    assert checks.is_fresh("database")
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoint_reflects_cached_state():
+    checks = DependencyChecks(interval=10)
+    with (
+        patch.object(health, "dependency_checks", checks),
+        patch.object(health, "loop_monitor", LoopLagMonitor(0.5, 100)),
+    ):
+        app = create_app(bot=AsyncMock())
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.get("/ready")
+            assert resp.status == 503
+
+            with patch.object(DependencyChecks, "_check_car_api", AsyncMock()):
+                await checks.refresh()
+            resp = await client.get("/ready")
+            assert resp.status == 200
+            data = await resp.json()
+            assert data["status"] == "ready"
+
+            # Liveness stays independent of dependencies
+            resp = await client.get("/health")
+            assert resp.status == 200
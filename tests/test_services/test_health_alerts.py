@@ -0,0 +1,82 @@
+"""Tests for admin health alerts."""
+
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services.api_client import APIError
+from bot.services.health_alerts import HealthAlerts, default_rules, render
+
+
+def _snapshot(status="healthy", agents=3, blocked=0) -> dict:
+    return {
+        "health": {"status": status},
+        "dispatcher": {"status": "healthy", "active_agents": agents},
+        "ipv6": {"blocked_ips": blocked},
+    }
+
+
+def _fired(transitions) -> list[tuple[str, bool]]:
+    return [(t.rule, t.fired) for t in transitions]
+
+
+def test_hysteresis_needs_consecutive_polls_and_a_clear_band():
+    alerts = HealthAlerts(default_rules(), confirm_polls=2)
+
+    # A single bad poll is not enough
+    assert alerts.evaluate(_snapshot(status="degraded")) == []
+    assert alerts.evaluate(_snapshot()) == []
+    assert alerts.evaluate(_snapshot(status="degraded")) == []
+    assert _fired(alerts.evaluate(_snapshot(status="unhealthy"), now=100)) == [("health", True)]
+    # Still firing: no repeat notifications
+    assert alerts.evaluate(_snapshot(status="unhealthy")) == []
+    assert alerts.evaluate(_snapshot()) == []
+    resolved = alerts.evaluate(_snapshot(), now=400)
+    assert _fired(resolved) == [("health", False)]
+    assert resolved[0].lasted == 300
+
+    # Blocked IPs fire at 50 but only clear below 40
+    for _ in range(2):
+        transitions = alerts.evaluate(_snapshot(blocked=55))
+    assert ("blocked_ips", True) in _fired(transitions)
+    for _ in range(3):
+        assert ("blocked_ips", False) not in _fired(alerts.evaluate(_snapshot(blocked=45)))
+    alerts.evaluate(_snapshot(blocked=30))
+    assert ("blocked_ips", False) in _fired(alerts.evaluate(_snapshot(blocked=30)))
+
+
+def test_missing_sources_keep_state_and_spikes_are_detected():
+    alerts = HealthAlerts(default_rules(), confirm_polls=1)
+    assert _fired(alerts.evaluate(_snapshot(agents=0))) == [("agents", True)]
+    # Dispatcher unreachable: the agents alert neither resolves nor repeats
+    assert alerts.evaluate({**_snapshot(), "dispatcher": None}) == []
+    assert [r.name for r in alerts.firing] == ["agents"]
+
+    alerts = HealthAlerts(default_rules(), confirm_polls=1)
+    alerts.evaluate(_snapshot(blocked=2))
+    assert _fired(alerts.evaluate(_snapshot(blocked=15))) == [("blocked_spike", True)]
+    text = render(alerts.evaluate({**_snapshot(blocked=15), "health": None}))
+    assert "🔴" in text
+
+
+@pytest.mark.asyncio
+async def test_poll_sends_one_message_per_admin(mock_bot):
+    api = AsyncMock()
+    api.health_detail.side_effect = APIError(503, "down")
+    api.get_dispatcher_health.return_value = {"status": "healthy", "active_agents": 2}
+    api.get_ipv6_statistics.return_value = {"blocked_ips": 1}
+    alerts = HealthAlerts(default_rules(), confirm_polls=1)
+
+    with (
+        patch("bot.services.health_alerts.admin_client", AsyncMock(return_value=api)),
+        patch("bot.services.health_alerts.admin_ids", AsyncMock(return_value=[1, 2])),
+    ):
+        transitions = await alerts.poll(mock_bot)
+        assert _fired(transitions) == [("backend", True)]
+        assert mock_bot.send_message.await_count == 2
+        await alerts.poll(mock_bot)
+        assert mock_bot.send_message.await_count == 2
@@ -0,0 +1,68 @@
+"""Tests for the admin metrics sampler."""
+
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services.metrics_sampler import MetricSampler, sparkline
+
+
+def _dashboard(agents: int, droplets: int = 3) -> dict:
+    return {
+        "coordinator": {"active_agents": agents},
+        "droplets": {"total": droplets, "estimated_cost_per_hour_cents": droplets * 2},
+        "ipv6_pool": {"blocked_ips": 1, "average_latency_ms": "n/a"},
+    }
+
+
+def test_ring_buffer_keeps_constant_size_and_windows():
+    sampler = MetricSampler(interval=60)
+    start = 1_000_000.0
+    # Two days of samples wrap the 24h buffer
+    for i in range(2 * 1440):
+        sampler.record(_dashboard(agents=i % 10), {"active_searches": i}, at=start + 60 * i)
+    now = start + 60 * (2 * 1440 - 1)
+
+    assert sampler._size == sampler.capacity == 1441
+    assert all(len(values) == 1441 for values in sampler._values.values())
+
+    hour = sampler.trend("active_searches", 3600, now)
+    assert (hour.samples, hour.current, hour.delta) == (61, 2879, 60)
+    day = sampler.trend("active_searches", 86400, now)
+    assert (day.minimum, day.maximum) == (2879 - 1440, 2879)
+    assert sampler.trend("active_agents", 3600, now).maximum == 9
+    # Non-numeric values are gaps, not zeros
+    assert sampler.trend("avg_latency_ms", 3600, now) is None
+
+
+def test_render_and_sparkline():
+    assert sparkline([1, 2, 3, 4, 5, 6, 7, 8]) == "▁▂▃▄▅▆▇█"
+    assert sparkline([5, 5, 5]) == "▁▁▁"
+    assert len(sparkline(list(range(1000)))) == 24
+
+    sampler = MetricSampler(interval=60)
+    assert sampler.render(["droplets"], now=0) == ""
+    sampler.record(_dashboard(4, droplets=2), {}, at=100)
+    sampler.record(_dashboard(4, droplets=5), {}, at=160)
+    text = sampler.render(["droplets", "active_searches"], now=160)
+    assert "1h: ▁█ Δ+3 (2–5)" in text
+    assert "24h" in text
+
+
+@pytest.mark.asyncio
+async def test_sample_uses_an_admin_token():
+    api = AsyncMock()
+    api.get_dashboard.return_value = _dashboard(7)
+    api.health_detail.return_value = {"active_searches": 2}
+    sampler = MetricSampler(interval=60)
+    with patch("bot.services.metrics_sampler.admin_client", AsyncMock(return_value=api)):
+        await sampler.sample()
+    assert sampler.trend("active_agents", 60).current == 7
+
+    with patch("bot.services.metrics_sampler.admin_client", AsyncMock(return_value=None)):
+        await sampler.sample()
+    assert sampler._size == 1
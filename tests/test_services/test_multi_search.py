@@ -0,0 +1,123 @@
+"""Tests for multi-account search orchestration."""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services.api_client import APIError
+from bot.services.multi_search import FAILED, RUNNING, STOPPED, WON, MultiSearchRegistry
+
+
+class FakeAPI:
+    def __init__(self, failing_start=(), already_stopped=()):
+        self.failing_start = set(failing_start)
+        self.already_stopped = set(already_stopped)
+        self.started: list[str] = []
+        self.stopped: list[str] = []
+
+    async def start_search(self, account, params):
+        await asyncio.sleep(0.01)
+        if account in self.failing_start:
+            raise APIError(409, "busy")
+        self.started.append(account)
+        return {"status": "running", "search_id": f"s-{account}"}
+
+    async def stop_search(self, account):
+        await asyncio.sleep(0.01)
+        if account in self.already_stopped:
+            raise APIError(404, "no search")
+        self.stopped.append(account)
+        return {}
+
+
+@pytest.fixture
+def api():
+    api = FakeAPI()
+    with patch("bot.services.multi_search.client_for_user", AsyncMock(return_value=api)):
+        yield api
+
+
+async def _start(registry, bot, api, accounts):
+    return await registry.start(bot, api, 1, 1, 10, accounts, {"radius": 1})
+
+
+@pytest.mark.asyncio
+async def test_first_completion_stops_the_rest(api, mock_bot):
+    registry = MultiSearchRegistry()
+    search = await _start(registry, mock_bot, api, ["a", "b", "c"])
+    assert search.states == {"a": RUNNING, "b": RUNNING, "c": RUNNING}
+
+    handled = await registry.handle_event(
+        mock_bot, "search.completed", "b", {"vehicle": {"model": "Rav4", "vehicle_nb": 7}}
+    )
+
+    assert handled
+    assert sorted(api.stopped) == ["a", "c"]
+    assert search.states == {"a": STOPPED, "b": WON, "c": STOPPED}
+    assert search.finished
+    assert registry.get(search.id) is None
+    assert "Rav4 #7" in mock_bot.edit_message_text.call_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_failed_starts_and_missing_searches(api, mock_bot):
+    api.failing_start = {"b"}
+    api.already_stopped = {"c"}
+    registry = MultiSearchRegistry()
+    search = await _start(registry, mock_bot, api, ["a", "b", "c"])
+    assert search.states["b"] == FAILED
+    assert search.errors["b"] == "busy"
+
+    await registry.handle_event(mock_bot, "search.completed", "a", {})
+
+    assert api.stopped == []
+    assert search.states == {"a": WON, "b": FAILED, "c": STOPPED}
+
+
+@pytest.mark.asyncio
+async def test_stop_all_and_unrelated_events(api, mock_bot):
+    registry = MultiSearchRegistry()
+    search = await _start(registry, mock_bot, api, ["a", "b"])
+
+    assert not await registry.handle_event(mock_bot, "search.completed", "zzz", {})
+    await registry.handle_event(mock_bot, "search.error", "a", {"error": "boom"})
+    await registry.stop_all(mock_bot, search)
+
+    assert api.stopped == ["b"]
+    assert search.states == {"a": FAILED, "b": STOPPED}
+    assert search.winner is None
+    assert registry.get(search.id) is None
+
+
+@pytest.mark.asyncio
+async def test_events_of_other_searches_are_ignored(api, mock_bot):
+    registry = MultiSearchRegistry()
+    search = await _start(registry, mock_bot, api, ["a", "b"])
+
+    foreign = {"search_id": "someone-else"}
+    assert not await registry.handle_event(mock_bot, "search.completed", "a", foreign)
+    assert search.states == {"a": RUNNING, "b": RUNNING}
+    assert api.stopped == []
+
+    assert await registry.handle_event(mock_bot, "search.completed", "a", {"search_id": "s-a"})
+    assert search.winner == "a"
+
+
+@pytest.mark.asyncio
+async def test_takeover_and_expiry_drop_old_searches(api, mock_bot):
+    registry = MultiSearchRegistry(max_age=60)
+    old = await _start(registry, mock_bot, api, ["a", "b"])
+    new = await _start(registry, mock_bot, api, ["b"])
+    assert old.states == {"a": RUNNING, "b": STOPPED}
+
+    await registry.release(mock_bot, "a")  # a single search started on "a"
+    assert old.finished and registry.get(old.id) is None
+
+    new.started_at -= 120
+    assert not await registry.handle_event(mock_bot, "search.completed", "b", {})
+    assert registry.get(new.id) is None
@@ -0,0 +1,112 @@
+"""Tests for the prefetching paginator."""
+
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services.paginator import Paginator
+
+
+class FakeList:
+    """Remote list with skip/limit paging, newest first unless ``ascending``."""
+
+    def __init__(self, count: int, ascending: bool = False):
+        self.ascending = ascending
+        self.ids = list(range(1, count + 1)) if ascending else list(range(count, 0, -1))
+        self.calls: list[int] = []
+
+    async def fetch(self, api, skip: int, limit: int):
+        self.calls.append(skip)
+        await asyncio.sleep(0.01)
+        return [{"id": i} for i in self.ids[skip : skip + limit]], len(self.ids)
+
+    def add(self, count: int) -> None:
+        if self.ascending:
+            top = self.ids[-1] if self.ids else 0
+            self.ids.extend(range(top + 1, top + count + 1))
+            return
+        top = self.ids[0] if self.ids else 0
+        self.ids[:0] = list(range(top + count, top, -1))
+
+
+def _ids(page):
+    return [item["id"] for item in page.items]
+
+
+@pytest.mark.asyncio
+async def test_next_page_is_prefetched_and_cached():
+    remote = FakeList(23)
+    pages = Paginator(remote.fetch, per_page=5, ttl=60)
+
+    first = await pages.page(1, None, 0)
+    assert (_ids(first), first.total_pages) == ([23, 22, 21, 20, 19], 5)
+    await asyncio.sleep(0.03)  # prefetch of page 1 lands
+    assert remote.calls == [0, 5]
+
+    second = await pages.page(1, None, 1)
+    assert _ids(second) == [18, 17, 16, 15, 14]
+    assert pages.hits == 1
+    # Going back is served from the LRU too
+    await pages.page(1, None, 0)
+    assert pages.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_pages_stay_anchored_when_entries_arrive():
+    remote = FakeList(12)
+    pages = Paginator(remote.fetch, per_page=5, ttl=60)
+    await pages.page(1, None, 0)
+    pages.invalidate(2)  # unrelated user
+
+    remote.add(3)  # 15..13 appear on top before the user pages
+    await asyncio.sleep(0.03)
+    second = await pages.page(1, None, 1)
+    third = await pages.page(1, None, 2)
+    assert _ids(second) == [7, 6, 5, 4, 3]
+    assert _ids(third) == [2, 1]
+
+    fresh = await pages.page(1, None, 0, restart=True)
+    assert _ids(fresh)[0] == 15
+    assert fresh.total == 15
+
+
+@pytest.mark.asyncio
+async def test_oldest_first_list_pages_past_the_first():
+    remote = FakeList(12, ascending=True)
+    pages = Paginator(remote.fetch, per_page=5, ttl=60)
+    first = await pages.page(1, None, 0)
+    assert _ids(first) == [1, 2, 3, 4, 5]
+
+    remote.add(4)  # 13..16 are appended while the user pages
+    second = await pages.page(1, None, 1)
+    third = await pages.page(1, None, 2)
+    assert _ids(second) == [6, 7, 8, 9, 10]
+    assert _ids(third) == [11, 12]
+    assert third.total_pages == 3
+
+
+@pytest.mark.asyncio
+async def test_page_request_joins_inflight_prefetch():
+    remote = FakeList(10)
+    pages = Paginator(remote.fetch, per_page=5, ttl=60)
+    await pages.page(1, None, 0)
+    # The prefetch for page 1 is still running; asking for it must not refetch
+    await pages.page(1, None, 1)
+    assert remote.calls == [0, 5]
+
+
+@pytest.mark.asyncio
+async def test_page_survives_invalidate_while_loading():
+    remote = FakeList(23)
+    pages = Paginator(remote.fetch, per_page=5, ttl=60)
+    await pages.page(1, None, 0)
+
+    loading = asyncio.create_task(pages.page(1, None, 3))
+    await asyncio.sleep(0)
+    pages.invalidate(1)  # e.g. the user changed the list from another message
+
+    assert _ids(await loading) == [8, 7, 6, 5, 4]
@@ -0,0 +1,76 @@
+"""Tests for the on-demand profiler."""
+
+import asyncio
+import os
+import pstats
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services import profiler
+
+
+def _busy_work(deadline: float) -> int:
+    n = 0
+    loop = asyncio.get_running_loop()
+    while loop.time() < deadline:
+        n += sum(range(200))
+    return n
+
+
+async def _busy_task(seconds: float) -> None:
+    loop = asyncio.get_running_loop()
+    end = loop.time() + seconds
+    while loop.time() < end:
+        _busy_work(loop.time() + 0.05)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_sample_capture_sees_busy_coroutine():
+    task = asyncio.create_task(_busy_task(0.5))
+    result = await profiler.capture(0.3, "sample")
+    await task
+
+    assert result.samples > 0
+    assert "_busy_work" in result.collapsed
+    name, content = result.profile_file()
+    assert name.endswith(".collapsed.txt")
+    assert content
+    assert result.allocations[0].startswith("Total traced")
+
+
+@pytest.mark.asyncio
+async def test_cprofile_capture_produces_loadable_stats():
+    task = asyncio.create_task(_busy_task(0.3))
+    result = await profiler.capture(0.2, "cprofile")
+    await task
+
+    name, content = result.profile_file()
+    assert name.endswith(".pstats")
+    stats = pstats.Stats(profiler._MarshalledStats(content))
+    assert any(func[2] == "_busy_work" for func in stats.stats)
+    assert "_busy_work" in result.summary()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_capture_is_rejected():
+    first = asyncio.create_task(profiler.capture(0.2))
+    await asyncio.sleep(0.01)
+    assert profiler.is_running()
+    with pytest.raises(profiler.ProfilerBusyError):
+        await profiler.capture(0.1)
+    await first
+
+
+@pytest.mark.asyncio
+async def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        await profiler.capture(0.1, "perf")
+
+
+def test_top_leaf_frames():
+    collapsed = "main;a;b 3\nmain;a;c 1"
+    assert profiler.top_leaf_frames(collapsed, 1) == [" 75.0% b"]
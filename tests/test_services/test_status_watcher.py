@@ -0,0 +1,85 @@
+"""Tests for the shared status watcher."""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services.status_watcher import StatusWatcher
+
+
+class ScriptedAPI:
+    def __init__(self, statuses: list[str]):
+        self.statuses = statuses
+        self.polls = 0
+
+    async def get_search_status(self, account):
+        status = self.statuses[min(self.polls, len(self.statuses) - 1)]
+        self.polls += 1
+        return {"status": status}
+
+
+@pytest.fixture
+def api():
+    api = ScriptedAPI(["running", "running", "running", "completed"])
+    with patch("bot.services.status_watcher.client_for_user", AsyncMock(return_value=api)):
+        yield api
+
+
+async def _wait_finished(watcher, account, kind="search"):
+    for _ in range(200):
+        if not watcher.is_subscribed(1, account, kind) and not watcher.is_subscribed(
+            2, account, kind
+        ):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("watch did not finish")
+
+
+@pytest.mark.asyncio
+async def test_one_poll_shared_by_all_viewers(api, mock_bot):
+    watcher = StatusWatcher(fast_interval=0.01, max_interval=0.05)
+
+    first = watcher.subscribe(mock_bot, 1, "amin", "search")
+    second = watcher.subscribe(mock_bot, 2, "amin", "search")
+    assert first is second
+
+    await _wait_finished(watcher, "amin")
+
+    assert api.polls == 4
+    assert sorted(c.args[0] for c in mock_bot.send_message.call_args_list) == [1, 2]
+    assert "completed" in mock_bot.send_message.call_args.args[1]
+
+
+@pytest.mark.asyncio
+async def test_latest_is_served_to_subscribers_only(api, mock_bot):
+    watcher = StatusWatcher(fast_interval=10, max_interval=10)
+    watcher.subscribe(mock_bot, 1, "amin", "search")
+    for _ in range(100):
+        if watcher.latest(1, "amin", "search"):
+            break
+        await asyncio.sleep(0.01)
+
+    assert watcher.latest(1, "amin", "search") == {"status": "running"}
+    assert watcher.latest(2, "amin", "search") is None
+    await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_interval_backs_off_while_unchanged(mock_bot):
+    api = ScriptedAPI(["running"])
+    watcher = StatusWatcher(fast_interval=0.01, max_interval=0.04)
+    with patch("bot.services.status_watcher.client_for_user", AsyncMock(return_value=api)):
+        watch = watcher.subscribe(mock_bot, 1, "amin", "search")
+        await asyncio.sleep(0.2)
+        assert watch.interval == 0.04
+        assert watch.result == {"status": "running"}
+
+        watcher.unsubscribe(1, "amin", "search")
+        await asyncio.sleep(0)
+        assert watch.task.cancelled() or watch.task.done()
+    mock_bot.send_message.assert_not_called()
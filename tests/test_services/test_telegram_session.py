@@ -0,0 +1,55 @@
+"""Tests for the tuned Bot API session, against the local fake server."""
+
+import asyncio
+import os
+
+import pytest
+from aiogram import Bot
+from aiogram.exceptions import TelegramNetworkError
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services.telegram_session import TunedSession, api_server
+
+
+@pytest.fixture
+async def tuned_bot(fake_telegram):
+    session = TunedSession(
+        api=api_server(fake_telegram.base_url),
+        limit=4,
+        keepalive=5,
+        timeout=5,
+        method_timeouts={"sendMessage": 0.1},
+    )
+    bot = Bot(token=fake_telegram.token, session=session)
+    yield bot
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_requests_go_to_the_custom_server_and_are_measured(fake_telegram, tuned_bot):
+    await asyncio.gather(*(tuned_bot.send_message(1, f"m{i}") for i in range(10)))
+    await tuned_bot.answer_callback_query("q1")
+
+    assert fake_telegram.count("sendMessage") == 10
+    metrics = tuned_bot.session.metrics()
+    assert metrics["sendMessage"]["calls"] == 10
+    assert (metrics["answerCallbackQuery"]["calls"], metrics["answerCallbackQuery"]["errors"]) == (
+        1,
+        0,
+    )
+
+    connector = tuned_bot.session._session.connector
+    assert connector.limit == 4
+    assert connector._keepalive_timeout == 5
+
+
+@pytest.mark.asyncio
+async def test_per_method_timeouts(fake_telegram, tuned_bot):
+    fake_telegram.latency = 0.3
+    with pytest.raises(TelegramNetworkError):
+        await tuned_bot.send_message(1, "slow")
+    # Methods without an override use the session default
+    assert await tuned_bot.answer_callback_query("q1") is True
+    assert tuned_bot.session.metrics()["sendMessage"]["errors"] == 1
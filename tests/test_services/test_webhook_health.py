@@ -0,0 +1,89 @@
+"""Tests for the webhook health report."""
+
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services.api_client import APIError
+from bot.services.webhook_health import collect, summarize
+
+
+class FakeWebhookAPI:
+    def __init__(self, deliveries: dict[int, list[dict] | Exception]):
+        self.deliveries = deliveries
+        self.in_flight = 0
+        self.peak = 0
+        self.probed: list[int] = []
+
+    async def list_webhooks(self, skip=0, limit=50):
+        ids = sorted(self.deliveries)
+        page = [{"id": i, "name": f"wh{i}", "is_active": True} for i in ids[skip : skip + limit]]
+        return {"webhooks": page, "total": len(ids)}
+
+    async def list_webhook_deliveries(self, webhook_id, skip=0, limit=20):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        result = self.deliveries[webhook_id]
+        if isinstance(result, Exception):
+            raise result
+        return {"deliveries": result[:limit]}
+
+    async def test_webhook(self, webhook_id, event_type="webhook.test"):
+        self.probed.append(webhook_id)
+        return {"success": webhook_id != 2, "status_code": 200, "duration_ms": 12}
+
+
+def _deliveries(ok: int, failed: int, status: int = 500) -> list[dict]:
+    rows = [{"status_code": 200, "duration_ms": 10 * (i + 1)} for i in range(ok)]
+    return rows + [{"status_code": status, "duration_ms": 1000} for _ in range(failed)]
+
+
+def test_summarize_percentiles_and_top_failure():
+    deliveries = _deliveries(18, 1) + [{"status_code": None, "error": "timeout"}] * 2
+    health = summarize({"id": 1, "name": "a", "is_active": True}, deliveries)
+    assert (health.deliveries, health.successes) == (21, 18)
+    assert health.p50_ms == 100
+    assert health.p95_ms == 1000
+    assert health.top_failure == ("timeout", 2)
+    assert not health.healthy
+
+
+@pytest.mark.asyncio
+async def test_collect_ranks_worst_first_and_probes_concurrently():
+    api = FakeWebhookAPI(
+        {
+            1: _deliveries(20, 0),
+            2: _deliveries(10, 10, status=404),
+            3: [],
+            4: APIError(500, "boom"),
+            **{i: _deliveries(5, 0) for i in range(5, 60)},
+        }
+    )
+    report = await collect(api, probe=True)
+
+    assert [h.id for h in report[:2]] == [4, 2]
+    assert report[0].error == "boom"
+    assert report[1].top_failure == (404, 10)
+    assert report[-1].id == 3 and report[-1].success_rate is None
+    assert len(report) == 59
+    assert 1 < api.peak <= 8
+    assert sorted(api.probed) == list(range(1, 60))
+    assert not next(h for h in report if h.id == 2).probe.success
+
+
+def test_report_is_trimmed_to_the_message_limit():
+    from bot.handlers.webhooks import MESSAGE_LIMIT, render_report
+    from bot.services.webhook_health import WebhookHealth
+
+    report = [WebhookHealth(id=i, name=f"wh<{i}>", active=True, error="x" * 500) for i in range(60)]
+    text = render_report(report)
+
+    assert len(text) <= MESSAGE_LIMIT
+    assert "wh&lt;0&gt;" in text
+    assert text.endswith(f"… +{60 - text.count('⛔')}")
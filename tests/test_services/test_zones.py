@@ -0,0 +1,83 @@
+"""Tests for the service zone index."""
+
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "test:token")
+os.environ.setdefault("DATABASE_PATH", ":memory:")
+
+from bot.services.zones import ZoneCache, ZoneIndex, zone_polygons
+
+# Square around downtown Montreal with a hole in the middle, GeoJSON order
+DOWNTOWN = {
+    "zoneId": 1,
+    "name": "Downtown",
+    "geometry": {
+        "type": "Polygon",
+        "coordinates": [
+            [[-73.60, 45.48], [-73.54, 45.48], [-73.54, 45.52], [-73.60, 45.52], [-73.60, 45.48]],
+            [[-73.58, 45.49], [-73.56, 45.49], [-73.56, 45.51], [-73.58, 45.51]],
+        ],
+    },
+}
+# Triangle given as a flat list of lat/lng dicts
+LAVAL = {
+    "id": "laval",
+    "name": "Laval",
+    "polygon": [
+        {"latitude": 45.55, "longitude": -73.75},
+        {"latitude": 45.60, "longitude": -73.70},
+        {"latitude": 45.55, "longitude": -73.65},
+    ],
+}
+
+
+def test_polygon_formats():
+    assert [len(rings) for rings in zone_polygons(DOWNTOWN)] == [2]
+    assert zone_polygons(LAVAL) == [[[(45.55, -73.75), (45.60, -73.70), (45.55, -73.65)]]]
+    assert zone_polygons({"name": "empty"}) == []
+
+
+def test_locate_inside_hole_and_outside():
+    index = ZoneIndex([DOWNTOWN, LAVAL, {"name": "no geometry"}])
+    assert len(index) == 2
+
+    inside = index.locate(45.485, -73.59)
+    assert inside.inside and inside.zone.name == "Downtown"
+    assert index.locate(45.56, -73.70).zone.name == "Laval"
+
+    # The hole is not served; its nearest edges are 0.01° of longitude away (~780m)
+    hole = index.locate(45.50, -73.57)
+    assert not hole.inside
+    assert hole.zone.name == "Downtown"
+    assert 0.75 < hole.distance_km < 0.8
+
+    # Quebec City is far from both
+    far = index.locate(46.81, -71.21)
+    assert far.zone.name == "Downtown"
+    assert far.distance_km > 200
+
+
+def test_empty_index_locates_nothing():
+    assert ZoneIndex([]).locate(45.5, -73.5) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_loads_once_and_keeps_index_on_failure():
+    api = AsyncMock()
+    api.get_zones.return_value = {"zones": [DOWNTOWN]}
+    cache = ZoneCache(max_age=3600)
+
+    with patch("bot.services.zones.client_for_user", AsyncMock(return_value=api)):
+        assert len(await cache.ensure(1)) == 1
+        assert len(await cache.ensure(2)) == 1
+        api.get_zones.assert_awaited_once()
+
+        cache.loaded_at -= 7200
+        api.get_zones.side_effect = RuntimeError("down")
+        assert len(await cache.ensure(1)) == 1
+        # A failure is not retried on every lookup
+        assert len(await cache.ensure(1)) == 1
+        assert api.get_zones.await_count == 2
@@ -58,3 +58,65 @@ async def test_webhook_receiver_no_signature():
                     json={"event": "test", "payload": {}},
                 )
                 assert resp.status == 200
+
+
+@pytest.mark.asyncio
+async def test_profile_route_disabled_without_token():
+    with patch("bot.web.server.settings") as mock_settings:
+        mock_settings.admin_api_token = ""
+        app = create_app(bot=AsyncMock())
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.get("/debug/profile")
+            assert resp.status == 404
+
+
+@pytest.mark.asyncio
+async def test_profile_route_requires_token():
+    with patch("bot.web.server.settings") as mock_settings:
+        mock_settings.admin_api_token = "secret"
+        app = create_app(bot=AsyncMock())
+        async with TestClient(TestServer(app)) as client:
+            resp = await client.get("/debug/profile", headers={"Authorization": "Bearer nope"})
+            assert resp.status == 401
+
+            resp = await client.get(
+                "/debug/profile?seconds=0.1", headers={"Authorization": "Bearer secret"}
+            )
+            assert resp.status == 200
+            data = await resp.json()
+            assert data["mode"] == "sample"
+
+
+@pytest.mark.asyncio
+async def test_webhook_receiver_verifies_signature_on_raw_bytes():
+    import hashlib
+    import hmac
+
+    body = '{"type": "search.started", "data": {"account": "امین"}}'.encode()
+    timestamp = "1700000000"
+    signature = hmac.new(b"s3cret", timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+
+    with (
+        patch("bot.web.server.settings") as mock_settings,
+        patch(
+            "bot.notifications.dispatcher.dispatch_notification", new_callable=AsyncMock
+        ) as dispatch,
+    ):
+        mock_settings.webhook_secret = "s3cret"
+        app = create_app(bot=AsyncMock())
+        async with TestClient(TestServer(app)) as client:
+            headers = {"X-Webhook-Timestamp": timestamp}
+            resp = await client.post(
+                "/webhooks/notify",
+                data=body,
+                headers={**headers, "X-Webhook-Signature": f"sha256={signature}"},
+            )
+            assert resp.status == 200
+            assert dispatch.await_args.args[1]["data"]["account"] == "امین"
+
+            resp = await client.post(
+                "/webhooks/notify",
+                data=body,
+                headers={**headers, "X-Webhook-Signature": "sha256=deadbeef"},
+            )
+            assert resp.status == 401